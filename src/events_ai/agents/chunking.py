@@ -0,0 +1,67 @@
+import re
+
+# Rough token estimate for English markdown, good enough for budgeting
+CHARS_PER_TOKEN = 4
+
+# Split points, from the most to the least structural. Headings are matched
+# with a lookahead so the heading stays at the start of its section.
+SEPARATORS = [
+    re.compile(r"(?m)^(?=#{1,6} |[^\n]+\n(?:=+|-+)[ \t]*$)"),
+    re.compile(r"\n\s*\n"),
+    re.compile(r"\n"),
+]
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def split_markdown(page: str, max_tokens: int) -> list[str]:
+    """Split a markdown page into chunks of at most `max_tokens` tokens.
+
+    Pages are split on headings first, then paragraphs, then lines, and the
+    pieces are packed back together in order so chunks stay close to the budget.
+    """
+    pieces = split_pieces(page, max_tokens, SEPARATORS)
+
+    chunks: list[str] = []
+    current: list[str] = []
+    current_tokens = 0
+
+    for piece in pieces:
+        piece_tokens = estimate_tokens(piece)
+        if current and current_tokens + piece_tokens > max_tokens:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+
+        current.append(piece)
+        current_tokens += piece_tokens
+
+    if current:
+        chunks.append("\n\n".join(current))
+
+    return chunks
+
+
+def split_pieces(text: str, max_tokens: int, separators: list[re.Pattern]) -> list[str]:
+    text = text.strip()
+    if not text:
+        return []
+
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+
+    if not separators:
+        size = max(1, max_tokens - 1) * CHARS_PER_TOKEN
+        return [text[i : i + size] for i in range(0, len(text), size)]
+
+    pieces = []
+    for part in separators[0].split(text):
+        pieces += split_pieces(part, max_tokens, separators[1:])
+
+    return pieces
+
+
+def split_blocks(page: str) -> list[str]:
+    """Paragraph-level blocks of a markdown page, for comparing versions of it."""
+    return [block.strip() for block in SEPARATORS[1].split(page) if block.strip()]
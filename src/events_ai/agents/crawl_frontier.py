@@ -0,0 +1,120 @@
+import re
+import threading
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+MARKDOWN_LINK = re.compile(r"\[([^\]]*)\]\((\S+?)(?:\s+\"[^\"]*\")?\)")
+
+# Anchor text of links to further pages of the same listing
+PAGINATION_TEXT = re.compile(
+    r"^(?:next|next page|next month|next week|more events|older|later|load more"
+    r"|[»›>]+|next\s*[»›>]+)$",
+    re.IGNORECASE,
+)
+
+# A bare page number only counts on links that change the page, such as
+# "?page=3" or "/page/3", so dates and counts in a listing aren't followed
+PAGE_NUMBER = re.compile(r"^\d{1,3}$")
+PAGE_PARAM = re.compile(r"^(?:page|pg|paged|pagenum|page_?no|p)$", re.IGNORECASE)
+PAGE_PATH = re.compile(r"/page/\d+/?$", re.IGNORECASE)
+
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid")
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so that trivially different forms are visited once."""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    )
+    return urlunsplit(
+        (
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path.rstrip("/") or "/",
+            urlencode(query),
+            "",
+        )
+    )
+
+
+def pagination_links(page: str, page_url: str) -> list[str]:
+    """Links in a simplified page that look like the next page of the listing.
+
+    Only links on the same host whose text reads like pagination ("Next",
+    "»", ...) are returned, or whose text is a number and that go to another
+    page of this listing.
+    """
+    host = urlsplit(page_url).netloc.lower()
+    links = []
+
+    for text, href in MARKDOWN_LINK.findall(page):
+        text = re.sub(r"\s+", " ", text).strip(" *_")
+
+        url = urljoin(page_url, href)
+        numbered = PAGE_NUMBER.match(text) and changes_page(url, page_url)
+
+        if not PAGINATION_TEXT.match(text) and not numbered:
+            continue
+
+        if urlsplit(url).netloc.lower() == host and url not in links:
+            links.append(url)
+
+    return links
+
+
+def changes_page(url: str, page_url: str = "") -> bool:
+    """Whether `url` asks for a different page number than `page_url`."""
+    parts, current = urlsplit(url), urlsplit(page_url)
+
+    if PAGE_PATH.search(parts.path) and parts.path != current.path:
+        return True
+
+    params = page_params(parts.query)
+    return bool(params) and params != page_params(current.query)
+
+
+def page_params(query: str) -> dict[str, str]:
+    return {
+        key.lower(): value
+        for key, value in parse_qsl(query, keep_blank_values=True)
+        if PAGE_PARAM.match(key)
+    }
+
+
+class CrawlFrontier:
+    """Breadth-first queue of listing pages, bounded by depth and page count."""
+
+    def __init__(self, start_url: str, max_depth: int = 0, max_pages: int = 1):
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.visited = {canonicalize_url(start_url)}
+        self.level = [start_url]
+        self.next_level: list[str] = []
+        self.depth = 0
+        self.lock = threading.Lock()
+
+    def add(self, url: str) -> bool:
+        """Queue a page for the next level, unless seen or over the limits."""
+        canonical = canonicalize_url(url)
+
+        with self.lock:
+            if (
+                self.depth + 1 > self.max_depth
+                or len(self.visited) >= self.max_pages
+                or canonical in self.visited
+            ):
+                return False
+
+            self.visited.add(canonical)
+            self.next_level.append(url)
+            return True
+
+    def levels(self):
+        """Yield each level's URLs. Links added while a level runs form the next."""
+        while self.level:
+            self.next_level = []
+            yield self.depth, self.level
+            self.level = self.next_level
+            self.depth += 1
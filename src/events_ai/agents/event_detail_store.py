@@ -0,0 +1,55 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from .gemini_event_research_agent import Event
+
+
+class EventDetailStore:
+    """Events extracted from detail pages on earlier days, keyed by link.
+
+    Each entry remembers a fingerprint of the listed event and the simplified
+    page it was updated from, so when neither changed the event is reused
+    instead of asking Gemini again.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def entry_path(self, link: str) -> Path:
+        return self.path / f"{hashlib.sha256(link.encode()).hexdigest()}.json"
+
+    def lookup(self, link: str, fingerprint: str) -> Event | None:
+        try:
+            entry = json.loads(self.entry_path(link).read_text())
+            if entry["link"] != link or entry["fingerprint"] != fingerprint:
+                return None
+            return Event.model_validate(entry["event"])
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, ValidationError):
+            return None
+
+    def save(self, link: str, fingerprint: str, event: Event):
+        entry = {
+            "link": link,
+            "fingerprint": fingerprint,
+            "event": event.model_dump(mode="json"),
+        }
+
+        path = self.entry_path(link)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(entry))
+        os.replace(tmp_path, path)
+
+
+def fingerprint(page: str) -> str:
+    return hashlib.sha256(page.encode()).hexdigest()
+
+
+def detail_fingerprint(event: Event, page: str) -> str:
+    """Fingerprint of a listed event together with its detail page."""
+    return fingerprint(event.model_dump_json() + "\0" + page)
@@ -1,15 +1,23 @@
-from concurrent.futures import ThreadPoolExecutor
+import asyncio
 from datetime import date
 from urllib.parse import urlparse
 
+import requests
 import structlog
 from google import genai
 
 from .. import simplify_url
+from ..research_journal import TargetJournal
+from . import gemini_client
+from .chunking import estimate_tokens
+from .crawl_frontier import CrawlFrontier, pagination_links
+from .event_detail_store import EventDetailStore, detail_fingerprint
 from .gemini_event_research_agent import (
     Event,
     EventsResult,
     GeminiEventResearchAgent,
+    dedupe_events,
+    map_in_threads,
 )
 from .prompt import build_prompt
 
@@ -25,15 +33,54 @@ class EventListAgent(GeminiEventResearchAgent):
         start_url: str,
         use_selenium: bool = False,
         start_url_params=None,
+        chunk_tokens: int | None = None,
+        detail_store: EventDetailStore | None = None,
+        batch_tokens: int | None = None,
+        journal: TargetJournal | None = None,
+        max_depth: int = 0,
+        max_pages: int = 1,
     ):
         self.start_url = start_url
         self.start_url_params: str | None = start_url_params
         parsed_url = urlparse(self.start_url)
         self.url_base = f"{parsed_url.scheme}://{parsed_url.netloc}"
         self.use_selenium = use_selenium
-        super().__init__(llm, events_start, events_finish)
+        self.detail_store = detail_store
+        self.details_reused = 0
+        self.batch_tokens = batch_tokens
+        self.journal = journal
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        super().__init__(llm, events_start, events_finish, chunk_tokens)
 
     def run(self) -> EventsResult:
+        listed = self.journal.listing() if self.journal is not None else None
+
+        if listed is not None:
+            logger.info(f"Resuming with {len(listed)} listed events")
+            result = EventsResult(events=listed)
+        else:
+            result = self.list_events()
+
+            if result is None:
+                return EventsResult(events=[])
+
+            if self.journal is not None:
+                self.journal.save_listing(result.events)
+
+        if self.batch_tokens is not None:
+            result.events = self.update_in_batches(result.events)
+        else:
+            result.events = gemini_client.run(self.update_all_async(result.events))
+
+        if self.detail_store is not None:
+            logger.info(
+                f"Reused {self.details_reused} of {len(result.events)} event details"
+            )
+
+        return result
+
+    def list_events(self) -> EventsResult | None:
         url = self.start_url
 
         if self.start_url_params:
@@ -43,49 +90,226 @@ class EventListAgent(GeminiEventResearchAgent):
             }
             url += "?" + self.start_url_params.format(**param_vars)
 
-        start_page = simplify_url.get(url, use_selenium=self.use_selenium)
+        frontier = CrawlFrontier(url, self.max_depth, self.max_pages)
+        results = []
 
-        prompt = build_prompt(
-            "event_list_start.txt.jinja2",
-            start_page=start_page,
-            start_date=self.events_start,
-            finish_date=self.events_finish,
-        )
-        response = self.ask_gemini("gemini-2.5-flash-lite", prompt, EventsResult)
+        for depth, level in frontier.levels():
+
+            def crawl(page_url: str) -> EventsResult | None:
+                page = simplify_url.get(page_url, use_selenium=self.use_selenium)
+
+                for link in pagination_links(page, page_url):
+                    if frontier.add(link):
+                        logger.info(f"Following page link {link} (depth {depth + 1})")
 
-        if response is None:
-            return EventsResult(events=[])
+                return self.extract_events(
+                    "gemini-2.5-flash-lite",
+                    page,
+                    lambda chunk: build_prompt(
+                        "event_list_start.txt.jinja2",
+                        start_page=chunk,
+                        start_date=self.events_start,
+                        finish_date=self.events_finish,
+                    ),
+                )
 
-        result: EventsResult = response.parsed
+            results += map_in_threads(crawl, level)
 
-        for event in result.events:
+        if len(frontier.visited) > 1:
+            logger.info(f"Crawled {len(frontier.visited)} listing pages")
+
+        results = [result for result in results if result is not None]
+        if len(results) == 0:
+            return None
+
+        events = dedupe_events([event for result in results for event in result.events])
+
+        for event in events:
             if event.link and event.link[0] == "/":
                 event.link = self.url_base + event.link
 
-        with ThreadPoolExecutor(max_workers=8) as executor:
+        return EventsResult(events=events)
 
-            def threaded_update_from_link(params):
-                return self.update_from_link(params[0])
+    def update_from_page(self, event: Event, page: str) -> Event:
+        prompt = self.update_prompt(event, page)
+        response = self.ask_gemini("gemini-2.5-flash-lite", prompt, Event)
+        new_event: Event = response.parsed
+
+        self.remember_detail(event, page, new_event)
+        return new_event
 
-            updated_events = executor.map(
-                threaded_update_from_link, [(event,) for event in result.events]
+    async def update_all_async(self, events: list[Event]) -> list[Event]:
+        """Update every event from its page, with all requests in flight at once.
+
+        Fetches wait for their host's turn on the loop, then run on the fetch
+        threads; Gemini requests wait for a slot from the shared limiter.
+        """
+        return list(
+            await asyncio.gather(
+                *(self.update_listed_async(i, e) for i, e in enumerate(events))
             )
+        )
 
-        result.events = list(updated_events)
-        return result
+    async def update_listed_async(self, index: int, event: Event) -> Event:
+        if (journaled := self.journaled_detail(index)) is not None:
+            return journaled
+
+        new_event = await self.update_from_link_async(event)
+        return self.journal_detail(index, new_event)
 
-    def update_from_link(self, event: Event) -> Event:
+    async def update_from_link_async(self, event: Event) -> Event:
         if event.link is None:
             return event
 
-        page = simplify_url.get(event.link, self.use_selenium)
-        prompt = build_prompt(
+        try:
+            page = await simplify_url.get_async(event.link, self.use_selenium)
+        except requests.RequestException as err:
+            logger.warning(f"Keeping listed event, fetching {event.link} failed: {err}")
+            return event
+
+        if (stored := self.reuse_detail(event, page)) is not None:
+            return stored
+
+        prompt = self.update_prompt(event, page)
+        response = await self.ask_gemini_async("gemini-2.5-flash-lite", prompt, Event)
+        new_event: Event = response.parsed
+
+        self.remember_detail(event, page, new_event)
+        return new_event
+
+    def update_prompt(self, event: Event, page: str) -> str:
+        return build_prompt(
             "event_list_update.txt.jinja2",
             event=event.model_dump_json(),
             page=page,
             start_date=self.events_start,
             finish_date=self.events_finish,
         )
-        response = self.ask_gemini("gemini-2.5-flash-lite", prompt, Event)
-        new_event: Event = response.parsed
-        return new_event
+
+    def update_in_batches(self, events: list[Event]) -> list[Event]:
+        """Update events from their pages, several events per Gemini request.
+
+        Pages are packed into batches under `batch_tokens`. A batch that fails
+        or returns the wrong number of events falls back to one call per event.
+        """
+        journaled = [self.journaled_detail(i) for i in range(len(events))]
+        pages = map_in_threads(
+            lambda i: (
+                self.fetch_detail(events[i].link)
+                if events[i].link and journaled[i] is None
+                else None
+            ),
+            range(len(events)),
+        )
+
+        updated = list(events)
+        pending = []
+
+        for i, (event, page) in enumerate(zip(events, pages)):
+            if journaled[i] is not None:
+                updated[i] = journaled[i]
+            elif page is None:
+                self.journal_detail(i, event)
+            elif (stored := self.reuse_detail(event, page)) is not None:
+                updated[i] = self.journal_detail(i, stored)
+            else:
+                pending.append(i)
+
+        batches: list[list[int]] = []
+        current_tokens = 0
+
+        for i in pending:
+            tokens = estimate_tokens(pages[i]) + estimate_tokens(
+                events[i].model_dump_json()
+            )
+
+            if not batches or current_tokens + tokens > self.batch_tokens:
+                batches.append([])
+                current_tokens = 0
+
+            batches[-1].append(i)
+            current_tokens += tokens
+
+        logger.info(f"Updating {len(pending)} events in {len(batches)} batches")
+
+        batch_results = map_in_threads(
+            lambda batch: [
+                self.journal_detail(i, new_event)
+                for i, new_event in zip(
+                    batch, self.update_batch([(events[i], pages[i]) for i in batch])
+                )
+            ],
+            batches,
+        )
+
+        for batch, new_events in zip(batches, batch_results):
+            for i, new_event in zip(batch, new_events):
+                updated[i] = new_event
+
+        return updated
+
+    def fetch_detail(self, link: str) -> str | None:
+        try:
+            return simplify_url.get(link, self.use_selenium)
+        except requests.RequestException as err:
+            logger.warning(f"Keeping listed event, fetching {link} failed: {err}")
+            return None
+
+    def update_batch(self, pairs: list[tuple[Event, str]]) -> list[Event]:
+        if len(pairs) == 1:
+            return [self.update_from_page(*pairs[0])]
+
+        prompt = build_prompt(
+            "event_list_update_batch.txt.jinja2",
+            items=[
+                {"event": event.model_dump_json(), "page": page}
+                for event, page in pairs
+            ],
+            start_date=self.events_start,
+            finish_date=self.events_finish,
+        )
+
+        try:
+            response = self.ask_gemini("gemini-2.5-flash-lite", prompt, list[Event])
+            new_events: list[Event] | None = response.parsed
+        except Exception as err:
+            logger.warning(f"Batch update failed: {err}")
+            new_events = None
+
+        if new_events is None or len(new_events) != len(pairs):
+            logger.warning(
+                f"Batch of {len(pairs)} events failed, updating them one at a time"
+            )
+            return [self.update_from_page(event, page) for event, page in pairs]
+
+        for (event, page), new_event in zip(pairs, new_events):
+            self.remember_detail(event, page, new_event)
+
+        return new_events
+
+    def journaled_detail(self, index: int) -> Event | None:
+        return None if self.journal is None else self.journal.detail(index)
+
+    def journal_detail(self, index: int, event: Event) -> Event:
+        if self.journal is not None and event is not None:
+            self.journal.save_detail(index, event)
+
+        return event
+
+    def reuse_detail(self, event: Event, page: str) -> Event | None:
+        if self.detail_store is None or event.link is None:
+            return None
+
+        stored = self.detail_store.lookup(event.link, detail_fingerprint(event, page))
+
+        if stored is not None:
+            with self.tokens_lock:
+                self.details_reused += 1
+
+        return stored
+
+    def remember_detail(self, event: Event, page: str, new_event: Event | None):
+        if self.detail_store is None or event.link is None or new_event is None:
+            return
+
+        self.detail_store.save(event.link, detail_fingerprint(event, page), new_event)
@@ -1,12 +1,30 @@
 from datetime import date
 from urllib.parse import urlparse
 
+import pandas as pd
 import structlog
 from google import genai
 from pydantic import BaseModel
 
 from .. import simplify_url
-from .gemini_event_research_agent import Event, EventsResult, GeminiEventResearchAgent
+from ..event_dates import filter_window
+from ..research_journal import TargetJournal
+from .chunking import split_blocks
+from .event_detail_store import fingerprint
+from .gemini_event_research_agent import (
+    Event,
+    EventsResult,
+    GeminiEventResearchAgent,
+    map_in_threads,
+)
+from .page_snapshot_store import (
+    PageSnapshot,
+    PageSnapshotStore,
+    PageUpdate,
+    attribute,
+    dedupe_sourced,
+    plan_update,
+)
 from .prompt import build_prompt
 
 logger = structlog.get_logger()
@@ -30,38 +48,119 @@ class FlatEventPageAgent(GeminiEventResearchAgent):
         start_url: str,
         use_selenium: bool = False,
         split_first: bool = False,
+        chunk_tokens: int | None = None,
+        journal: TargetJournal | None = None,
+        snapshot_store: PageSnapshotStore | None = None,
     ):
         self.start_url = start_url
         parsed_url = urlparse(self.start_url)
         self.url_base = f"{parsed_url.scheme}://{parsed_url.netloc}"
         self.use_selenium = use_selenium
         self.split_first = split_first
-        super().__init__(llm, events_start, events_finish)
+        self.journal = journal
+        self.snapshot_store = snapshot_store
+        super().__init__(llm, events_start, events_finish, chunk_tokens)
 
     def run(self) -> EventsResult:
         if self.split_first:
-            return self.run_with_split_first()
+            result = self.run_with_split_first()
         else:
-            return self.run_in_one_step()
+            result = self.run_in_one_step()
+
+        if self.journal is not None:
+            self.journal.save_events(result.events)
+
+        return result
 
     def run_in_one_step(self) -> EventsResult:
         page = simplify_url.get(self.start_url, use_selenium=self.use_selenium)
-        prompt = build_prompt(
-            "flat_events.txt.jinja2",
-            page=page,
-            link=self.start_url,
-            today=self.events_start,
-            start_date=self.events_start,
-            finish_date=self.events_finish,
-        )
-        response = self.ask_gemini("gemini-2.5-flash-lite", prompt, EventsResult)
 
-        if response is None:
+        if self.snapshot_store is not None:
+            return self.run_incrementally(page)
+
+        result = self.extract_page(page)
+
+        if result is None:
             logger.warn(f"Failed to get events from {self.start_url}")
+            return EventsResult(events=[])
 
-        result: EventsResult = response.parsed
         return result
 
+    def extract_page(self, page: str) -> EventsResult | None:
+        return self.extract_events(
+            "gemini-2.5-flash-lite",
+            page,
+            lambda chunk: build_prompt(
+                "flat_events.txt.jinja2",
+                page=chunk,
+                link=self.start_url,
+                today=self.events_start,
+                start_date=self.events_start,
+                finish_date=self.events_finish,
+            ),
+        )
+
+    def run_incrementally(self, page: str) -> EventsResult:
+        """Extract only the blocks of the page that changed since the snapshot."""
+        blocks = split_blocks(page)
+        snapshot = self.snapshot_store.load(self.start_url, self.events_start)
+
+        if snapshot is None:
+            snapshot = PageSnapshot(self.start_url, self.events_start)
+            update = PageUpdate([], [list(range(len(blocks)))] if blocks else [])
+        else:
+            update = plan_update(snapshot, blocks)
+
+        extracted = sum(len(run) for run in update.runs)
+        logger.info(
+            f"Carrying {len(update.carried)} events forward, "
+            f"extracting {extracted} of {len(blocks)} blocks"
+        )
+
+        results = map_in_threads(
+            lambda run: self.extract_page("\n\n".join(blocks[i] for i in run)),
+            update.runs,
+        )
+
+        events = list(update.carried)
+        failed = set()
+        for run, result in zip(update.runs, results):
+            if result is None:
+                failed.update(run)
+            else:
+                events += attribute(result.events, blocks, run)
+
+        events = dedupe_sourced(events)
+
+        if len(failed) > 0:
+            logger.warn(
+                f"Failed to get events from {len(failed)} blocks of {self.start_url}"
+            )
+
+        # Blocks that failed to extract are left out, so they're tried again
+        self.snapshot_store.save(
+            PageSnapshot(
+                self.start_url,
+                snapshot.extracted_on,
+                [
+                    fingerprint(block)
+                    for index, block in enumerate(blocks)
+                    if index not in failed
+                ],
+                events,
+            )
+        )
+
+        return EventsResult(
+            events=self.in_window([sourced.event for sourced in events])
+        )
+
+    def in_window(self, events: list[Event]) -> list[Event]:
+        whens = pd.DataFrame({"when": [event.when for event in events]})
+        days = (self.events_finish - self.events_start).days
+        kept = filter_window(whens, self.events_start, days)
+        return [events[index] for index in kept.index]
+
     def run_with_split_first(self) -> EventsResult:
         """
         Simple models appear more reliable if performed as two steps:
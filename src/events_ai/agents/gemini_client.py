@@ -0,0 +1,400 @@
+import asyncio
+import contextvars
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Callable, Coroutine, TypeVar
+
+from google import genai
+from google.genai.errors import APIError
+from google.genai.types import GenerateContentResponse
+from loguru import logger
+
+from .. import tracing
+from ..usage_ledger import ledger
+from .chunking import estimate_tokens
+
+RETRY_CODES = {429, 500, 503}
+
+
+class ConcurrencyLimiter:
+    """Caps in-flight Gemini requests across threads and event loops.
+
+    A freed slot is handed straight to the oldest waiter, whether it is a
+    blocked thread or a task awaiting on some event loop.
+    """
+
+    def __init__(self, limit: int = 16):
+        self.limit = limit
+        self.in_flight = 0
+        self.lock = threading.Lock()
+        self.waiters: deque[Callable[[], None]] = deque()
+
+    def try_acquire(self) -> bool:
+        if self.in_flight < self.limit and not self.waiters:
+            self.in_flight += 1
+            return True
+
+        return False
+
+    def acquire(self):
+        with self.lock:
+            if self.try_acquire():
+                return
+
+            ready = threading.Event()
+            self.waiters.append(ready.set)
+
+        ready.wait()
+
+    async def acquire_async(self):
+        loop = asyncio.get_running_loop()
+
+        with self.lock:
+            if self.try_acquire():
+                return
+
+            ready = loop.create_future()
+
+            def hand_over():
+                if ready.done():
+                    self.release()
+                else:
+                    ready.set_result(None)
+
+            def wake():
+                try:
+                    loop.call_soon_threadsafe(hand_over)
+                except RuntimeError:
+                    # The waiting loop has closed, pass the slot on
+                    self.release()
+
+            self.waiters.append(wake)
+
+        await ready
+
+    def release(self):
+        with self.lock:
+            if not self.waiters:
+                self.in_flight -= 1
+                return
+
+            wake = self.waiters.popleft()
+
+        wake()
+
+    @contextmanager
+    def slot(self):
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def slot_async(self):
+        await self.acquire_async()
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class TokenBucket:
+    """Refills at `per_minute` units a minute, up to one minute's worth.
+
+    Reservations may drive the level negative; the caller then waits out the
+    debt, so requests queue up in the order they reserved.
+    """
+
+    def __init__(self, per_minute: float):
+        self.per_minute = per_minute
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float) -> float:
+        now = time.monotonic()
+        rate = self.per_minute / 60
+        self.level = min(self.per_minute, self.level + (now - self.updated) * rate)
+        self.updated = now
+        self.level -= amount
+        return max(0.0, -self.level / rate)
+
+    def refund(self, amount: float):
+        self.level = min(self.per_minute, self.level + amount)
+
+
+class RateLimiter:
+    """Request and token budgets shared by every Gemini caller.
+
+    A 429 halves both rates and pauses everyone until Retry-After; each
+    success wins back a little of the configured rate.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        min_fraction: float = 0.05,
+        recovery: float = 1.05,
+    ):
+        self.max_requests = requests_per_minute
+        self.max_tokens = tokens_per_minute
+        self.requests = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.min_fraction = min_fraction
+        self.recovery = recovery
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def reserve(self, tokens: int) -> float:
+        """Take budget for one request and return how long to wait before sending."""
+        with self.lock:
+            wait = max(0.0, self.paused_until - time.monotonic())
+
+            if self.requests is not None:
+                wait = max(wait, self.requests.reserve(1))
+            if self.tokens is not None:
+                wait = max(wait, self.tokens.reserve(tokens))
+
+            return wait
+
+    def settle(self, reserved: int, used: int):
+        """Correct the token budget once the real usage is known."""
+        with self.lock:
+            if self.tokens is not None:
+                self.tokens.refund(reserved - used)
+
+            self.scale(self.recovery)
+
+    def throttle(self, pause: float):
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + pause)
+            self.scale(0.5)
+
+    def scale(self, factor: float):
+        for bucket, maximum in (
+            (self.requests, self.max_requests),
+            (self.tokens, self.max_tokens),
+        ):
+            if bucket is not None:
+                bucket.per_minute = min(
+                    maximum,
+                    max(maximum * self.min_fraction, bucket.per_minute * factor),
+                )
+
+
+def backoff_delay(attempt: int, base: float = 2.0, cap: float = 60.0) -> float:
+    """Exponential backoff with full jitter, so retrying callers spread out."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+def retry_after(err: APIError) -> float | None:
+    """Seconds the API asked us to wait, from Retry-After or a RetryInfo detail."""
+    headers = getattr(err.response, "headers", None) or {}
+    value = headers.get("Retry-After") or headers.get("retry-after")
+
+    if value is not None:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+
+    details = err.details.get("error", {}).get("details", []) if err.details else []
+    for detail in details if isinstance(details, list) else []:
+        delay = detail.get("retryDelay") if isinstance(detail, dict) else None
+        if delay and (match := re.fullmatch(r"([\d.]+)s", delay)):
+            return float(match[1])
+
+    return None
+
+
+def retry_delay(err: APIError, attempt: int) -> float:
+    delay = retry_after(err)
+    if delay is None:
+        delay = backoff_delay(attempt)
+
+    if err.code == 429:
+        rate_limiter.throttle(delay)
+
+    return delay
+
+
+def estimate_request_tokens(contents) -> int:
+    if isinstance(contents, str):
+        return estimate_tokens(contents)
+
+    if isinstance(contents, list):
+        return sum(estimate_tokens(part) for part in contents if isinstance(part, str))
+
+    return 0
+
+
+def used_tokens(response: GenerateContentResponse) -> int:
+    usage = response.usage_metadata
+    return 0 if usage is None else usage.total_token_count or 0
+
+
+limiter = ConcurrencyLimiter()
+rate_limiter = RateLimiter()
+
+T = TypeVar("T")
+
+loop: asyncio.AbstractEventLoop | None = None
+loop_lock = threading.Lock()
+
+
+def run(coroutine: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on the shared event loop and wait for its result.
+
+    Every caller shares one loop, so async Gemini calls from any thread end up
+    on the same client connections. The caller's logging context is kept.
+    """
+    global loop
+
+    with loop_lock:
+        if loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="gemini-loop", daemon=True
+            ).start()
+
+    context = contextvars.copy_context()
+    result: Future[T] = Future()
+
+    def copy_outcome(task: asyncio.Task):
+        if task.cancelled():
+            result.cancel()
+        elif task.exception() is not None:
+            result.set_exception(task.exception())
+        else:
+            result.set_result(task.result())
+
+    def start():
+        task = loop.create_task(coroutine, context=context)
+        task.add_done_callback(copy_outcome)
+
+    loop.call_soon_threadsafe(start)
+    return result.result()
+
+
+def configure(
+    max_concurrency: int = 16,
+    requests_per_minute: float | None = None,
+    tokens_per_minute: float | None = None,
+):
+    global limiter, rate_limiter
+    limiter = ConcurrencyLimiter(max_concurrency)
+    rate_limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+
+
+def generate_content(
+    llm: genai.Client,
+    model: str,
+    contents,
+    config: genai.types.GenerateContentConfig,
+    retries: int = 5,
+) -> GenerateContentResponse:
+    """Call Gemini within the shared limits, retrying 429/500/503 with backoff."""
+    with tracing.span("llm", "llm", model=model) as span:
+        response = send(llm, model, contents, config, retries)
+        span["tokens"] = used_tokens(response)
+        return response
+
+
+def send(
+    llm: genai.Client,
+    model: str,
+    contents,
+    config: genai.types.GenerateContentConfig,
+    retries: int,
+) -> GenerateContentResponse:
+    tokens = estimate_request_tokens(contents)
+    start = time.monotonic()
+
+    for attempt in range(retries):
+        time.sleep(rate_limiter.reserve(tokens))
+
+        try:
+            with limiter.slot():
+                response = llm.models.generate_content(
+                    model=model, contents=contents, config=config
+                )
+        except APIError as err:
+            if err.code not in RETRY_CODES or attempt == retries - 1:
+                raise
+
+            delay = retry_delay(err, attempt)
+            logger.warning(
+                f"Gemini returned {err.code}. Retrying in {delay:.1f}s. "
+                f"Retries left: {retries - attempt - 1}"
+            )
+            time.sleep(delay)
+            continue
+
+        rate_limiter.settle(tokens, used_tokens(response))
+        ledger.record_gemini(
+            model, response.usage_metadata, time.monotonic() - start, attempt
+        )
+        return response
+
+    raise ValueError("retries must be at least 1")
+
+
+async def generate_content_async(
+    llm: genai.Client,
+    model: str,
+    contents,
+    config: genai.types.GenerateContentConfig,
+    retries: int = 5,
+) -> GenerateContentResponse:
+    """Like generate_content(), waiting without blocking the event loop."""
+    with tracing.span("llm", "llm", model=model) as span:
+        response = await send_async(llm, model, contents, config, retries)
+        span["tokens"] = used_tokens(response)
+        return response
+
+
+async def send_async(
+    llm: genai.Client,
+    model: str,
+    contents,
+    config: genai.types.GenerateContentConfig,
+    retries: int,
+) -> GenerateContentResponse:
+    tokens = estimate_request_tokens(contents)
+    start = time.monotonic()
+
+    for attempt in range(retries):
+        await asyncio.sleep(rate_limiter.reserve(tokens))
+
+        try:
+            async with limiter.slot_async():
+                response = await llm.aio.models.generate_content(
+                    model=model, contents=contents, config=config
+                )
+        except APIError as err:
+            if err.code not in RETRY_CODES or attempt == retries - 1:
+                raise
+
+            delay = retry_delay(err, attempt)
+            logger.warning(
+                f"Gemini returned {err.code}. Retrying in {delay:.1f}s. "
+                f"Retries left: {retries - attempt - 1}"
+            )
+            await asyncio.sleep(delay)
+            continue
+
+        rate_limiter.settle(tokens, used_tokens(response))
+        ledger.record_gemini(
+            model, response.usage_metadata, time.monotonic() - start, attempt
+        )
+        return response
+
+    raise ValueError("retries must be at least 1")
@@ -1,14 +1,20 @@
-import time
+import contextvars
+import re
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date
+from typing import Callable, Iterable, TypeVar
 
 from google import genai
-from google.genai.errors import ServerError
 from google.genai.types import GenerateContentResponse
-from loguru import logger
 from pydantic import BaseModel
 
+from ..usage_ledger import ledger
+from . import gemini_client, llm_cache
+from .chunking import split_markdown
+
 
 class Event(BaseModel):
     organization: str
@@ -30,57 +36,167 @@ class TokenCounts:
     prompt: int = 0
     candidates: int = 0
     total: int = 0
+    cache_hits: int = 0
+    cached: int = 0
 
 
 class GeminiEventResearchAgent(ABC):
-    def __init__(self, llm: genai.Client, events_start: date, events_finish: date):
+    def __init__(
+        self,
+        llm: genai.Client,
+        events_start: date,
+        events_finish: date,
+        chunk_tokens: int | None = None,
+    ):
         self.tokens = TokenCounts()
+        self.tokens_lock = threading.Lock()
         self.llm = llm
         self.events_start = events_start
         self.events_finish = events_finish
+        self.chunk_tokens = chunk_tokens
 
     def ask_gemini(
         self, model: str, prompt: str, response_schema, retries: int = 5
     ) -> GenerateContentResponse:
-        done = False
-
-        while not done and retries > 0:
-            try:
-                response = self.llm.models.generate_content(
-                    model=model,
-                    contents=prompt,
-                    config=genai.types.GenerateContentConfig(
-                        thinking_config=genai.types.ThinkingConfig(thinking_budget=0),
-                        response_mime_type="application/json",
-                        response_schema=response_schema,
-                    ),
-                )
-
-                self.count_tokens(response)
-                done = True
-            except ServerError as err:
-                if err.code == 503:
-                    logger.warning(
-                        f"Gemini API overloaded. Waiting. Retries left: {retries}"
-                    )
-                    time.sleep(5)
-                else:
-                    raise err
-
-            retries -= 1
+        config = self.gemini_config(response_schema)
+        cache_key, cached = self.check_cache(model, prompt, response_schema, config)
+
+        if cached is not None:
+            return cached
+
+        response = gemini_client.generate_content(
+            self.llm, model, prompt, config, retries
+        )
+        self.record_response(response, cache_key)
+        return response
+
+    async def ask_gemini_async(
+        self, model: str, prompt: str, response_schema, retries: int = 5
+    ) -> GenerateContentResponse:
+        """Like ask_gemini(), on the async client. Slots are shared with ask_gemini()."""
+        config = self.gemini_config(response_schema)
+        cache_key, cached = self.check_cache(model, prompt, response_schema, config)
+
+        if cached is not None:
+            return cached
 
+        response = await gemini_client.generate_content_async(
+            self.llm, model, prompt, config, retries
+        )
+        self.record_response(response, cache_key)
         return response
 
+    def gemini_config(self, response_schema) -> genai.types.GenerateContentConfig:
+        return genai.types.GenerateContentConfig(
+            thinking_config=genai.types.ThinkingConfig(thinking_budget=0),
+            response_mime_type="application/json",
+            response_schema=response_schema,
+        )
+
+    def check_cache(
+        self, model: str, prompt: str, response_schema, config
+    ) -> tuple[str | None, GenerateContentResponse | None]:
+        cache = llm_cache.active_cache
+        if cache is None:
+            return None, None
+
+        cache_key = cache.key(model, prompt, response_schema, config)
+        cached = cache.get(cache_key, response_schema)
+
+        if cached is not None:
+            self.count_cached_tokens(cached)
+            ledger.record_gemini(model, cached.usage_metadata, 0.0, cached=True)
+
+        return cache_key, cached
+
+    def record_response(self, response: GenerateContentResponse, cache_key: str | None):
+        self.count_tokens(response)
+
+        cache = llm_cache.active_cache
+        if cache is not None and cache_key is not None and response.parsed is not None:
+            cache.put(cache_key, response)
+
     def count_tokens(self, response: GenerateContentResponse):
         if response is None or response.usage_metadata is None:
             return
 
         usage = response.usage_metadata
 
-        self.tokens.prompt += usage.prompt_token_count or 0
-        self.tokens.candidates += usage.candidates_token_count or 0
-        self.tokens.total += response.usage_metadata.total_token_count or 0
+        with self.tokens_lock:
+            self.tokens.prompt += usage.prompt_token_count or 0
+            self.tokens.candidates += usage.candidates_token_count or 0
+            self.tokens.total += response.usage_metadata.total_token_count or 0
+
+    def count_cached_tokens(self, response: GenerateContentResponse):
+        usage = response.usage_metadata
+        cached = 0 if usage is None else usage.total_token_count or 0
+
+        with self.tokens_lock:
+            self.tokens.cache_hits += 1
+            self.tokens.cached += cached
+
+    def extract_events(
+        self, model: str, page: str, make_prompt: Callable[[str], str]
+    ) -> EventsResult | None:
+        """Extract events from a page, in parallel chunks if `chunk_tokens` is set."""
+        if self.chunk_tokens is None:
+            response = self.ask_gemini(model, make_prompt(page), EventsResult)
+            return None if response is None else response.parsed
+
+        chunks = split_markdown(page, self.chunk_tokens)
+        responses = map_in_threads(
+            lambda chunk: self.ask_gemini(model, make_prompt(chunk), EventsResult),
+            chunks,
+        )
+        results = [
+            response.parsed
+            for response in responses
+            if response is not None and response.parsed is not None
+        ]
+
+        if len(results) == 0:
+            return None
+
+        events = dedupe_events([event for result in results for event in result.events])
+        return EventsResult(events=events)
 
     @abstractmethod
     def run(self) -> EventsResult:
         pass
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def map_in_threads(
+    fn: Callable[[T], R], items: Iterable[T], max_workers: int = 8
+) -> list[R]:
+    """Like map(), in a thread pool that keeps the caller's logging context."""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, fn, item) for item in items
+        ]
+
+    return [future.result() for future in futures]
+
+
+def event_key(event: Event) -> tuple[str, str, str]:
+    def normalize(text: str | None) -> str:
+        return re.sub(r"[^a-z0-9]+", " ", (text or "").lower()).strip()
+
+    return (normalize(event.title), normalize(event.when), (event.link or "").lower())
+
+
+def dedupe_events(events: list[Event]) -> list[Event]:
+    """Drop events repeated across chunks, keeping the first occurrence."""
+    seen = set()
+    unique = []
+
+    for event in events:
+        key = event_key(event)
+        if key not in seen:
+            seen.add(key)
+            unique.append(event)
+
+    return unique
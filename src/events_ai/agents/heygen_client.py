@@ -1,3 +1,4 @@
+import time
 from enum import Enum
 from pathlib import Path
 from typing import Any
@@ -6,6 +7,9 @@ import requests
 from loguru import logger
 from pydantic import BaseModel
 
+from .. import tracing
+from ..usage_ledger import HEYGEN_PRICE_PER_MINUTE, ledger
+
 
 class Avatar(BaseModel):
     avatar_id: str
@@ -193,30 +197,48 @@ class HeyGenClient:
     def headers(self) -> dict:
         return {"accept": "application/json", "x-api-key": self.api_key}
 
+    def request(self, operation: str, method: str, url: str, **kwargs):
+        """Send a request, recording it in the usage ledger as `operation`."""
+        start = time.monotonic()
+        with tracing.span(f"heygen {operation}", "heygen") as span:
+            response = requests.request(method, url, **kwargs)
+            span["status"] = response.status_code
+        ledger.record("heygen", operation, time.monotonic() - start)
+        return response
+
     def check_quota(self):
-        response = requests.get(
+        response = self.request(
+            "remaining_quota",
+            "GET",
             "https://api.heygen.com/v2/user/remaining_quota",
             headers=self.headers,
         )
         return response.json()
 
     def list_avatars(self) -> HeyGenListAvatarsResponse:
-        response = requests.get(
-            "https://api.heygen.com/v2/avatars", headers=self.headers
+        response = self.request(
+            "list_avatars",
+            "GET",
+            "https://api.heygen.com/v2/avatars",
+            headers=self.headers,
         )
         return HeyGenListAvatarsResponse.model_validate(response.json())
 
     def list_avatars_in_group(
         self, group_id: int | None = None
     ) -> HeyGenListAvatarsInGroupResponse:
-        response = requests.get(
+        response = self.request(
+            "list_avatars_in_group",
+            "GET",
             f"https://api.heygen.com/v2/avatar_group/{group_id}/avatars",
             headers=self.headers,
         )
         return HeyGenListAvatarsInGroupResponse.model_validate(response.json())
 
     def list_voices(self) -> HeyGenListVoicesResponse:
-        response = requests.get(
+        response = self.request(
+            "list_voices",
+            "GET",
             "https://api.heygen.com/v2/voices",
             headers=self.headers,
         )
@@ -228,7 +250,9 @@ class HeyGenClient:
         request_json = request_data.model_dump_json(exclude_unset=True)
         logger.debug(f"Create avatar video request: {request_json}")
 
-        response = requests.post(
+        response = self.request(
+            "video_generate",
+            "POST",
             "https://api.heygen.com/v2/video/generate",
             data=request_json,
             headers=self.headers | {"content-type": "application/json"},
@@ -237,7 +261,9 @@ class HeyGenClient:
         return CreateAvatarVideoV2Response.model_validate(response.json())
 
     def get_video_status(self, video_id: str) -> VideoStatusResponse:
-        response = requests.get(
+        response = self.request(
+            "video_status",
+            "GET",
             "https://api.heygen.com/v1/video_status.get",
             params={"video_id": video_id},
             headers=self.headers,
@@ -245,6 +271,14 @@ class HeyGenClient:
 
         return VideoStatusResponse.model_validate(response.json())
 
+    def record_render(self, status: VideoStatusResponse):
+        """Bill a completed video's render. Call once per video, however often
+        its status is polled."""
+        minutes = (status.data.get("duration") or 0) / 60
+        ledger.record(
+            "heygen", "video_render", 0.0, cost=minutes * HEYGEN_PRICE_PER_MINUTE
+        )
+
     def upload_asset(self, asset_path: str, name: str):
         ext = Path(asset_path).suffix[1:]
 
@@ -255,7 +289,9 @@ class HeyGenClient:
         }[ext]
 
         with open(asset_path, "rb") as image_file:
-            response = requests.post(
+            response = self.request(
+                "upload_asset",
+                "POST",
                 "https://upload.heygen.com/v1/asset",
                 data=image_file,
                 params={"name": name},
@@ -265,14 +301,20 @@ class HeyGenClient:
             return response.json()
 
     def list_assets(self):
-        response = requests.get(
-            "https://api.heygen.com/v1/asset/list", headers=self.headers
+        response = self.request(
+            "list_assets",
+            "GET",
+            "https://api.heygen.com/v1/asset/list",
+            headers=self.headers,
         )
         return response.json()
 
     def delete_asset(self, asset_id: str):
-        response = requests.post(
-            f"https://api.heygen.com/v1/asset/{asset_id}/delete", headers=self.headers
+        response = self.request(
+            "delete_asset",
+            "POST",
+            f"https://api.heygen.com/v1/asset/{asset_id}/delete",
+            headers=self.headers,
         )
         return response.json()
 
@@ -284,7 +326,9 @@ class HeyGenClient:
         voice_id: str,
         orientation: str,
     ):
-        response = requests.post(
+        response = self.request(
+            "av4_generate",
+            "POST",
             "https://api.heygen.com/v2/video/av4/generate",
             json={
                 "image_key": image_key,
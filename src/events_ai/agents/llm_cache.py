@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from google import genai
+from google.genai.types import GenerateContentResponse
+from loguru import logger
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+
+class LLMCache:
+    """On-disk memo of Gemini responses keyed by model, prompt, schema and config."""
+
+    def __init__(self, path: Path, ttl: timedelta = timedelta(days=1)):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+
+    def key(
+        self,
+        model: str,
+        prompt: str,
+        response_schema,
+        config: genai.types.GenerateContentConfig,
+    ) -> str:
+        return request_key(model, prompt, response_schema, config)
+
+    def entry_path(self, key: str) -> Path:
+        return self.path / f"{key}.json"
+
+    def get(self, key: str, response_schema) -> GenerateContentResponse | None:
+        path = self.entry_path(key)
+
+        try:
+            entry = json.loads(path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if time.time() - entry["created_at"] > self.ttl.total_seconds():
+            path.unlink(missing_ok=True)
+            return None
+
+        response = GenerateContentResponse.model_validate(entry["response"])
+
+        try:
+            response.parsed = TypeAdapter(response_schema).validate_json(
+                response.text or ""
+            )
+        except ValidationError:
+            logger.warning(f"Discarding LLM cache entry that no longer parses: {key}")
+            path.unlink(missing_ok=True)
+            return None
+
+        return response
+
+    def put(self, key: str, response: GenerateContentResponse):
+        entry = {
+            "created_at": time.time(),
+            "response": response.model_dump(
+                mode="json", exclude={"parsed"}, exclude_none=True
+            ),
+        }
+
+        path = self.entry_path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(entry))
+        os.replace(tmp_path, path)
+
+
+def request_key(
+    model: str,
+    prompt: str,
+    response_schema,
+    config: genai.types.GenerateContentConfig,
+) -> str:
+    parts = [
+        model,
+        prompt,
+        json.dumps(schema_of(response_schema), sort_keys=True),
+        config.model_dump_json(exclude={"response_schema"}, exclude_none=True),
+    ]
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+def schema_of(response_schema) -> dict:
+    if isinstance(response_schema, type) and issubclass(response_schema, BaseModel):
+        return response_schema.model_json_schema()
+
+    return TypeAdapter(response_schema).json_schema()
+
+
+active_cache: LLMCache | None = None
+
+
+def configure(path: Path | None, ttl: timedelta = timedelta(days=1)):
+    global active_cache
+    active_cache = LLMCache(path, ttl) if path is not None else None
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+
+from ..dedup import normalize_title
+from .event_detail_store import fingerprint
+from .gemini_event_research_agent import Event, event_key
+
+
+@dataclass
+class SourcedEvent:
+    """An event and the fingerprints of the page blocks it was read from."""
+
+    event: Event
+    blocks: list[str]
+
+
+@dataclass
+class PageSnapshot:
+    url: str
+    extracted_on: date
+    blocks: list[str] = field(default_factory=list)
+    events: list[SourcedEvent] = field(default_factory=list)
+
+
+@dataclass
+class PageUpdate:
+    """Events still backed by the page, and the runs of blocks to extract again."""
+
+    carried: list[SourcedEvent]
+    runs: list[list[int]]
+
+
+class PageSnapshotStore:
+    """Yesterday's blocks of event pages and the events read from each, by URL.
+
+    A snapshot is dropped once its last full extraction is `refresh_days`
+    old, so events that only just entered the research window are found.
+    """
+
+    def __init__(self, path: Path, refresh_days: int = 7):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.refresh_days = refresh_days
+
+    def entry_path(self, url: str) -> Path:
+        return self.path / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def load(self, url: str, today: date) -> PageSnapshot | None:
+        try:
+            entry = json.loads(self.entry_path(url).read_text())
+            if entry["url"] != url:
+                return None
+
+            extracted_on = date.fromisoformat(entry["extracted_on"])
+            if today - extracted_on >= timedelta(days=self.refresh_days):
+                return None
+
+            return PageSnapshot(
+                url,
+                extracted_on,
+                entry["blocks"],
+                [
+                    SourcedEvent(Event.model_validate(item["event"]), item["blocks"])
+                    for item in entry["events"]
+                ],
+            )
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, ValueError):
+            return None
+
+    def save(self, snapshot: PageSnapshot):
+        entry = {
+            "url": snapshot.url,
+            "extracted_on": snapshot.extracted_on.isoformat(),
+            "blocks": snapshot.blocks,
+            "events": [
+                {
+                    "event": sourced.event.model_dump(mode="json"),
+                    "blocks": sourced.blocks,
+                }
+                for sourced in snapshot.events
+            ],
+        }
+
+        path = self.entry_path(snapshot.url)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(entry))
+        os.replace(tmp_path, path)
+
+
+def plan_update(snapshot: PageSnapshot, blocks: list[str]) -> PageUpdate:
+    """Compare a page's blocks with its snapshot.
+
+    Events whose blocks are all still on the page are carried forward. New
+    blocks, and surviving blocks of events that weren't, are grouped into
+    runs of neighbours to extract, each led by the block before it as
+    context (dates are often in a heading above the event).
+    """
+    fingerprints = [fingerprint(block) for block in blocks]
+    present = set(fingerprints)
+
+    carried = []
+    stale = set()
+    for sourced in snapshot.events:
+        if all(block in present for block in sourced.blocks):
+            carried.append(sourced)
+        else:
+            stale.update(sourced.blocks)
+
+    known = set(snapshot.blocks)
+    changed = [
+        index
+        for index, block in enumerate(fingerprints)
+        if block not in known or block in stale
+    ]
+
+    runs: list[list[int]] = []
+    for index in changed:
+        if runs and runs[-1][-1] == index - 1:
+            runs[-1].append(index)
+        else:
+            runs.append([index - 1, index] if index > 0 else [index])
+
+    return PageUpdate(carried, runs)
+
+
+def attribute(
+    events: list[Event], blocks: list[str], run: list[int]
+) -> list[SourcedEvent]:
+    """Tie events extracted from a run to the blocks they were read from.
+
+    An event's blocks start at the first one mentioning its title and run
+    up to the next event's title. Events whose title isn't found verbatim
+    depend on the whole run.
+    """
+    starts = {}
+    for event in events:
+        title = normalize_title(event.title)
+        starts[id(event)] = next(
+            (
+                position
+                for position, index in enumerate(run)
+                if title and title in normalize_title(blocks[index])
+            ),
+            None,
+        )
+
+    boundaries = sorted(set(start for start in starts.values() if start is not None))
+    sourced = []
+
+    for event in events:
+        start = starts[id(event)]
+        if start is None:
+            span = run
+        else:
+            end = next((bound for bound in boundaries if bound > start), len(run))
+            span = run[start:end]
+
+        sourced.append(SourcedEvent(event, [fingerprint(blocks[i]) for i in span]))
+
+    return sourced
+
+
+def dedupe_sourced(events: list[SourcedEvent]) -> list[SourcedEvent]:
+    seen = set()
+    unique = []
+
+    for sourced in events:
+        key = event_key(sourced.event)
+        if key not in seen:
+            seen.add(key)
+            unique.append(sourced)
+
+    return unique
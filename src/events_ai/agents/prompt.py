@@ -1,20 +1,45 @@
+import threading
 from datetime import date, timedelta
 
-from jinja2 import Environment, PackageLoader
+from jinja2 import Environment, PackageLoader, Template
 
 
 def build_prompt(prompt_template: str, **kwargs) -> str:
+    return get_template(prompt_template).render(**kwargs)
+
+
+def get_template(prompt_template: str) -> Template:
+    """Compiled template from the shared environment, loaded once per process."""
+    template = templates.get(prompt_template)
+
+    if template is None:
+        with templates_lock:
+            template = templates.get(prompt_template)
+            if template is None:
+                template = environment.get_template(prompt_template)
+                templates[prompt_template] = template
+
+    return template
+
+
+def precompile():
+    """Load and compile every prompt template up front."""
+    for name in environment.list_templates():
+        get_template(name)
+
+
+def create_environment() -> Environment:
     env = Environment(
-        loader=PackageLoader("events_ai", "assets/prompts"), trim_blocks=True
+        loader=PackageLoader("events_ai", "assets/prompts"),
+        trim_blocks=True,
+        auto_reload=False,
     )
 
     env.filters["date_american"] = filter_date_american
     env.filters["date_year"] = filter_date_year
     env.filters["date_weekday"] = filter_date_weekday
     env.filters["date_offset"] = filter_date_offset
-
-    template = env.get_template(prompt_template)
-    return template.render(**kwargs)
+    return env
 
 
 def filter_date_american(date: date) -> str:
@@ -31,3 +56,9 @@ def filter_date_weekday(date: date) -> str:
 
 def filter_date_offset(date: date, days: int) -> date:
     return date + timedelta(days=days)
+
+
+# Rendering a compiled template is thread-safe, so one environment serves all
+environment = create_environment()
+templates: dict[str, Template] = {}
+templates_lock = threading.Lock()
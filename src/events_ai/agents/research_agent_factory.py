@@ -2,19 +2,75 @@ from datetime import date
 
 from google import genai
 
+from events_ai.agents.event_detail_store import EventDetailStore
 from events_ai.agents.event_list_agent import EventListAgent
 from events_ai.agents.flat_event_page_agent import FlatEventPageAgent
 from events_ai.agents.gemini_event_research_agent import GeminiEventResearchAgent
+from events_ai.agents.page_snapshot_store import PageSnapshotStore
+from events_ai.agents.selector_agent import SelectorAgent
+from events_ai.agents.selector_rules import SelectorRules
+from events_ai.agents.structured_data_agent import StructuredDataAgent
+from events_ai.research_journal import TargetJournal
 
 
 class ResearchAgentFactory:
     @staticmethod
     def build(
-        llm: genai.Client, events_start: date, events_finish: date, **kwargs
+        llm: genai.Client,
+        events_start: date,
+        events_finish: date,
+        detail_store: EventDetailStore | None = None,
+        journal: TargetJournal | None = None,
+        snapshot_store: PageSnapshotStore | None = None,
+        **kwargs,
     ) -> GeminiEventResearchAgent:
         agent_type = kwargs.get("agent", "")
 
-        if agent_type == "EventListAgent":
+        if agent_type in ("StructuredDataAgent", "auto"):
+            # "auto" reads structured data when the site has it, else falls back
+            if agent_type == "auto":
+                kwargs.setdefault("fallback_agent", "EventListAgent")
+
+            return StructuredDataAgent(
+                llm,
+                events_start,
+                events_finish,
+                kwargs.get("url", ""),
+                organization=kwargs.get("organization", ""),
+                use_selenium=kwargs.get("use_selenium", False),
+                ical_url=kwargs.get("ical_url", None),
+                fallback=ResearchAgentFactory.build_fallback(
+                    llm,
+                    events_start,
+                    events_finish,
+                    detail_store,
+                    journal,
+                    snapshot_store,
+                    **kwargs,
+                ),
+                journal=journal,
+            )
+        elif agent_type == "SelectorAgent":
+            return SelectorAgent(
+                llm,
+                events_start,
+                events_finish,
+                kwargs.get("url", ""),
+                SelectorRules(kwargs.get("selectors", {}), kwargs.get("defaults")),
+                organization=kwargs.get("organization", ""),
+                use_selenium=kwargs.get("use_selenium", False),
+                fallback=ResearchAgentFactory.build_fallback(
+                    llm,
+                    events_start,
+                    events_finish,
+                    detail_store,
+                    journal,
+                    snapshot_store,
+                    **kwargs,
+                ),
+                journal=journal,
+            )
+        elif agent_type == "EventListAgent":
             return EventListAgent(
                 llm,
                 events_start,
@@ -22,6 +78,12 @@ class ResearchAgentFactory:
                 kwargs.get("url", ""),
                 use_selenium=kwargs.get("use_selenium", False),
                 start_url_params=kwargs.get("url_params", None),
+                chunk_tokens=kwargs.get("chunk_tokens", None),
+                detail_store=detail_store,
+                batch_tokens=kwargs.get("batch_tokens", None),
+                journal=journal,
+                max_depth=kwargs.get("max_depth", 0),
+                max_pages=kwargs.get("max_pages", 1),
             )
         elif agent_type == "FlatEventPageAgent":
             return FlatEventPageAgent(
@@ -31,6 +93,37 @@ class ResearchAgentFactory:
                 kwargs.get("url", ""),
                 use_selenium=kwargs.get("use_selenium", False),
                 split_first=kwargs.get("split_first", False),
+                chunk_tokens=kwargs.get("chunk_tokens", None),
+                journal=journal,
+                snapshot_store=snapshot_store,
             )
         else:
             raise ValueError(f"Couldn't create research agent of type '{agent_type}'")
+
+    @staticmethod
+    def build_fallback(
+        llm: genai.Client,
+        events_start: date,
+        events_finish: date,
+        detail_store: EventDetailStore | None = None,
+        journal: TargetJournal | None = None,
+        snapshot_store: PageSnapshotStore | None = None,
+        **kwargs,
+    ) -> GeminiEventResearchAgent | None:
+        """The `fallback_agent` of a target, for when its fast path finds nothing."""
+        fallback_type = kwargs.get("fallback_agent", None)
+        if fallback_type is None:
+            return None
+
+        if fallback_type not in ("EventListAgent", "FlatEventPageAgent"):
+            raise ValueError(f"Can't fall back to agent type '{fallback_type}'")
+
+        return ResearchAgentFactory.build(
+            llm,
+            events_start,
+            events_finish,
+            detail_store,
+            journal,
+            snapshot_store,
+            **{**kwargs, "agent": fallback_type},
+        )
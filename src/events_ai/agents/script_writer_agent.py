@@ -5,6 +5,7 @@ from google import genai
 from loguru import logger
 from pydantic import BaseModel
 
+from . import gemini_client
 from .prompt import build_prompt
 
 
@@ -57,7 +58,8 @@ class ScriptWriterAgent:
 
         logger.debug(f"Script writer prompt: {prompt}")
 
-        response = llm.models.generate_content(
+        response = gemini_client.generate_content(
+            llm,
             model="gemini-2.5-flash",
             contents=prompt,
             config=genai.types.GenerateContentConfig(
@@ -0,0 +1,122 @@
+import json
+from datetime import date
+
+import pandas as pd
+import structlog
+from google import genai
+from pydantic import ValidationError
+
+from .. import simplify_url
+from ..event_dates import filter_window
+from ..research_journal import TargetJournal
+from .gemini_event_research_agent import (
+    Event,
+    EventsResult,
+    GeminiEventResearchAgent,
+    map_in_threads,
+)
+from .prompt import build_prompt
+from .selector_rules import SelectedRecord, SelectorRules
+
+logger = structlog.get_logger()
+
+
+class SelectorAgent(GeminiEventResearchAgent):
+    """Extracts events with the target's CSS/XPath rules, without the LLM.
+
+    Only records that don't validate as an Event, like one missing its
+    location, are sent to Gemini with their HTML. With a `fallback` agent, a
+    page where the rules select nothing is researched by it instead.
+    """
+
+    def __init__(
+        self,
+        llm: genai.Client,
+        events_start: date,
+        events_finish: date,
+        start_url: str,
+        rules: SelectorRules,
+        organization: str = "",
+        use_selenium: bool = False,
+        fallback: GeminiEventResearchAgent | None = None,
+        journal: TargetJournal | None = None,
+    ):
+        self.start_url = start_url
+        self.rules = rules
+        self.organization = organization
+        self.use_selenium = use_selenium
+        self.fallback = fallback
+        self.journal = journal
+        super().__init__(llm, events_start, events_finish)
+
+    def run(self) -> EventsResult:
+        page_html = simplify_url.get_html(self.start_url, self.use_selenium)
+        records = self.rules.records(page_html, self.start_url)
+
+        if len(records) == 0:
+            if self.fallback is not None:
+                logger.info(
+                    f"Selectors matched nothing at {self.start_url}, "
+                    f"using {type(self.fallback).__name__}"
+                )
+                result = self.fallback.run()
+                self.tokens = self.fallback.tokens
+                return result
+
+            logger.warn(f"Selectors matched nothing at {self.start_url}")
+            return EventsResult(events=[])
+
+        events = [self.validate(record) for record in records]
+        failed = [record for record, event in zip(records, events) if event is None]
+        completed = iter(map_in_threads(self.complete, failed))
+        events = [event or next(completed) for event in events]
+        events = self.in_window([event for event in events if event is not None])
+
+        logger.info(
+            f"Selected {len(records)} events, {len(failed)} completed by Gemini, "
+            f"{len(events)} in the research window"
+        )
+
+        if self.journal is not None:
+            self.journal.save_events(events)
+
+        return EventsResult(events=events)
+
+    def event_fields(self, record: SelectedRecord) -> dict:
+        return {
+            "organization": self.organization,
+            "link": None,
+            "price": None,
+            "target_age": [],
+            **record.values,
+        }
+
+    def validate(self, record: SelectedRecord) -> Event | None:
+        try:
+            return Event.model_validate(self.event_fields(record))
+        except ValidationError:
+            return None
+
+    def complete(self, record: SelectedRecord) -> Event | None:
+        prompt = build_prompt(
+            "event_list_update.txt.jinja2",
+            event=json.dumps(record.values),
+            page=simplify_url.simplify_html(record.html()),
+            start_date=self.events_start,
+        )
+        response = self.ask_gemini("gemini-2.5-flash-lite", prompt, Event)
+        details: Event | None = response.parsed
+        if details is None:
+            logger.warn(f"Couldn't complete selected event {record.values}")
+            return None
+
+        # Selected values are trusted over the model, only gaps are filled
+        return details.model_copy(
+            update={"organization": self.organization, **record.values}
+        )
+
+    def in_window(self, events: list[Event]) -> list[Event]:
+        whens = pd.DataFrame({"when": [event.when for event in events]})
+        days = (self.events_finish - self.events_start).days
+        kept = filter_window(whens, self.events_start, days)
+        return [events[index] for index in kept.index]
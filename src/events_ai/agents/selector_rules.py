@@ -0,0 +1,101 @@
+from dataclasses import dataclass
+from urllib.parse import urljoin
+
+from cssselect import SelectorError
+from lxml import etree
+from lxml.cssselect import CSSSelector
+
+from .structured_data import parse_html
+
+FIELDS = ("title", "when", "location", "link", "description", "price")
+
+
+@dataclass
+class SelectedRecord:
+    """Field values selected from one event's element. Empty fields are left out."""
+
+    values: dict[str, str]
+    element: etree._Element
+
+    def html(self) -> str:
+        return etree.tostring(self.element, encoding="unicode", with_tail=False)
+
+
+class SelectorRules:
+    """CSS or XPath rules, declared per target, that pick events out of a page.
+
+    The `event` rule selects one element per event and the field rules are
+    applied within it. Rules starting with "/", "./" or "(" are XPath, the
+    rest CSS. A `link` rule may select the anchor itself; its href is used.
+    """
+
+    def __init__(
+        self, selectors: dict[str, str], defaults: dict[str, str] | None = None
+    ):
+        if "event" not in selectors:
+            raise ValueError("Selector rules need an 'event' selector")
+
+        unknown = set(selectors) - {"event", *FIELDS}
+        if len(unknown) > 0:
+            raise ValueError(f"Unknown selector fields: {', '.join(sorted(unknown))}")
+
+        self.event = compile_selector(selectors["event"])
+        self.fields = {
+            name: compile_selector(rule)
+            for name, rule in selectors.items()
+            if name != "event"
+        }
+        self.defaults = defaults or {}
+
+    def records(self, page_html: str, page_url: str) -> list[SelectedRecord]:
+        tree = parse_html(page_html)
+        if tree is None:
+            return []
+
+        records = []
+        for element in self.event(tree):
+            values = dict(self.defaults)
+
+            for name, selector in self.fields.items():
+                value = select_value(selector, element, name)
+                if value:
+                    values[name] = value
+
+            if "link" in values:
+                values["link"] = urljoin(page_url, values["link"])
+
+            records.append(SelectedRecord(values, element))
+
+        return records
+
+
+def compile_selector(rule: str):
+    try:
+        if rule.startswith(("/", "./", "(")):
+            return etree.XPath(rule)
+
+        return CSSSelector(rule, translator="html")
+    except (etree.XPathSyntaxError, SelectorError) as err:
+        raise ValueError(f"Invalid selector '{rule}': {err}") from err
+
+
+def select_value(selector, element, name: str) -> str | None:
+    results = selector(element)
+    if not isinstance(results, list):
+        results = [results]
+
+    for result in results:
+        if isinstance(result, etree._Element):
+            if name == "link":
+                value = result.get("href") or next(
+                    iter(result.xpath(".//a/@href")), None
+                )
+            else:
+                value = result.text_content()
+        else:
+            value = str(result)
+
+        if value is not None and value.strip():
+            return " ".join(value.split())
+
+    return None
@@ -3,6 +3,7 @@ from datetime import date
 from google import genai
 from loguru import logger
 
+from events_ai.agents import gemini_client
 from events_ai.agents.prompt import build_prompt
 from events_ai.agents.script_writer_agent import ScriptResult
 
@@ -19,7 +20,8 @@ class SocialMediaWriterAgent:
 
         logger.debug(f"Social media writer prompt: {prompt}")
 
-        response = llm.models.generate_content(
+        response = gemini_client.generate_content(
+            llm,
             model="gemini-2.5-flash",
             contents=prompt,
             config=genai.types.GenerateContentConfig(
@@ -8,6 +8,8 @@ from loguru import logger
 from PIL import Image
 from pydantic import BaseModel
 
+from .. import tracing
+from . import gemini_client
 from .prompt import build_prompt
 from .script_writer_agent import ScriptResult
 
@@ -64,7 +66,8 @@ class StoryboardAgent:
             logger.info(
                 f"Generating frame {i + 1}/{len(self.script.stories)}: {frame_path}"
             )
-            self.generate_frame(llm, story.image_desc, frame_path)
+            with tracing.span("frame", "frame", frame=frame_path):
+                self.generate_frame(llm, story.image_desc, frame_path)
             take_id += 1
             result.takes.append(
                 Take(
@@ -97,10 +100,9 @@ class StoryboardAgent:
             "background.txt.jinja2", background_description=background_desc
         )
 
-        done = False
-
-        while not done and retries > 0:
-            response = llm.models.generate_content(
+        for attempt in range(retries):
+            response = gemini_client.generate_content(
+                llm,
                 model="gemini-2.5-flash-image",
                 contents=prompt,
                 config=genai.types.GenerateContentConfig(
@@ -114,31 +116,22 @@ class StoryboardAgent:
             candidates = response.candidates or []
 
             if len(candidates) < 1:
-                logger.warning(
-                    f"Image generation had no candidates. Waiting. Retries left: {retries}"
-                )
-
-                if retries > 0:
-                    retries -= 1
-                    time.sleep(5)
-                    continue
-                else:
-                    raise StoryboardImageGenerationError()
-
-            candidate = candidates[0]
-            if candidate.finish_reason == FinishReason.NO_IMAGE:
-                logger.warning(
-                    f"Image generation had no image. Waiting. Retries left: {retries}"
-                )
-
-                if retries > 0:
-                    retries -= 1
-                    time.sleep(5)
-                    continue
-                else:
-                    raise StoryboardImageGenerationError()
-
-            done = True
+                problem = "no candidates"
+            elif candidates[0].finish_reason == FinishReason.NO_IMAGE:
+                problem = "no image"
+            else:
+                candidate = candidates[0]
+                break
+
+            if attempt == retries - 1:
+                raise StoryboardImageGenerationError()
+
+            delay = gemini_client.backoff_delay(attempt)
+            logger.warning(
+                f"Image generation had {problem}. Waiting {delay:.1f}s. "
+                f"Retries left: {retries - attempt - 1}"
+            )
+            time.sleep(delay)
 
         for part in candidate.content.parts:
             if part.text is not None:
@@ -152,7 +145,8 @@ class StoryboardAgent:
             "frame.txt.jinja2", background_description=background_desc
         )
 
-        response = llm.models.generate_content(
+        response = gemini_client.generate_content(
+            llm,
             model="gemini-2.5-flash-image",
             contents=[prompt, self.base_image],
             config=genai.types.GenerateContentConfig(
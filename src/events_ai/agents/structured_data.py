@@ -0,0 +1,349 @@
+import html
+import json
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from urllib.parse import urljoin, urlsplit
+
+import icalendar
+import lxml.html
+from lxml import etree
+
+# Links that look like an iCal export of the calendar (Tribe Events uses ?ical=1)
+ICAL_HREF = re.compile(r"\.ics\b|[?&]ical=|icalendar", re.IGNORECASE)
+
+
+@dataclass
+class FoundEvent:
+    """An event read from structured data. Fields the source didn't give are None."""
+
+    title: str
+    start: datetime | date
+    end: datetime | date | None = None
+    link: str | None = None
+    description: str | None = None
+    location: str | None = None
+    price: str | None = None
+
+    @property
+    def when(self) -> str:
+        when = format_date(self.start)
+        if self.end is not None and self.end != self.start:
+            when += " to " + format_date(self.end)
+
+        return when
+
+    def overlaps(self, start: date, finish: date) -> bool:
+        first = as_date(self.start)
+        last = as_date(self.end) if self.end is not None else first
+        return first <= finish and last >= start
+
+
+def html_events(page_html: str, page_url: str) -> list[FoundEvent]:
+    """Events published in a page as schema.org JSON-LD or microdata."""
+    tree = parse_html(page_html)
+    if tree is None:
+        return []
+
+    events = json_ld_events(tree, page_url) + microdata_events(tree, page_url)
+
+    seen = set()
+    unique = []
+    for event in events:
+        key = (event.title.lower(), event.start)
+        if key not in seen:
+            seen.add(key)
+            unique.append(event)
+
+    return unique
+
+
+def ical_links(page_html: str, page_url: str) -> list[str]:
+    """Links to iCal feeds on the same host, advertised or linked from the page."""
+    tree = parse_html(page_html)
+    if tree is None:
+        return []
+
+    hrefs = tree.xpath('//link[@type="text/calendar"]/@href')
+    hrefs += [href for href in tree.xpath("//a/@href") if ICAL_HREF.search(href)]
+
+    host = urlsplit(page_url).netloc.lower()
+    links = []
+
+    for href in hrefs:
+        href = re.sub(r"^webcals?://", "https://", href.strip(), flags=re.IGNORECASE)
+        url = urljoin(page_url, href)
+        if urlsplit(url).netloc.lower() == host and url not in links:
+            links.append(url)
+
+    return links
+
+
+def json_ld_events(tree, page_url: str) -> list[FoundEvent]:
+    events = []
+
+    for script in tree.xpath('//script[@type="application/ld+json"]'):
+        try:
+            data = json.loads(script.text or "", strict=False)
+        except ValueError:
+            continue
+
+        for item in walk_json_ld(data):
+            if is_event_type(item.get("@type")):
+                event = json_ld_event(item, page_url)
+                if event is not None:
+                    events.append(event)
+
+    return events
+
+
+def walk_json_ld(data):
+    if isinstance(data, list):
+        for item in data:
+            yield from walk_json_ld(item)
+    elif isinstance(data, dict):
+        yield data
+        yield from walk_json_ld(data.get("@graph", []))
+
+
+def is_event_type(types) -> bool:
+    if not isinstance(types, list):
+        types = [types]
+
+    # Covers subtypes like MusicEvent and TheaterEvent
+    return any(isinstance(type, str) and type.endswith("Event") for type in types)
+
+
+def json_ld_event(item: dict, page_url: str) -> FoundEvent | None:
+    title = clean_text(item.get("name"))
+    start = parse_datetime(item.get("startDate"))
+    if not title or start is None:
+        return None
+
+    url = item.get("url")
+    return FoundEvent(
+        title=title,
+        start=start,
+        end=parse_datetime(item.get("endDate")),
+        link=urljoin(page_url, url) if isinstance(url, str) and url else None,
+        description=clean_text(item.get("description")),
+        location=json_ld_location(item.get("location")),
+        price=json_ld_price(item.get("offers")),
+    )
+
+
+def json_ld_location(location) -> str | None:
+    if isinstance(location, list):
+        parts = [json_ld_location(item) for item in location]
+        return "; ".join(part for part in parts if part) or None
+
+    if isinstance(location, str):
+        return clean_text(location)
+
+    if not isinstance(location, dict):
+        return None
+
+    if location.get("@type") == "VirtualLocation":
+        return "Online"
+
+    address = location.get("address")
+    if isinstance(address, dict):
+        address = ", ".join(
+            str(address[key])
+            for key in ("streetAddress", "addressLocality", "addressRegion")
+            if address.get(key)
+        )
+
+    parts = [clean_text(location.get("name")), clean_text(address)]
+    return ", ".join(part for part in parts if part) or None
+
+
+def json_ld_price(offers) -> str | None:
+    if isinstance(offers, list):
+        offers = offers[0] if offers else None
+
+    if not isinstance(offers, dict) or offers.get("price") in (None, ""):
+        return None
+
+    return format_price(str(offers["price"]), offers.get("priceCurrency"))
+
+
+def microdata_events(tree, page_url: str) -> list[FoundEvent]:
+    events = []
+
+    for scope in tree.xpath("//*[@itemscope][contains(@itemtype, 'schema.org/')]"):
+        if not is_event_type(scope.get("itemtype", "").rstrip("/").split("/")[-1]):
+            continue
+
+        props = microdata_props(scope)
+        title = clean_text(props.get("name"))
+        start = parse_datetime(props.get("startDate"))
+        if not title or start is None:
+            continue
+
+        link = props.get("url")
+        price = props.get("price")
+        events.append(
+            FoundEvent(
+                title=title,
+                start=start,
+                end=parse_datetime(props.get("endDate")),
+                link=urljoin(page_url, link) if link else None,
+                description=clean_text(props.get("description")),
+                location=clean_text(props.get("location")),
+                price=format_price(price, props.get("priceCurrency"))
+                if price
+                else None,
+            )
+        )
+
+    return events
+
+
+def microdata_props(scope) -> dict[str, str]:
+    """First value of each itemprop inside a scope, nested scopes flattened to text."""
+    props = {}
+
+    for element in scope.xpath(".//*[@itemprop]"):
+        owner = next(element.iterancestors(), None)
+        while owner is not None and owner.get("itemscope") is None:
+            owner = owner.getparent()
+
+        # Properties of nested items, like a Place's name, belong to them
+        if owner is not scope:
+            continue
+
+        for name in element.get("itemprop").split():
+            if name in props:
+                continue
+
+            if element.get("content") is not None:
+                props[name] = element.get("content")
+            elif element.get("datetime") is not None:
+                props[name] = element.get("datetime")
+            elif element.tag in ("a", "link") and element.get("href"):
+                props[name] = element.get("href")
+            else:
+                props[name] = element.text_content()
+
+    return props
+
+
+def ical_events(text: str | bytes, page_url: str) -> list[FoundEvent]:
+    """Events in an iCal feed. Recurrence rules are not expanded."""
+    try:
+        calendar = icalendar.Calendar.from_ical(text)
+    except ValueError:
+        return []
+
+    events = []
+    for component in calendar.walk("VEVENT"):
+        title = clean_text(str(component.get("SUMMARY", "")))
+        start = component.get("DTSTART")
+        if not title or start is None:
+            continue
+
+        end = component.get("DTEND")
+        end = local_time(end.dt) if end is not None else None
+        if type(end) is date:
+            # All-day events end on the day after, exclusively
+            end -= timedelta(days=1)
+
+        url = component.get("URL")
+        description = component.get("DESCRIPTION")
+        location = component.get("LOCATION")
+        events.append(
+            FoundEvent(
+                title=title,
+                start=local_time(start.dt),
+                end=end,
+                link=urljoin(page_url, str(url)) if url else None,
+                description=clean_text(str(description)) if description else None,
+                location=clean_text(str(location)) if location else None,
+            )
+        )
+
+    return events
+
+
+def parse_html(page_html: str):
+    if not page_html.strip():
+        return None
+
+    try:
+        return lxml.html.document_fromstring(page_html)
+    except (ValueError, etree.ParserError):
+        try:
+            return lxml.html.document_fromstring(page_html.encode())
+        except (ValueError, etree.ParserError):
+            return None
+
+
+def parse_datetime(value) -> datetime | date | None:
+    if isinstance(value, list):
+        value = value[0] if value else None
+
+    if not isinstance(value, str) or not value.strip():
+        return None
+
+    value = value.strip()
+    try:
+        if re.fullmatch(r"\d{4}-\d{2}-\d{2}", value):
+            return date.fromisoformat(value)
+
+        return local_time(datetime.fromisoformat(value))
+    except ValueError:
+        return None
+
+
+def local_time(value: datetime | date) -> datetime | date:
+    """Wall-clock time of the event, without a time zone.
+
+    Times given in UTC are converted to this machine's zone. Other offsets are
+    the venue's own, so their wall-clock time is kept as is.
+    """
+    if not isinstance(value, datetime) or value.tzinfo is None:
+        return value
+
+    if value.utcoffset() == timezone.utc.utcoffset(None):
+        value = value.astimezone()
+
+    return value.replace(tzinfo=None)
+
+
+def as_date(value: datetime | date) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def format_date(value: datetime | date) -> str:
+    if isinstance(value, datetime) and value.time() != time(0, 0):
+        return value.strftime("%Y-%m-%dT%H:%M")
+
+    return as_date(value).isoformat()
+
+
+def format_price(price: str, currency: str | None) -> str:
+    if price.strip() in ("0", "0.0", "0.00"):
+        return "Free"
+
+    if currency in (None, "", "USD"):
+        return price if price.startswith("$") else f"${price}"
+
+    return f"{price} {currency}"
+
+
+def clean_text(value) -> str | None:
+    """Text without markup, entities or runs of whitespace."""
+    if not isinstance(value, str) or not value.strip():
+        return None
+
+    text = html.unescape(value)
+    if "<" in text:
+        try:
+            text = lxml.html.fragment_fromstring(
+                text, create_parent="div"
+            ).text_content()
+        except etree.ParserError:
+            pass
+
+    return re.sub(r"\s+", " ", text).strip() or None
@@ -0,0 +1,137 @@
+from datetime import date
+
+import structlog
+from google import genai
+
+from .. import simplify_url
+from ..research_journal import TargetJournal
+from .gemini_event_research_agent import (
+    Event,
+    EventsResult,
+    GeminiEventResearchAgent,
+    map_in_threads,
+)
+from .prompt import build_prompt
+from .structured_data import FoundEvent, html_events, ical_events, ical_links
+
+logger = structlog.get_logger()
+
+# Fields worth a detail page and an LLM call when the structured data lacks them
+REQUIRED_FIELDS = ("description", "location")
+
+
+class StructuredDataAgent(GeminiEventResearchAgent):
+    """Reads events from schema.org JSON-LD, microdata or an iCal feed.
+
+    Gemini is only asked to fill in fields the structured data doesn't give.
+    With a `fallback` agent, pages without structured events are researched
+    by it instead.
+    """
+
+    def __init__(
+        self,
+        llm: genai.Client,
+        events_start: date,
+        events_finish: date,
+        start_url: str,
+        organization: str = "",
+        use_selenium: bool = False,
+        ical_url: str | None = None,
+        fallback: GeminiEventResearchAgent | None = None,
+        journal: TargetJournal | None = None,
+    ):
+        self.start_url = start_url
+        self.organization = organization
+        self.use_selenium = use_selenium
+        self.ical_url = ical_url
+        self.fallback = fallback
+        self.journal = journal
+        super().__init__(llm, events_start, events_finish)
+
+    def run(self) -> EventsResult:
+        found = self.find_events()
+
+        if len(found) == 0:
+            if self.fallback is not None:
+                logger.info(
+                    f"No structured events at {self.start_url}, "
+                    f"using {type(self.fallback).__name__}"
+                )
+                result = self.fallback.run()
+                self.tokens = self.fallback.tokens
+                return result
+
+            logger.warn(f"No structured events at {self.start_url}")
+            return EventsResult(events=[])
+
+        found = [
+            event
+            for event in found
+            if event.overlaps(self.events_start, self.events_finish)
+        ]
+        events = map_in_threads(self.complete, found)
+        logger.info(
+            f"Read {len(events)} structured events, "
+            f"{self.tokens.total} tokens to complete them"
+        )
+
+        if self.journal is not None:
+            self.journal.save_events(events)
+
+        return EventsResult(events=events)
+
+    def find_events(self) -> list[FoundEvent]:
+        if self.ical_url is not None:
+            return self.read_ical(self.ical_url)
+
+        page_html = simplify_url.get_html(self.start_url, self.use_selenium)
+        found = html_events(page_html, self.start_url)
+        if len(found) > 0:
+            return found
+
+        for link in ical_links(page_html, self.start_url):
+            found = self.read_ical(link)
+            if len(found) > 0:
+                logger.info(f"Found iCal feed {link}")
+                return found
+
+        return []
+
+    def read_ical(self, url: str) -> list[FoundEvent]:
+        return ical_events(simplify_url.get_html(url), url)
+
+    def complete(self, found: FoundEvent) -> Event:
+        event = Event(
+            organization=self.organization,
+            title=found.title,
+            link=found.link,
+            description=found.description or "",
+            when=found.when,
+            location=found.location or "",
+            price=found.price,
+            target_age=[],
+        )
+
+        missing = [field for field in REQUIRED_FIELDS if not getattr(event, field)]
+        if len(missing) == 0 or event.link is None:
+            return event
+
+        page = simplify_url.get(event.link, self.use_selenium)
+        prompt = build_prompt(
+            "event_list_update.txt.jinja2",
+            event=event.model_dump_json(),
+            page=page,
+            start_date=self.events_start,
+        )
+        response = self.ask_gemini("gemini-2.5-flash-lite", prompt, Event)
+        details: Event | None = response.parsed
+        if details is None:
+            return event
+
+        # Structured fields are trusted over the model, only gaps are filled
+        for field in missing:
+            setattr(event, field, getattr(details, field))
+
+        event.price = event.price or details.price
+        event.target_age = details.target_age
+        return event
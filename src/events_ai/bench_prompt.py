@@ -0,0 +1,79 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from jinja2 import Environment, PackageLoader
+
+from events_ai.agents import prompt
+from events_ai.agents.gemini_event_research_agent import Event
+
+
+def build_prompt_uncached(prompt_template: str, **kwargs) -> str:
+    """The original build_prompt(): a new environment and compile per call."""
+    env = Environment(
+        loader=PackageLoader("events_ai", "assets/prompts"), trim_blocks=True
+    )
+
+    env.filters["date_american"] = prompt.filter_date_american
+    env.filters["date_year"] = prompt.filter_date_year
+    env.filters["date_weekday"] = prompt.filter_date_weekday
+    env.filters["date_offset"] = prompt.filter_date_offset
+
+    template = env.get_template(prompt_template)
+    return template.render(**kwargs)
+
+
+def sample_kwargs() -> dict:
+    event = Event(
+        organization="Larchmont Public Library",
+        title="Story Time",
+        link="https://example.com/events/story-time",
+        description="Stories and songs for toddlers.",
+        when="2025-10-20 10:30",
+        location="Children's Room",
+        price=None,
+        target_age=["kids"],
+    )
+    return {
+        "event": event.model_dump_json(),
+        "page": "Story Time with Ms. Jane. " * 200,
+        "start_date": date(2025, 10, 20),
+        "finish_date": date(2025, 11, 20),
+    }
+
+
+def throughput(build, calls: int, threads: int) -> float:
+    kwargs = sample_kwargs()
+
+    def render(_):
+        build("event_list_update.txt.jinja2", **kwargs)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(render, range(calls)))
+
+    return calls / (time.perf_counter() - start)
+
+
+def bench_cli():
+    parser = argparse.ArgumentParser(
+        description="Measure prompt building throughput, uncached vs. cached."
+    )
+    parser.add_argument("-n", "--calls", type=int, default=2000)
+    parser.add_argument("-t", "--threads", type=int, nargs="+", default=[1, 8])
+    args = parser.parse_args()
+
+    prompt.precompile()
+
+    print(f"{'threads':>8} {'uncached/s':>12} {'cached/s':>12} {'speedup':>8}")
+    for threads in args.threads:
+        uncached = throughput(build_prompt_uncached, args.calls, threads)
+        cached = throughput(prompt.build_prompt, args.calls, threads)
+        print(
+            f"{threads:>8} {uncached:>12,.0f} {cached:>12,.0f} {cached / uncached:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    bench_cli()
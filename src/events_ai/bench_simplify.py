@@ -0,0 +1,76 @@
+import argparse
+import json
+import time
+from pathlib import Path
+
+from events_ai.simplify_url import simplify_html
+
+ENGINES = ["html.parser", "lxml"]
+
+
+def load_pages(paths: list[Path]) -> dict[str, str]:
+    """Load saved pages from .html files or page cache entries (.json)."""
+    files = []
+    for path in paths:
+        if path.is_dir():
+            files += sorted(path.glob("*.html")) + sorted(path.glob("*.json"))
+        else:
+            files.append(path)
+
+    pages = {}
+    for file in files:
+        if file.suffix == ".json":
+            entry = json.loads(file.read_text())
+            pages[entry["url"]] = entry["html"]
+        else:
+            pages[file.name] = file.read_text(errors="replace")
+
+    return pages
+
+
+def time_engine(html: str, engine: str, repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        simplified = simplify_html(html, engine)
+        best = min(best, time.perf_counter() - start)
+
+    return best, len(simplified)
+
+
+def bench_cli():
+    parser = argparse.ArgumentParser(
+        description="Compare HTML simplification engines over saved pages."
+    )
+    parser.add_argument("pages", nargs="+", type=Path)
+    parser.add_argument("-n", "--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages)
+    totals = {engine: [0.0, 0] for engine in ENGINES}
+
+    header = f"{'page':<50} {'html':>10}"
+    for engine in ENGINES:
+        header += f" {engine + ' s':>14} {engine + ' chars':>18}"
+    print(header)
+
+    for name, html in pages.items():
+        row = f"{name[-50:]:<50} {len(html):>10,}"
+        for engine in ENGINES:
+            seconds, size = time_engine(html, engine, args.repeat)
+            totals[engine][0] += seconds
+            totals[engine][1] += size
+            row += f" {seconds:>14.3f} {size:>18,}"
+        print(row)
+
+    print()
+    for engine, (seconds, size) in totals.items():
+        print(f"{engine:<12} total {seconds:8.3f} s, {size:>12,} chars")
+
+    baseline, candidate = totals[ENGINES[0]][0], totals[ENGINES[-1]][0]
+    if candidate > 0:
+        print(f"Speedup: {baseline / candidate:.2f}x over {len(pages)} pages")
+
+
+if __name__ == "__main__":
+    bench_cli()
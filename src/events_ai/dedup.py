@@ -0,0 +1,145 @@
+import re
+import zlib
+from collections import defaultdict
+from datetime import date
+from itertools import combinations
+from urllib.parse import urlsplit, urlunsplit
+
+import pandas as pd
+
+from .event_dates import parse_when
+
+NUM_PERMUTATIONS = 32
+BANDS = 8
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+MERSENNE_PRIME = (1 << 61) - 1
+SIMILARITY_THRESHOLD = 0.5
+
+# Fixed coefficients keep signatures stable between runs
+PERMUTATIONS = [
+    (2 * zlib.crc32(f"a{i}".encode()) + 1, zlib.crc32(f"b{i}".encode()))
+    for i in range(NUM_PERMUTATIONS)
+]
+
+
+def normalize_title(title) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", str(title or "").lower()).strip()
+
+
+def normalize_link(link) -> str | None:
+    if not isinstance(link, str) or not link.strip():
+        return None
+
+    parts = urlsplit(link.strip())
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(
+        ("", parts.netloc.lower().removeprefix("www."), path, parts.query, "")
+    )
+
+
+def shingles(title: str, size: int = 3) -> set[str]:
+    if len(title) <= size:
+        return {title}
+
+    return {title[i : i + size] for i in range(len(title) - size + 1)}
+
+
+def minhash(shingle_set: set[str]) -> list[int]:
+    hashes = [zlib.crc32(shingle.encode()) for shingle in shingle_set]
+    return [min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in PERMUTATIONS]
+
+
+def jaccard(a: set[str], b: set[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def find_duplicates(df: pd.DataFrame, today: date | None = None) -> list[list[int]]:
+    """Group row positions that describe the same event.
+
+    Rows are only compared within the same start date, however it was written
+    (years are inferred relative to `today`). Within a date, candidates
+    share either a normalized link or a MinHash band of their title shingles,
+    so the work grows with the number of events rather than the number of pairs.
+    Candidates merge only when their titles are similar.
+    """
+    titles = [normalize_title(title) for title in df["event"]]
+    links = [normalize_link(link) for link in df["link"]]
+    starts = parse_when(df["when"], today or date.today())["start"]
+    dates = [None if pd.isna(start) else start.date() for start in starts]
+    shingle_sets = [shingles(title) for title in titles]
+
+    buckets: dict[tuple, list[int]] = defaultdict(list)
+    for row, (day, link, shingle_set) in enumerate(zip(dates, links, shingle_sets)):
+        if day is None:
+            continue
+
+        if link is not None:
+            buckets[(day, "link", link)].append(row)
+
+        signature = minhash(shingle_set)
+        for band in range(BANDS):
+            band_rows = tuple(
+                signature[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND]
+            )
+            buckets[(day, band, band_rows)].append(row)
+
+    parent = list(range(len(df)))
+
+    def find(row: int) -> int:
+        while parent[row] != row:
+            parent[row] = parent[parent[row]]
+            row = parent[row]
+        return row
+
+    # A shared link only makes rows candidates: flat pages give every event
+    # the page's own URL, so titles must always be similar to merge
+    checked = set()
+    for rows in buckets.values():
+        for a, b in combinations(rows, 2):
+            if (a, b) in checked:
+                continue
+            checked.add((a, b))
+
+            if jaccard(shingle_sets[a], shingle_sets[b]) >= SIMILARITY_THRESHOLD:
+                parent[find(b)] = find(a)
+
+    groups: dict[int, list[int]] = defaultdict(list)
+    for row in range(len(df)):
+        groups[find(row)].append(row)
+
+    return [rows for rows in groups.values() if len(rows) > 1]
+
+
+def dedupe_events(df: pd.DataFrame, today: date | None = None) -> pd.DataFrame:
+    """Merge duplicate events, keeping every source organization and link."""
+    if len(df) == 0:
+        return df
+
+    df = df.copy()
+    if "sources" not in df.columns:
+        df["sources"] = df["link"]
+
+    drop = []
+    for rows in find_duplicates(df, today):
+        keep = rows[0]
+        organizations = unique_values(df["organization"].iloc[rows])
+        sources = unique_values(df["sources"].iloc[rows])
+
+        df.iloc[keep, df.columns.get_loc("organization")] = "; ".join(organizations)
+        df.iloc[keep, df.columns.get_loc("sources")] = "; ".join(sources)
+        drop += rows[1:]
+
+    return df.drop(index=df.index[drop]).reset_index(drop=True)
+
+
+def unique_values(values: pd.Series) -> list[str]:
+    unique = []
+    for value in values:
+        if not isinstance(value, str):
+            continue
+
+        for part in value.split("; "):
+            if part not in unique:
+                unique.append(part)
+
+    return unique
@@ -0,0 +1,94 @@
+from datetime import date, timedelta
+
+import pandas as pd
+
+ISO_DATE = (
+    r"(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2})"
+    r"(?:[T ](?P<hour>\d{1,2}):(?P<minute>\d{2}))?"
+)
+SECOND_ISO_DATE = r"\d{4}-\d{1,2}-\d{1,2}.*?" + ISO_DATE
+MONTH_NAME_DATE = (
+    r"(?i)\b(?P<month>jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?"
+    r"\s+(?P<day>\d{1,2})(?:st|nd|rd|th)?\b(?:,?\s+(?P<year>\d{4}))?"
+)
+US_DATE = r"\b(?P<month>\d{1,2})/(?P<day>\d{1,2})(?:/(?P<year>\d{4}|\d{2}))?\b"
+
+MONTHS = {
+    name: number
+    for number, name in enumerate(
+        ["jan", "feb", "mar", "apr", "may", "jun"]
+        + ["jul", "aug", "sep", "oct", "nov", "dec"],
+        start=1,
+    )
+}
+
+# Dates without a year further in the past than this are assumed to be next year
+YEAR_ROLLOVER = timedelta(days=60)
+
+
+def parse_when(when: pd.Series, today: date) -> pd.DataFrame:
+    """Parse free-text `when` values into start and end datetimes.
+
+    The result has `start` and `end` columns (NaT when unknown) and a
+    `date_confidence` column: "high" for ISO dates, "low" for dates read from
+    month names or US-style numbers (possibly with an assumed year), and "none"
+    when no date was found.
+    """
+    text = when.astype("string").fillna("")
+
+    iso_start = assemble(text.str.extract(ISO_DATE), today)
+    iso_end = assemble(text.str.extract(SECOND_ISO_DATE), today)
+    named = assemble(text.str.extract(MONTH_NAME_DATE), today)
+    us = assemble(text.str.extract(US_DATE), today)
+
+    start = iso_start.fillna(named).fillna(us)
+    end = iso_end.where(iso_end >= iso_start)
+
+    confidence = pd.Series("none", index=when.index, dtype="string")
+    confidence = confidence.mask(start.notna(), "low").mask(iso_start.notna(), "high")
+
+    return pd.DataFrame(
+        {"start": start, "end": end, "date_confidence": confidence}, index=when.index
+    )
+
+
+def assemble(parts: pd.DataFrame, today: date) -> pd.Series:
+    month = parts["month"]
+    if not pd.api.types.is_numeric_dtype(month):
+        month = month.str.lower().str[:3].map(MONTHS).fillna(month)
+
+    columns = {
+        "year": to_number(parts["year"]),
+        "month": to_number(month),
+        "day": to_number(parts["day"]),
+    }
+    for unit in ("hour", "minute"):
+        if unit in parts:
+            columns[unit] = to_number(parts[unit]).fillna(0)
+
+    missing_year = columns["year"].isna()
+    columns["year"] = columns["year"].fillna(today.year)
+    columns["year"] = columns["year"].mask(
+        columns["year"] < 100, columns["year"] + 2000
+    )
+
+    dates = pd.to_datetime(pd.DataFrame(columns), errors="coerce")
+
+    rollover = missing_year & (dates < pd.Timestamp(today - YEAR_ROLLOVER))
+    return dates.mask(rollover, dates + pd.DateOffset(years=1))
+
+
+def to_number(values: pd.Series) -> pd.Series:
+    return pd.to_numeric(values, errors="coerce").astype("float64")
+
+
+def filter_window(df: pd.DataFrame, start: date, days: int) -> pd.DataFrame:
+    """Keep events overlapping `days` days from `start`, and any without a date."""
+    parsed = parse_when(df["when"], start)
+    window_start = pd.Timestamp(start)
+    window_end = pd.Timestamp(start + timedelta(days=days + 1))
+
+    last = parsed["end"].fillna(parsed["start"])
+    in_window = (parsed["start"] < window_end) & (last >= window_start)
+
+    return df[in_window | parsed["start"].isna()]
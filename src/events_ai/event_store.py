@@ -0,0 +1,156 @@
+import hashlib
+import re
+import sqlite3
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+from .event_dates import parse_when
+
+EVENT_COLUMNS = [
+    "event",
+    "link",
+    "description",
+    "when",
+    "location",
+    "price",
+    "target_age",
+    "organization",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    target TEXT NOT NULL,
+    organization TEXT NOT NULL,
+    event TEXT NOT NULL,
+    link TEXT,
+    description TEXT,
+    "when" TEXT,
+    when_date TEXT,
+    when_end TEXT,
+    location TEXT,
+    price TEXT,
+    target_age TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_organization ON events (organization);
+CREATE INDEX IF NOT EXISTS events_link ON events (link);
+CREATE INDEX IF NOT EXISTS events_when_date ON events (when_date);
+CREATE INDEX IF NOT EXISTS events_last_seen ON events (last_seen);
+"""
+
+UPSERT = """
+INSERT INTO events (
+    key, target, organization, event, link, description, "when", when_date,
+    when_end, location, price, target_age, first_seen, last_seen
+)
+VALUES (
+    :key, :target, :organization, :event, :link, :description, :when, :when_date,
+    :when_end, :location, :price, :target_age, :seen, :seen
+)
+ON CONFLICT (key) DO UPDATE SET
+    target = excluded.target,
+    description = excluded.description,
+    location = excluded.location,
+    price = excluded.price,
+    target_age = excluded.target_age,
+    last_seen = MAX(last_seen, excluded.last_seen)
+"""
+
+
+class EventStore:
+    """SQLite history of researched events, shared across days."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.migrate()
+        self.connection.executescript(SCHEMA)
+
+    def migrate(self):
+        columns = [
+            row[1] for row in self.connection.execute("PRAGMA table_info(events)")
+        ]
+
+        if columns and "when_end" not in columns:
+            self.connection.execute("ALTER TABLE events ADD COLUMN when_end TEXT")
+
+    def upsert(self, target: str, df: pd.DataFrame, seen: date):
+        rows = [
+            {column: none_if_missing(row.get(column)) for column in EVENT_COLUMNS}
+            for row in df.to_dict("records")
+        ]
+
+        dates = parse_when(pd.Series([row["when"] for row in rows]), seen)
+
+        for row, start, end in zip(rows, dates["start"], dates["end"]):
+            row["key"] = event_key(row)
+            row["target"] = target
+            row["when_date"] = None if pd.isna(start) else start.date().isoformat()
+            row["when_end"] = None if pd.isna(end) else end.date().isoformat()
+            row["seen"] = seen.isoformat()
+
+        with self.lock, self.connection:
+            self.connection.executemany(UPSERT, rows)
+
+    def query(self, where: str = "1", params: tuple = ()) -> pd.DataFrame:
+        columns = ", ".join(f'"{column}"' for column in EVENT_COLUMNS)
+        sql = f"SELECT {columns} FROM events WHERE {where} ORDER BY target, id"
+
+        with self.lock:
+            df = pd.read_sql_query(sql, self.connection, params=params)
+
+        df.index.name = "id"
+        return df
+
+    def seen_on(self, day: date) -> pd.DataFrame:
+        return self.query("last_seen = ?", (day.isoformat(),))
+
+    def upcoming(
+        self, start: date, days: int, exclude_links: list[str] | None = None
+    ) -> pd.DataFrame:
+        """Events from the latest research overlapping `days` days from `start`.
+
+        Events whose date couldn't be parsed are kept so the script writer can
+        still judge them.
+        """
+        exclude_links = exclude_links or []
+        placeholders = ", ".join("?" for _ in exclude_links)
+
+        where = (
+            "last_seen = (SELECT MAX(last_seen) FROM events)"
+            " AND (when_date IS NULL"
+            " OR (when_date <= ? AND COALESCE(when_end, when_date) >= ?))"
+            f" AND (link IS NULL OR link NOT IN ({placeholders}))"
+        )
+        params = (
+            (start + timedelta(days=days)).isoformat(),
+            start.isoformat(),
+            *exclude_links,
+        )
+        return self.query(where, params)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+def none_if_missing(value):
+    return None if pd.isna(value) else value
+
+
+def event_key(row: dict) -> str:
+    def normalize(text) -> str:
+        return re.sub(r"\s+", " ", str(text or "")).strip().lower()
+
+    parts = [
+        normalize(row[column]) for column in ("organization", "event", "when", "link")
+    ]
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
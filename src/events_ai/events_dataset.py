@@ -0,0 +1,128 @@
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from .event_dates import parse_when
+
+SCHEMA = pa.schema(
+    [
+        ("event", pa.string()),
+        ("link", pa.string()),
+        ("description", pa.string()),
+        ("when", pa.string()),
+        ("when_start", pa.timestamp("s")),
+        ("when_end", pa.timestamp("s")),
+        ("date_confidence", pa.string()),
+        ("location", pa.string()),
+        ("price", pa.string()),
+        ("target_age", pa.list_(pa.string())),
+        ("organization", pa.string()),
+        ("sources", pa.string()),
+    ]
+)
+
+# Columns of the events.csv export, as before the Parquet dataset
+EXPORT_COLUMNS = [
+    "event",
+    "link",
+    "description",
+    "when",
+    "location",
+    "price",
+    "target_age",
+    "organization",
+    "sources",
+]
+
+
+def to_table(df: pd.DataFrame, today: date) -> pa.Table:
+    """Type a dataframe of events like events.csv for the Parquet dataset."""
+    df = df.reset_index(drop=True)
+    parsed = parse_when(df["when"], today)
+
+    columns = {}
+    for field in SCHEMA:
+        if field.name == "when_start":
+            values = parsed["start"]
+        elif field.name == "when_end":
+            values = parsed["end"]
+        elif field.name == "date_confidence":
+            values = parsed["date_confidence"]
+        elif field.name == "target_age":
+            values = [split_ages(ages) for ages in df["target_age"]]
+        elif field.name in df:
+            values = df[field.name]
+        else:
+            values = [None] * len(df)
+
+        columns[field.name] = pa.array(values, type=field.type, from_pandas=True)
+
+    return pa.table(columns, schema=SCHEMA).sort_by("when_start")
+
+
+def write_events(df: pd.DataFrame, path: Path, today: date):
+    """Write events as Parquet, sorted by date so row groups prune well."""
+    pq.write_table(to_table(df, today), path, compression="zstd")
+
+
+def read_events(
+    path: Path,
+    columns: list[str] | None = None,
+    start: date | None = None,
+    days: int | None = None,
+) -> pd.DataFrame:
+    """Read events, optionally only some columns and only those near a window.
+
+    With `start` and `days`, only events overlapping the window, or with no
+    parsed date, are read. The filter is pushed down to the Parquet reader.
+    """
+    filters = None
+    if start is not None and days is not None:
+        filters = window_filter(start, days)
+
+    table = pq.read_table(path, columns=columns, filters=filters)
+    df = table.to_pandas()
+    df.index.name = "id"
+    return df
+
+
+def window_filter(start: date, days: int) -> pc.Expression:
+    window_start = pa.scalar(pd.Timestamp(start), type=pa.timestamp("s"))
+    window_end = pa.scalar(
+        pd.Timestamp(start + timedelta(days=days + 1)), type=pa.timestamp("s")
+    )
+
+    when_start = pc.field("when_start")
+    when_end = pc.field("when_end")
+    last = pc.if_else(when_end.is_null(), when_start, when_end)
+
+    return when_start.is_null() | ((when_start < window_end) & (last >= window_start))
+
+
+def export_csv(path: Path, csv_path: Path):
+    """Export the dataset in the old events.csv layout."""
+    flatten(read_events(path, columns=EXPORT_COLUMNS)).to_csv(
+        csv_path, index_label="id"
+    )
+
+
+def flatten(df: pd.DataFrame) -> pd.DataFrame:
+    """Join list columns back into strings, as they were in events.csv."""
+    df = df.copy()
+    df["target_age"] = df["target_age"].map(join_ages)
+    return df
+
+
+def split_ages(ages) -> list[str]:
+    if not isinstance(ages, str):
+        return list(ages) if isinstance(ages, list) else []
+
+    return [age.strip() for age in ages.split(",") if age.strip()]
+
+
+def join_ages(ages) -> str:
+    return ", ".join(ages) if ages is not None else ""
@@ -1,9 +1,13 @@
+from datetime import date
+
 from nicegui import ui
-import pandas as pd
+
+from events_ai.event_store import EventStore
 
 
 def main():
-    events = pd.read_csv("gen/events.csv")
+    store = EventStore("gen/events.sqlite")
+    events = store.upcoming(date.today(), 30)
     for i, event in events.iterrows():
         ui.link(f"{event.event} ({event.organization})", event.link)
         with ui.list():
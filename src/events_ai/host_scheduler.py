@@ -0,0 +1,103 @@
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from urllib.parse import urlparse
+
+from loguru import logger
+
+# Waits longer than this are logged as they happen
+SLOW_WAIT = 2.0
+
+
+class HostLane:
+    def __init__(self, concurrency: int):
+        self.semaphore = threading.BoundedSemaphore(concurrency)
+        self.gates: dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+        self.lock = threading.Lock()
+        self.next_start = 0.0
+        self.requests = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class HostScheduler:
+    """Keeps fetches polite: a concurrency cap and start spacing per host.
+
+    Each host gets its own lane, so a slow or strict site only delays its own
+    requests while fetches to other hosts carry on.
+    """
+
+    def __init__(self, concurrency: int = 2, min_delay: float = 0.5):
+        self.concurrency = concurrency
+        self.min_delay = min_delay
+        self.lanes: dict[str, HostLane] = {}
+        self.lock = threading.Lock()
+
+    def lane_for(self, host: str) -> HostLane:
+        with self.lock:
+            if host not in self.lanes:
+                self.lanes[host] = HostLane(self.concurrency)
+
+            return self.lanes[host]
+
+    @contextmanager
+    def slot(self, url: str):
+        """Wait for a turn to fetch from the URL's host. Yields the time waited."""
+        host = urlparse(url).netloc.lower()
+        lane = self.lane_for(host)
+        queued = time.monotonic()
+
+        lane.semaphore.acquire()
+        try:
+            with lane.lock:
+                now = time.monotonic()
+                start = max(now, lane.next_start)
+                lane.next_start = start + self.min_delay
+
+            time.sleep(start - now)
+            wait = time.monotonic() - queued
+
+            with lane.lock:
+                lane.requests += 1
+                lane.total_wait += wait
+                lane.max_wait = max(lane.max_wait, wait)
+
+            if wait > SLOW_WAIT:
+                logger.info(f"Waited {wait:.1f}s in the queue for {host}")
+
+            yield wait
+        finally:
+            lane.semaphore.release()
+
+    @asynccontextmanager
+    async def turn(self, url: str):
+        """Await a free slot for the URL's host on the event loop.
+
+        Coroutines queue here rather than in slot(), so a fetch only takes a
+        thread once its host can serve it and a busy host can't hold them all.
+        """
+        lane = self.lane_for(urlparse(url).netloc.lower())
+        loop = asyncio.get_running_loop()
+
+        with lane.lock:
+            gate = lane.gates.get(loop)
+            if gate is None:
+                gate = lane.gates[loop] = asyncio.Semaphore(self.concurrency)
+
+        async with gate:
+            yield
+
+    def log_stats(self):
+        with self.lock:
+            lanes = sorted(self.lanes.items(), key=lambda item: -item[1].total_wait)
+
+        for host, lane in lanes:
+            if lane.requests == 0:
+                continue
+
+            logger.info(
+                f"Host {host}: {lane.requests} fetches, queue wait "
+                f"mean {lane.total_wait / lane.requests:.2f}s, "
+                f"max {lane.max_wait:.2f}s, total {lane.total_wait:.1f}s"
+            )
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+from loguru import logger
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .page_cache import LruDirectory
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko)"
+)
+
+
+class ConditionalGetStore:
+    """Keeps ETag/Last-Modified validators and bodies between runs.
+
+    Entries older than `max_age` aren't used, and the least recently used
+    are evicted once the store grows past `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_age: timedelta = timedelta(days=14),
+        max_bytes: int = 128 * 1024 * 1024,
+    ):
+        self.path = Path(path)
+        self.max_age = max_age
+        self.files = LruDirectory(self.path, max_bytes)
+
+    def entry_path(self, url: str) -> Path:
+        return self.path / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def load(self, url: str) -> dict | None:
+        path = self.entry_path(url)
+
+        try:
+            entry = json.loads(path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        age = time.time() - entry.get("saved_at", 0.0)
+        if entry.get("url") != url or age > self.max_age.total_seconds():
+            return None
+
+        self.files.touch(path)
+        return entry
+
+    def save(self, url: str, response: requests.Response):
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+
+        if etag is None and last_modified is None:
+            return
+
+        entry = {
+            "url": url,
+            "saved_at": time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": response.text,
+        }
+        self.files.write(self.entry_path(url), json.dumps(entry))
+
+
+class SessionPool:
+    """One keep-alive session per host, shared by every fetching thread."""
+
+    def __init__(
+        self,
+        timeout: tuple[float, float] = (10.0, 30.0),
+        pool_maxsize: int = 16,
+        store: ConditionalGetStore | None = None,
+    ):
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        self.store = store
+        self.sessions: dict[str, requests.Session] = {}
+        self.lock = threading.Lock()
+
+    def session_for(self, url: str) -> requests.Session:
+        host = urlparse(url).netloc
+
+        with self.lock:
+            if host not in self.sessions:
+                self.sessions[host] = self.build_session()
+
+            return self.sessions[host]
+
+    def build_session(self) -> requests.Session:
+        session = requests.Session()
+        session.headers.update(
+            {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate"}
+        )
+
+        retry = Retry(
+            total=2,
+            backoff_factor=0.5,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=["GET"],
+            # Hand back the last error page rather than raising, like a
+            # plain fetch would
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=self.pool_maxsize, max_retries=retry
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def get(self, url: str) -> str:
+        stored = self.store.load(url) if self.store else None
+        headers = {}
+
+        if stored is not None:
+            if stored["etag"]:
+                headers["If-None-Match"] = stored["etag"]
+            if stored["last_modified"]:
+                headers["If-Modified-Since"] = stored["last_modified"]
+
+        response = self.session_for(url).get(url, headers=headers, timeout=self.timeout)
+
+        if response.status_code == 304 and stored is not None:
+            logger.info(f"Not modified since last fetch: {url}")
+            return stored["body"]
+
+        if self.store is not None and response.ok:
+            self.store.save(url, response)
+
+        return response.text
+
+    def close(self):
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+
+            self.sessions.clear()
@@ -0,0 +1,50 @@
+import sys
+
+import structlog
+from loguru import logger
+
+LEVELS = {
+    "debug": "DEBUG",
+    "info": "INFO",
+    "msg": "INFO",
+    "warn": "WARNING",
+    "warning": "WARNING",
+    "error": "ERROR",
+    "exception": "ERROR",
+    "critical": "CRITICAL",
+    "fatal": "CRITICAL",
+}
+
+
+def route_structlog_to_loguru():
+    """Send the agents' structlog messages through loguru.
+
+    They then reach every loguru sink, like log.txt, tagged with the target
+    bound by `logger.contextualize()` in the thread or task that logged them.
+    """
+    structlog.configure(
+        processors=[forward_to_loguru],
+        cache_logger_on_first_use=False,
+    )
+
+
+def forward_to_loguru(_, method_name: str, event_dict: dict):
+    message = str(event_dict.pop("event", ""))
+    exception = event_dict.pop("exc_info", method_name == "exception")
+
+    if event_dict:
+        message += " " + " ".join(
+            f"{key}={value!r}" for key, value in event_dict.items()
+        )
+
+    # Report the line that called structlog, not this processor
+    depth = 1
+    frame = sys._getframe(1)
+    while frame.f_back and frame.f_globals.get("__name__", "").startswith("structlog"):
+        frame = frame.f_back
+        depth += 1
+
+    logger.opt(depth=depth, exception=exception).log(
+        LEVELS.get(method_name, "INFO"), message
+    )
+    raise structlog.DropEvent
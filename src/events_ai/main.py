@@ -2,15 +2,21 @@ import argparse
 import importlib.resources
 import os
 import tomllib
-from datetime import date
+from datetime import date, timedelta
 from pathlib import Path
 
 from dotenv import load_dotenv
 from loguru import logger
 
 import events_ai.check_setup as check_setup
+from events_ai import log_bridge, replay, simplify_url, tracing, usage_ledger
+from events_ai.agents import gemini_client, llm_cache, prompt
+from events_ai.agents.event_detail_store import EventDetailStore
+from events_ai.agents.page_snapshot_store import PageSnapshotStore
+from events_ai.event_store import EventStore
 from events_ai.gen_path_manager import GenPathManager
 from events_ai.mailer import Mailer
+from events_ai.research_journal import ResearchJournal
 from events_ai.steps import (
     FilmStep,
     ProduceStep,
@@ -22,12 +28,31 @@ from events_ai.steps.write_post_step import WritePostStep
 
 load_dotenv()
 
+LOG_FORMAT = (
+    "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {extra[target]} | "
+    "{name}:{function}:{line} - {message}"
+)
+
 
 @logger.catch()
 def main_cli():
     parser = argparse.ArgumentParser()
     parser.add_argument("-k", "--skip-check", action="store_true")
     parser.add_argument("-r", "--research", nargs="*")
+    parser.add_argument("--research-workers", type=int, default=1)
+    parser.add_argument("--incremental", action="store_true")
+    parser.add_argument("--page-cache-ttl", type=float, default=6.0)
+    parser.add_argument("--host-concurrency", type=int, default=2)
+    parser.add_argument("--host-delay", type=float, default=0.5)
+    parser.add_argument("--llm-cache", action=argparse.BooleanOptionalAction)
+    parser.add_argument("--llm-cache-ttl", type=float, default=24.0)
+    parser.add_argument("--gemini-concurrency", type=int, default=16)
+    parser.add_argument("--gemini-rpm", type=float)
+    parser.add_argument("--gemini-tpm", type=float)
+    parser.add_argument("--record", type=Path)
+    parser.add_argument("--replay", type=Path)
+    parser.add_argument("--replay-page-latency", type=float, default=0.0)
+    parser.add_argument("--replay-gemini-latency", type=float, default=0.0)
     parser.add_argument("-w", "--write", nargs="*")
     parser.add_argument("-s", "--storyboard", action="store_true")
     parser.add_argument("-f", "--film", nargs="*", type=int)
@@ -51,12 +76,19 @@ def main_cli():
 
     working_dir.mkdir(exist_ok=True)
 
-    logger.add(working_dir / "log.txt")
+    logger.configure(extra={"target": "-"})
+    logger.add(working_dir / "log.txt", format=LOG_FORMAT)
+    log_bridge.route_structlog_to_loguru()
     logger.info(f"Today is {today.strftime('%Y-%m-%d')}")
     logger.info(f"Working in {working_dir}")
 
     try:
-        generate(working_dir, today, gen_path_manager, args)
+        try:
+            generate(working_dir, today, gen_path_manager, args)
+        finally:
+            usage_ledger.save_and_log(working_dir)
+            tracing.tracer.save(working_dir / "trace.json")
+
         if args.email:
             send_successful_email(args.email, args, today, working_dir)
     except Exception as e:
@@ -70,7 +102,7 @@ def generate(working_dir: Path, today: date, gen_path_manager: GenPathManager, a
         check_setup.check()
 
     ASSETS_DIR = importlib.resources.files(__name__) / "assets"
-    events_path = working_dir / "events.csv"
+    events_path = working_dir / "events.parquet"
     research_tokens_path = working_dir / "research_tokens.csv"
     script_path = working_dir / "script.json"
     storyboard_path = working_dir / "storyboard.json"
@@ -78,15 +110,58 @@ def generate(working_dir: Path, today: date, gen_path_manager: GenPathManager, a
     video_path = working_dir / "video.mp4"
     post_path = working_dir / "post.txt"
 
+    replay.configure(
+        args.replay or args.record,
+        replay=args.replay is not None,
+        page_latency=args.replay_page_latency,
+        gemini_latency=args.replay_gemini_latency,
+    )
+
+    # Caches would hide requests from recording, and replays from profiling
+    use_caches = replay.mode is None
+
+    simplify_url.configure(
+        gen_path_manager.base / "http_validators",
+        page_cache_path=gen_path_manager.base / "page_cache" if use_caches else None,
+        page_cache_ttl=timedelta(hours=args.page_cache_ttl),
+        host_concurrency=args.host_concurrency,
+        host_min_delay=args.host_delay,
+    )
+
+    prompt.precompile()
+    gemini_client.configure(args.gemini_concurrency, args.gemini_rpm, args.gemini_tpm)
+
+    if args.llm_cache and use_caches:
+        llm_cache.configure(
+            gen_path_manager.base / "llm_cache", timedelta(hours=args.llm_cache_ttl)
+        )
+
     # Research
-    research = ResearchStep(events_path, research_tokens_path)
+    if args.incremental:
+        detail_store = EventDetailStore(gen_path_manager.base / "event_details")
+        snapshot_store = PageSnapshotStore(gen_path_manager.base / "page_snapshots")
+    else:
+        detail_store = None
+        snapshot_store = None
+
+    event_store = EventStore(gen_path_manager.base / "events.sqlite")
+    journal = ResearchJournal(working_dir / "research_journal.jsonl")
+    research = ResearchStep(
+        events_path,
+        research_tokens_path,
+        event_store,
+        journal,
+        detail_store,
+        snapshot_store,
+    )
     do_research = (args.research is not None) or (args.all and not research.done)
     research_filter = args.research if len(args.research or []) > 0 else None
 
     if do_research:
         research_config = importlib.resources.files(__name__) / "assets/research.toml"
         all_targets = tomllib.load(research_config.open("rb"))
-        research.run(all_targets, today, research_filter)
+        with usage_ledger.step("research"), tracing.span("research", "step"):
+            research.run(all_targets, today, research_filter, args.research_workers)
 
     # Write
     write_script = WriteScriptStep(script_path, events_path)
@@ -97,32 +172,37 @@ def generate(working_dir: Path, today: date, gen_path_manager: GenPathManager, a
         except Exception:
             num_events = 4
 
-        write_script.run(today, num_events, gen_path_manager.find_recent(today, 3))
+        with usage_ledger.step("write"), tracing.span("write", "step"):
+            write_script.run(today, num_events, gen_path_manager.find_recent(today, 3))
 
     # Storyboard
     storyboard = StoryboardStep(storyboard_path, script_path, ASSETS_DIR)
     do_storyboard = args.storyboard or (args.all and not storyboard.done)
     if do_storyboard:
-        storyboard.run(720, 1280)
+        with usage_ledger.step("storyboard"), tracing.span("storyboard", "step"):
+            storyboard.run(720, 1280)
 
     # Film
     film = FilmStep(clip_path, storyboard_path, ASSETS_DIR)
     do_film = (args.film is not None) or (args.all and not film.done)
     film_filter = args.film if len(args.film or []) > 0 else None
     if do_film:
-        film.run(takes_filter=film_filter, episode=str(today))
+        with usage_ledger.step("film"), tracing.span("film", "step"):
+            film.run(takes_filter=film_filter, episode=str(today))
 
     # Produce
     produce = ProduceStep(video_path, storyboard_path, clip_path, ASSETS_DIR)
     do_produce = args.produce or (args.all and not produce.done)
     if do_produce:
-        produce.run(today)
+        with usage_ledger.step("produce"), tracing.span("produce", "step"):
+            produce.run(today)
 
     # Create post
     write_post = WritePostStep(post_path, script_path)
     do_post = args.create_post or (args.all and not write_post.done)
     if do_post:
-        write_post.run(today)
+        with usage_ledger.step("post"), tracing.span("post", "step"):
+            write_post.run(today)
 
 
 def send_successful_email(destination: str, args, today: date, working_dir: Path):
@@ -130,12 +210,14 @@ def send_successful_email(destination: str, args, today: date, working_dir: Path
     mailer.subject = f"AI events bot finished - {working_dir}"
     mailer.body = "AI events bot finished successfully."
     mailer.body += f"\nargs = {args}"
+    mailer.body += f"\n\nAPI usage:\n{usage_ledger.ledger.summary()}"
     mailer.attach(open(working_dir / "log.txt"), f"log_{today}.txt")
     mailer.attach(open(working_dir / "events.csv"), f"events_{today}.csv")
     mailer.attach(open(working_dir / "script.json"), f"script_{today}.json")
     mailer.attach(open(working_dir / "storyboard.json"), f"storyboard_{today}.json")
     mailer.attach(open(working_dir / "video.mp4", "rb"), f"video_{today}.mp4")
     mailer.attach(open(working_dir / "post.txt"), f"post_{today}.txt")
+    try_to_attach(mailer, working_dir / "usage.csv", f"usage_{today}.csv")
     mailer.send(destination)
 
 
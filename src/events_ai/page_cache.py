@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+
+from loguru import logger
+
+
+@dataclass
+class CachedPage:
+    url: str
+    mode: str
+    fetched_at: float
+    html: str
+    simplified: str
+
+
+class PageCache:
+    """On-disk cache of fetched pages and their simplified markdown.
+
+    Entries are addressed by a hash of the fetch mode and URL. An entry's mtime
+    is touched on every hit, so eviction removes the least recently used
+    entries once the cache grows past `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttl: timedelta = timedelta(hours=6),
+        max_bytes: int = 512 * 1024 * 1024,
+    ):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.files = LruDirectory(self.path, max_bytes)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def entry_path(self, url: str, mode: str) -> Path:
+        key = hashlib.sha256(f"{mode}:{url}".encode()).hexdigest()
+        return self.path / f"{key}.json"
+
+    def get(self, url: str, mode: str) -> CachedPage | None:
+        path = self.entry_path(url, mode)
+
+        try:
+            page = CachedPage(**json.loads(path.read_text()))
+        except (FileNotFoundError, json.JSONDecodeError, TypeError):
+            page = None
+
+        fresh = (
+            page is not None
+            and page.url == url
+            and time.time() - page.fetched_at < self.ttl.total_seconds()
+        )
+
+        with self.lock:
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if not fresh:
+            return None
+
+        self.files.touch(path)
+        return page
+
+    def put(self, url: str, mode: str, html: str, simplified: str):
+        page = CachedPage(url, mode, time.time(), html, simplified)
+        self.files.write(self.entry_path(url, mode), json.dumps(page.__dict__))
+
+    def log_stats(self):
+        with self.lock:
+            hits, misses = self.hits, self.misses
+            self.hits = self.misses = 0
+
+        lookups = hits + misses
+        if lookups > 0:
+            logger.info(
+                f"Page cache: {hits} hits, {misses} misses ({hits / lookups:.0%} hit rate)"
+            )
+
+
+class LruDirectory:
+    """A directory of entry files kept under `max_bytes`.
+
+    Its size is kept as a running total, so the directory is only scanned
+    when an entry pushes it over. Eviction then removes the least recently
+    written or touched entries.
+    """
+
+    def __init__(self, path: Path, max_bytes: int):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.total_bytes: int | None = None
+
+    def write(self, path: Path, text: str):
+        # Write then rename so concurrent readers never see a partial entry
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_text(text)
+
+        with self.lock:
+            if self.total_bytes is None:
+                self.total_bytes = sum(size for _, size, _ in self.entries())
+
+            self.total_bytes += tmp_path.stat().st_size - file_size(path)
+            os.replace(tmp_path, path)
+            over = self.total_bytes > self.max_bytes
+
+        if over:
+            self.evict()
+
+    def touch(self, path: Path):
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+    def evict(self):
+        with self.lock:
+            entries = self.entries()
+            total = sum(size for _, size, _ in entries)
+
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+
+                path.unlink(missing_ok=True)
+                total -= size
+
+            self.total_bytes = total
+
+    def entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.path.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        return entries
+
+
+def file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
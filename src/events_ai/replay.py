@@ -0,0 +1,220 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+from google import genai
+from google.genai.types import GenerateContentResponse
+from loguru import logger
+from pydantic import TypeAdapter
+
+from .agents.llm_cache import request_key
+
+
+class MissingFixtureError(Exception):
+    pass
+
+
+class Fixtures:
+    """Pages and Gemini responses recorded from research runs.
+
+    Pages are addressed by fetch mode and URL, responses by the same request
+    key as the LLM cache. Each file also keeps the request, for reading.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        (self.path / "pages").mkdir(parents=True, exist_ok=True)
+        (self.path / "gemini").mkdir(parents=True, exist_ok=True)
+
+    def page_path(self, url: str, mode: str) -> Path:
+        key = hashlib.sha256(f"{mode}:{url}".encode()).hexdigest()
+        return self.path / "pages" / f"{key}.json"
+
+    def response_path(self, key: str) -> Path:
+        return self.path / "gemini" / f"{key}.json"
+
+    def save_page(self, url: str, mode: str, html: str, latency: float):
+        entry = {"url": url, "mode": mode, "latency": latency, "html": html}
+        write_json(self.page_path(url, mode), entry)
+
+    def load_page(self, url: str, mode: str) -> str:
+        try:
+            return json.loads(self.page_path(url, mode).read_text())["html"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            raise MissingFixtureError(f"No recorded page for {url} ({mode})")
+
+    def save_response(
+        self,
+        model: str,
+        contents: str,
+        config: genai.types.GenerateContentConfig,
+        response: GenerateContentResponse,
+        latency: float,
+    ):
+        entry = {
+            "model": model,
+            "contents": contents,
+            "latency": latency,
+            "response": response.model_dump(
+                mode="json", exclude={"parsed"}, exclude_none=True
+            ),
+        }
+        write_json(self.response_path(response_key(model, contents, config)), entry)
+
+    def load_response(
+        self, model: str, contents: str, config: genai.types.GenerateContentConfig
+    ) -> GenerateContentResponse:
+        key = response_key(model, contents, config)
+
+        try:
+            entry = json.loads(self.response_path(key).read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            raise MissingFixtureError(f"No recorded {model} response for {key}")
+
+        response = GenerateContentResponse.model_validate(entry["response"])
+        if config.response_schema is not None:
+            response.parsed = TypeAdapter(config.response_schema).validate_json(
+                response.text or ""
+            )
+
+        return response
+
+
+class RecordingClient:
+    """Passes requests on to a Gemini client and records the responses."""
+
+    def __init__(self, client: genai.Client, fixtures: Fixtures):
+        self.models = RecordingModels(client.models, fixtures)
+        self.aio = RecordingAio(RecordingAsyncModels(client.aio.models, fixtures))
+
+
+class RecordingModels:
+    def __init__(self, models, fixtures: Fixtures):
+        self.inner = models
+        self.fixtures = fixtures
+
+    def generate_content(self, model: str, contents, config):
+        start = time.monotonic()
+        response = self.inner.generate_content(
+            model=model, contents=contents, config=config
+        )
+        self.fixtures.save_response(
+            model, contents, config, response, time.monotonic() - start
+        )
+        return response
+
+
+class RecordingAsyncModels(RecordingModels):
+    async def generate_content(self, model: str, contents, config):
+        start = time.monotonic()
+        response = await self.inner.generate_content(
+            model=model, contents=contents, config=config
+        )
+        self.fixtures.save_response(
+            model, contents, config, response, time.monotonic() - start
+        )
+        return response
+
+
+class RecordingAio:
+    def __init__(self, models: RecordingAsyncModels):
+        self.models = models
+
+
+class ReplayClient:
+    """Stands in for a Gemini client, answering from recorded responses.
+
+    Each response is delayed by `latency` seconds, like a network round trip.
+    """
+
+    def __init__(self, fixtures: Fixtures, latency: float = 0.0):
+        self.models = ReplayModels(fixtures, latency)
+        self.aio = ReplayAio(ReplayAsyncModels(fixtures, latency))
+
+
+class ReplayModels:
+    def __init__(self, fixtures: Fixtures, latency: float):
+        self.fixtures = fixtures
+        self.latency = latency
+
+    def generate_content(self, model: str, contents, config):
+        time.sleep(self.latency)
+        return self.fixtures.load_response(model, contents, config)
+
+
+class ReplayAsyncModels(ReplayModels):
+    async def generate_content(self, model: str, contents, config):
+        await asyncio.sleep(self.latency)
+        return self.fixtures.load_response(model, contents, config)
+
+
+class ReplayAio:
+    def __init__(self, models: ReplayAsyncModels):
+        self.models = models
+
+
+def response_key(
+    model: str, contents: str, config: genai.types.GenerateContentConfig
+) -> str:
+    return request_key(model, contents, config.response_schema, config)
+
+
+def write_json(path: Path, entry: dict):
+    tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+    tmp_path.write_text(json.dumps(entry))
+    os.replace(tmp_path, path)
+
+
+fixtures: Fixtures | None = None
+mode: str | None = None
+page_delay = 0.0
+gemini_delay = 0.0
+
+
+def configure(
+    path: Path | None,
+    replay: bool = False,
+    page_latency: float = 0.0,
+    gemini_latency: float = 0.0,
+):
+    """Record research traffic to `path`, or with `replay`, serve it from there."""
+    global fixtures, mode, page_delay, gemini_delay
+
+    fixtures = Fixtures(path) if path is not None else None
+    mode = None if path is None else "replay" if replay else "record"
+    page_delay = page_latency
+    gemini_delay = gemini_latency
+
+    if mode is not None:
+        logger.info(f"{mode.capitalize()}ing research fixtures in {path}")
+
+
+def replaying() -> bool:
+    return mode == "replay"
+
+
+def fetch_page(url: str, fetch_mode: str) -> str:
+    time.sleep(page_delay)
+    return fixtures.load_page(url, fetch_mode)
+
+
+def record_page(url: str, fetch_mode: str, html: str, latency: float):
+    if mode == "record":
+        fixtures.save_page(url, fetch_mode, html, latency)
+
+
+def research_client(create: Callable[[], genai.Client]):
+    """The Gemini client for research: recording, replaying, or `create()` as is."""
+    if mode == "replay":
+        return ReplayClient(fixtures, gemini_delay)
+
+    client = create()
+    if mode == "record":
+        return RecordingClient(client, fixtures)
+
+    return client
@@ -0,0 +1,195 @@
+import json
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+from loguru import logger
+
+from .agents.gemini_event_research_agent import Event
+from .event_store import EVENT_COLUMNS
+
+
+@dataclass
+class TargetState:
+    organization: str = ""
+    listing: list[dict] | None = None
+    details: dict[int, dict] = field(default_factory=dict)
+    events: list[dict] = field(default_factory=list)
+    done: bool = False
+
+    def final_events(self) -> list[dict]:
+        if self.listing is None:
+            return self.events
+
+        return [self.details[i] for i in sorted(self.details)]
+
+
+class ResearchJournal:
+    """Append-only JSONL log of research progress for one working dir.
+
+    Every record is written as soon as it is produced, so a crashed run can
+    resume: finished targets are skipped, and a partly researched target keeps
+    its event listing and every event detail it already updated.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.targets: dict[str, TargetState] = {}
+        self.lock = threading.Lock()
+        self.replay()
+        self.file = open(self.path, "a")
+
+    def replay(self):
+        if not self.path.exists():
+            return
+
+        for number, line in enumerate(self.path.read_text().splitlines(), start=1):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # The last line may be cut short if the process died mid-write
+                logger.warning(f"Ignoring broken line {number} of {self.path}")
+                continue
+
+            self.apply(record)
+
+    def apply(self, record: dict):
+        kind = record["kind"]
+        target = record["target"]
+
+        if kind == "start":
+            state = self.targets.get(target)
+            if state is None or record["fresh"]:
+                state = self.targets[target] = TargetState()
+
+            # A listing and its details survive a restart, a flat result does not
+            state.organization = record["organization"]
+            state.events = []
+            state.done = False
+            return
+
+        state = self.targets[target]
+
+        if kind == "listing":
+            state.listing = record["events"]
+        elif kind == "detail":
+            state.details[record["index"]] = record["event"]
+        elif kind == "events":
+            state.events = record["events"]
+        elif kind == "done":
+            state.done = True
+
+    def append(self, record: dict):
+        with self.lock:
+            self.apply(record)
+            self.file.write(json.dumps(record) + "\n")
+            self.file.flush()
+
+    def is_done(self, target: str) -> bool:
+        state = self.targets.get(target)
+        return state is not None and state.done
+
+    def start(self, target: str, organization: str, fresh: bool) -> "TargetJournal":
+        self.append(
+            {
+                "kind": "start",
+                "target": target,
+                "organization": organization,
+                "fresh": fresh,
+            }
+        )
+        return TargetJournal(self, target)
+
+    def finish(self, target: str):
+        self.append({"kind": "done", "target": target})
+
+    def events_df(self, order: list[str] | None = None) -> pd.DataFrame:
+        """Every journaled event, finished or not, as rows like events.csv
+        plus the target each came from.
+
+        Targets come in `order`, then any others by name, never in the order
+        their research happened to start.
+        """
+        order = order or []
+        position = {target: i for i, target in enumerate(order)}
+
+        with self.lock:
+            targets = sorted(
+                self.targets,
+                key=lambda target: (position.get(target, len(order)), target),
+            )
+            rows = [
+                {
+                    **event_row(event, self.targets[target].organization),
+                    "target": target,
+                }
+                for target in targets
+                for event in self.targets[target].final_events()
+            ]
+
+        return pd.DataFrame(rows, columns=[*EVENT_COLUMNS, "target"])
+
+    def close(self):
+        self.file.close()
+
+
+class TargetJournal:
+    """The journal as seen by the agent researching one target."""
+
+    def __init__(self, journal: ResearchJournal, target: str):
+        self.journal = journal
+        self.target = target
+
+    @property
+    def state(self) -> TargetState:
+        return self.journal.targets[self.target]
+
+    def listing(self) -> list[Event] | None:
+        listing = self.state.listing
+        return None if listing is None else [Event(**event) for event in listing]
+
+    def save_listing(self, events: list[Event]):
+        self.journal.append(
+            {
+                "kind": "listing",
+                "target": self.target,
+                "events": [event.model_dump() for event in events],
+            }
+        )
+
+    def detail(self, index: int) -> Event | None:
+        event = self.state.details.get(index)
+        return None if event is None else Event(**event)
+
+    def save_detail(self, index: int, event: Event):
+        self.journal.append(
+            {
+                "kind": "detail",
+                "target": self.target,
+                "index": index,
+                "event": event.model_dump(),
+            }
+        )
+
+    def save_events(self, events: list[Event]):
+        self.journal.append(
+            {
+                "kind": "events",
+                "target": self.target,
+                "events": [event.model_dump() for event in events],
+            }
+        )
+
+
+def event_row(event: dict, organization: str) -> dict:
+    return {
+        "event": event["title"],
+        "link": event["link"],
+        "description": event["description"],
+        "when": event["when"],
+        "location": event["location"],
+        "price": event["price"],
+        "target_age": ", ".join(event["target_age"]),
+        "organization": organization,
+    }
@@ -1,35 +1,197 @@
-import requests
+import asyncio
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+import lxml.html
 from bs4 import BeautifulSoup
 from loguru import logger
+from lxml import etree
 from markdownify import markdownify
-from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
 
+from . import replay, tracing
+from .agents.crawl_frontier import PAGINATION_TEXT, changes_page
+from .host_scheduler import HostScheduler
+from .http_session import ConditionalGetStore, SessionPool
+from .page_cache import CachedPage, PageCache
+from .webdriver_pool import WebDriverPool
 
-def get(url: str, use_selenium=False) -> str:
-    if use_selenium:
-        driver = webdriver.Chrome()
-        driver.get(url)
-        driver.implicitly_wait(1.0)
-        html = driver.page_source
+session_pool = SessionPool()
+driver_pool = WebDriverPool()
+host_scheduler = HostScheduler()
+page_cache: PageCache | None = None
+
+# Fetches from coroutines run here rather than on the event loop's default
+# executor, which is small and shared with everything else on the loop
+FETCH_THREADS = 32
+fetch_executor = ThreadPoolExecutor(FETCH_THREADS, thread_name_prefix="fetch")
+
+# Elements that never carry event details but bloat the markdown. Menus in
+# <nav> are stripped too, unless they're the pager the crawler follows.
+STRIPPED_TAGS = ("script", "style", "noscript", "svg", "iframe", "template")
+
+
+def configure(
+    conditional_get_path: Path | None = None,
+    webdriver_pool_size: int = 2,
+    page_cache_path: Path | None = None,
+    page_cache_ttl: timedelta = timedelta(hours=6),
+    page_cache_max_bytes: int = 512 * 1024 * 1024,
+    host_concurrency: int = 2,
+    host_min_delay: float = 0.5,
+):
+    global driver_pool, host_scheduler, page_cache
+
+    host_scheduler = HostScheduler(host_concurrency, host_min_delay)
+
+    if page_cache_path is not None and page_cache_ttl > timedelta(0):
+        page_cache = PageCache(page_cache_path, page_cache_ttl, page_cache_max_bytes)
     else:
-        response = requests.get(
-            url,
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko)",
-            },
+        page_cache = None
+
+    if conditional_get_path is not None:
+        session_pool.store = ConditionalGetStore(conditional_get_path)
+    else:
+        session_pool.store = None
+
+    if webdriver_pool_size != driver_pool.size:
+        driver_pool.shutdown()
+        driver_pool = WebDriverPool(webdriver_pool_size)
+
+
+def shutdown():
+    driver_pool.shutdown()
+    session_pool.close()
+    host_scheduler.log_stats()
+
+    if page_cache is not None:
+        page_cache.log_stats()
+
+
+def get_with_selenium(url: str, attempts: int = 2) -> str:
+    for attempt in range(attempts):
+        try:
+            with driver_pool.borrow() as driver:
+                driver.get(url)
+                driver.implicitly_wait(1.0)
+                return driver.page_source
+        except WebDriverException as err:
+            if attempt + 1 == attempts:
+                raise
+
+            logger.warning(f"Retrying {url} with a fresh WebDriver: {err}")
+
+    return ""
+
+
+def get(url: str, use_selenium=False) -> str:
+    return fetch(url, use_selenium).simplified
+
+
+async def get_async(url: str, use_selenium=False) -> str:
+    """Like get(), for coroutines. Waits for the host's turn on the event loop."""
+    async with host_scheduler.turn(url):
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            fetch_executor, context.run, get, url, use_selenium
         )
-        html = response.text
 
-    soup = BeautifulSoup(html, "html.parser")
-    script_tags = soup.find_all("script")
-    for script in script_tags:
-        script.decompose()
 
-    simplified = soup.body.decode_contents() if soup.body else ""
-    simplified = markdownify(simplified, strip=["img"])
+def get_html(url: str, use_selenium=False) -> str:
+    """The page as fetched, for parsers that need more than the markdown."""
+    return fetch(url, use_selenium).html
+
+
+def fetch(url: str, use_selenium=False) -> CachedPage:
+    mode = "selenium" if use_selenium else "requests"
+
+    with tracing.span("fetch", "fetch", url=url, mode=mode) as span:
+        if page_cache is not None and (cached := page_cache.get(url, mode)):
+            logger.info(f"Simplified get {url} - cached, use_selenium: {use_selenium}")
+            span["cached"] = True
+            return cached
+
+        with host_scheduler.slot(url) as wait:
+            span["queue_wait"] = wait
+            start = time.monotonic()
+
+            if replay.replaying():
+                html = replay.fetch_page(url, mode)
+            elif use_selenium:
+                html = get_with_selenium(url)
+            else:
+                html = session_pool.get(url)
+
+            replay.record_page(url, mode, html, time.monotonic() - start)
+
+        span["bytes"] = len(html)
+
+    with tracing.span("simplify", "simplify", url=url, bytes=len(html)):
+        simplified = simplify_html(html)
 
     logger.info(
         f"Simplified get {url} - original: {len(html):,}, simplified: {len(simplified):,}, use_selenium: {use_selenium}"
     )
 
-    return simplified
+    if page_cache is not None:
+        page_cache.put(url, mode, html, simplified)
+
+    return CachedPage(url, mode, time.time(), html, simplified)
+
+
+def simplify_html(html: str, engine: str = "lxml") -> str:
+    if engine == "lxml":
+        return simplify_html_lxml(html)
+    elif engine == "html.parser":
+        return simplify_html_html_parser(html)
+    else:
+        raise ValueError(f"Unknown simplification engine '{engine}'")
+
+
+def simplify_html_lxml(html: str) -> str:
+    if not html.strip():
+        return ""
+
+    try:
+        tree = lxml.html.document_fromstring(html)
+    except ValueError:
+        # lxml refuses str input that carries an XML encoding declaration
+        tree = lxml.html.document_fromstring(html.encode())
+
+    etree.strip_elements(tree, *STRIPPED_TAGS, etree.Comment, with_tail=False)
+
+    for nav in tree.xpath("//nav"):
+        if not is_pager(nav):
+            nav.drop_tree()
+
+    body = tree.find("body")
+    if body is None:
+        return ""
+
+    return markdownify(etree.tostring(body, encoding="unicode"), strip=["img"])
+
+
+def is_pager(nav) -> bool:
+    names = " ".join(nav.get(attr, "") for attr in ("class", "id", "aria-label"))
+    if "pag" in names.lower():
+        return True
+
+    return any(
+        PAGINATION_TEXT.match(" ".join(link.text_content().split()))
+        or changes_page(link.get("href", ""))
+        for link in nav.iter("a")
+    )
+
+
+def simplify_html_html_parser(html: str) -> str:
+    soup = BeautifulSoup(html, "html.parser")
+    script_tags = soup.find_all("script")
+    for script in script_tags:
+        script.decompose()
+
+    simplified = soup.body.decode_contents() if soup.body else ""
+    return markdownify(simplified, strip=["img"])
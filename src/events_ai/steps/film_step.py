@@ -9,6 +9,7 @@ import requests
 from loguru import logger
 from pydantic import ValidationError
 
+from .. import tracing
 from ..agents.film_agent import FilmAgent
 from ..agents.heygen_client import HeyGenClient
 from ..agents.storyboard_agent import StoryboardResult, Take
@@ -111,6 +112,10 @@ class FilmStep(PipelineStep):
                     video_url = response.data["video_url"]
                     logger.info(f"Clip {clip_job['clip']}: {status}")
                     if status == "completed":
+                        # A done job is polled again if its download failed
+                        if not clip_job["done"]:
+                            client.record_render(response)
+
                         clip_job["done"] = True
                         clip_job["url"] = video_url
                         logger.info(f"Clip job {clip_job['clip']} finished")
@@ -119,7 +124,8 @@ class FilmStep(PipelineStep):
                         logger.info(
                             f"Downloading clip {clip_job['clip']} from {video_url} to {clip_path}"
                         )
-                        download_file(video_url, clip_path)
+                        with tracing.span("heygen download", "heygen", url=video_url):
+                            download_file(video_url, clip_path)
                     else:
                         wait_for_jobs = True
                 except ValidationError:
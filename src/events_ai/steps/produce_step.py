@@ -8,7 +8,7 @@ from moviepy import CompositeVideoClip, VideoFileClip, concatenate_videoclips
 
 from events_ai.steps.pipeline_step import PipelineStep
 
-from .. import humanize
+from .. import humanize, tracing
 from ..agents.storyboard_agent import StoryboardResult
 
 
@@ -53,13 +53,14 @@ class ProduceStep(PipelineStep):
             "duration": intro.duration,
         }
         url = "intro_outro.html?" + "&".join([f"{k}={v}" for k, v in props.items()])
-        titler.generate(
-            url,
-            intro.duration,
-            graphics_path / "frames_intro",
-            graphics_path / "title_intro.webm",
-            frame_rate=25,
-        )
+        with tracing.span("title render", "produce", title="title_intro.webm"):
+            titler.generate(
+                url,
+                intro.duration,
+                graphics_path / "frames_intro",
+                graphics_path / "title_intro.webm",
+                frame_rate=25,
+            )
         title = VideoFileClip(graphics_path / "title_intro.webm", has_mask=True)
         clips.append(CompositeVideoClip([intro, title]))
 
@@ -75,13 +76,14 @@ class ProduceStep(PipelineStep):
             url = "event_info.html?" + "&".join([f"{k}={v}" for k, v in props.items()])
             take_id = Path(clip.filename).stem
 
-            titler.generate(
-                url,
-                clip.duration,
-                graphics_path / f"frames_{take_id}",
-                graphics_path / f"title_{take_id}.webm",
-                frame_rate=25,
-            )
+            with tracing.span("title render", "produce", title=f"title_{take_id}.webm"):
+                titler.generate(
+                    url,
+                    clip.duration,
+                    graphics_path / f"frames_{take_id}",
+                    graphics_path / f"title_{take_id}.webm",
+                    frame_rate=25,
+                )
 
             title = VideoFileClip(
                 graphics_path / f"title_{take_id}.webm", has_mask=True
@@ -96,20 +98,22 @@ class ProduceStep(PipelineStep):
             "duration": outro.duration,
         }
         url = "intro_outro.html?" + "&".join([f"{k}={v}" for k, v in props.items()])
-        titler.generate(
-            url,
-            outro.duration,
-            graphics_path / "frames_outro",
-            graphics_path / "title_outro.webm",
-            frame_rate=25,
-        )
+        with tracing.span("title render", "produce", title="title_outro.webm"):
+            titler.generate(
+                url,
+                outro.duration,
+                graphics_path / "frames_outro",
+                graphics_path / "title_outro.webm",
+                frame_rate=25,
+            )
         title = VideoFileClip(graphics_path / "title_outro.webm", has_mask=True)
         clips.append(CompositeVideoClip([outro, title]))
 
         # Concatenate all titled clips
         video = concatenate_videoclips(clips)
         logger.info(f"Writing video to {self.video_path}...")
-        video.write_videofile(self.video_path, audio_codec="aac")
+        with tracing.span("encode", "produce", path=str(self.video_path)):
+            video.write_videofile(self.video_path, audio_codec="aac")
         logger.info(f"Wrote video to {self.video_path}")
 
 
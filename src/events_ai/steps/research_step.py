@@ -1,113 +1,204 @@
+import contextvars
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from pathlib import Path
-from typing import Generator
 
 import pandas as pd
 from dateutil.relativedelta import relativedelta
 from google import genai
 from loguru import logger
 
+from events_ai import events_dataset, replay, simplify_url, tracing, usage_ledger
 from events_ai.agents.research_agent_factory import ResearchAgentFactory
+from events_ai.dedup import dedupe_events
+from events_ai.event_store import EventStore
+from events_ai.research_journal import ResearchJournal
 from events_ai.steps.pipeline_step import PipelineStep
 
-from ..agents.gemini_event_research_agent import EventsResult
+from ..agents.event_detail_store import EventDetailStore
+from ..agents.gemini_event_research_agent import TokenCounts
+from ..agents.page_snapshot_store import PageSnapshotStore
 
 
 class ResearchStep(PipelineStep):
-    def __init__(self, events_path: Path, research_tokens_path: Path):
+    def __init__(
+        self,
+        events_path: Path,
+        research_tokens_path: Path,
+        event_store: EventStore,
+        journal: ResearchJournal,
+        detail_store: EventDetailStore | None = None,
+        snapshot_store: PageSnapshotStore | None = None,
+    ):
         self.events_path = events_path
         self.research_tokens_path = research_tokens_path
+        self.event_store = event_store
+        self.journal = journal
+        self.detail_store = detail_store
+        self.snapshot_store = snapshot_store
         self.token_tracker = ResearchTokenTracker()
 
     @property
     def done(self) -> bool:
         return self.events_path.exists()
 
-    def events_path_for(self, org: str) -> Path:
-        filename = f"{self.events_path.stem}_{org}{self.events_path.suffix}"
-        return self.events_path.parent / filename
-
-    def events_glob(self) -> Generator[Path, None, None]:
-        return self.events_path.parent.glob(self.events_path_for("*").name)
-
-    def run(self, targets, today: date, filter: list[str] | None = None):
-        llm = genai.Client(api_key=os.environ["GEMINI_API_KEY"])
+    def run(
+        self,
+        targets,
+        today: date,
+        filter: list[str] | None = None,
+        workers: int = 1,
+    ):
+        llm = replay.research_client(
+            lambda: genai.Client(api_key=os.environ["GEMINI_API_KEY"])
+        )
         finish = today + relativedelta(months=1)
 
         all_targets = targets
         logger.info(f"Found {len(all_targets)} research targets")
 
-        if filter is not None and len(filter) > 0:
+        # Targets named explicitly are researched again, others resume
+        named = filter is not None and len(filter) > 0
+
+        # Recordings and replays always run every target, never resume
+        fresh = named or replay.mode is not None
+
+        if named:
             targets = {
                 target: config
                 for target, config in all_targets.items()
                 if target in filter
             }
+        elif fresh:
+            targets = dict(all_targets)
         else:
-            targets = all_targets
+            targets = {
+                target: config
+                for target, config in all_targets.items()
+                if not self.journal.is_done(target)
+            }
+            if len(targets) < len(all_targets):
+                logger.info(
+                    f"Skipping {len(all_targets) - len(targets)} targets "
+                    "already researched in this working dir"
+                )
+
+        logger.info(f"Running {len(targets)} research targets with {workers} workers")
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+                futures = {
+                    target: executor.submit(
+                        contextvars.copy_context().run,
+                        self.research_target,
+                        llm,
+                        target,
+                        config,
+                        today,
+                        finish,
+                        fresh,
+                    )
+                    for target, config in targets.items()
+                }
+        finally:
+            simplify_url.shutdown()
+
+        # Record in target order so the ledger doesn't depend on finishing order
+        for target, future in futures.items():
+            tokens = future.result()
+            if tokens is not None:
+                self.token_tracker.record(
+                    target,
+                    tokens.prompt,
+                    tokens.candidates,
+                    tokens.cache_hits,
+                    tokens.cached,
+                )
+
+        # Export everything journaled, including earlier runs of other targets
+        df = self.journal.events_df(list(all_targets))
+        self.journal.close()
+
+        deduped = dedupe_events(df, today)
+        logger.info(f"Merged {len(df) - len(deduped)} duplicate events")
 
-        logger.info(f"Running {len(targets)} research targets")
+        # The store keeps the merged events too, so the explorer shows them once
+        for target, rows in deduped.groupby("target", sort=False):
+            self.event_store.upsert(target, rows, today)
 
-        for target, config in targets.items():
+        events_dataset.write_events(deduped, self.events_path, today)
+        events_dataset.export_csv(
+            self.events_path, self.events_path.with_suffix(".csv")
+        )
+        logger.info(f"Collected {len(deduped)} events into {self.events_path}")
+        self.token_tracker.save(self.research_tokens_path)
+
+    def research_target(
+        self,
+        llm: genai.Client,
+        target: str,
+        config: dict,
+        today: date,
+        finish: date,
+        fresh: bool = False,
+    ) -> TokenCounts | None:
+        with (
+            logger.contextualize(target=target),
+            usage_ledger.target(target),
+            tracing.span("research target", "research"),
+        ):
             try:
-                agent = ResearchAgentFactory.build(llm, today, finish, **config)
+                journal = self.journal.start(target, config["organization"], fresh)
+                agent = ResearchAgentFactory.build(
+                    llm,
+                    today,
+                    finish,
+                    self.detail_store,
+                    journal,
+                    self.snapshot_store,
+                    **config,
+                )
             except ValueError as exc:
                 logger.warning(f"Target {target} skipped: {exc}")
-                continue
+                return None
 
             try:
                 logger.info(f"Researching {target}")
                 result = agent.run()
-                df = result_to_df(result)
-                df["organization"] = config["organization"]
                 logger.info(
-                    f"Found {len(df)} events from {target}. Tokens used: {agent.tokens}"
+                    f"Found {len(result.events)} events from {target}. "
+                    f"Tokens used: {agent.tokens}"
                 )
-                self.token_tracker.record(
-                    target, agent.tokens.prompt, agent.tokens.candidates
-                )
-                df.to_csv(self.events_path_for(target), index_label="id")
+                self.journal.finish(target)
+                return agent.tokens
             except Exception as err:
                 logger.warning(f"Exception researching {target}: {err}")
-
-        events_files = self.events_glob()
-        df = pd.concat(
-            [pd.read_csv(filename, index_col="id") for filename in events_files],
-            ignore_index=True,
-        )
-
-        df.to_csv(self.events_path, index_label="id")
-        logger.info(f"Collected {len(df)} events into {self.events_path}")
-        self.token_tracker.save(self.research_tokens_path)
+                return None
 
 
 class ResearchTokenTracker:
     def __init__(self):
         self.ledger = []
 
-    def record(self, name: str, prompt: int, candidate: int):
+    def record(
+        self,
+        name: str,
+        prompt: int,
+        candidate: int,
+        cache_hits: int = 0,
+        cached: int = 0,
+    ):
         self.ledger.append(
-            {"name": name, "prompt_tokens": prompt, "candidate_tokens": candidate}
+            {
+                "name": name,
+                "prompt_tokens": prompt,
+                "candidate_tokens": candidate,
+                "cache_hits": cache_hits,
+                "cached_tokens": cached,
+            }
         )
 
     def save(self, path: Path):
         df = pd.DataFrame(self.ledger)
         df.to_csv(path, index=False)
-
-
-def result_to_df(result: EventsResult) -> pd.DataFrame:
-    return pd.DataFrame(
-        [
-            {
-                "event": event.title,
-                "link": event.link,
-                "description": event.description,
-                "when": event.when,
-                "location": event.location,
-                "price": event.price,
-                "target_age": ", ".join(event.target_age),
-            }
-            for event in result.events
-        ]
-    )
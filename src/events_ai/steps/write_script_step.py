@@ -6,15 +6,23 @@ import pandas as pd
 from google import genai
 from loguru import logger
 
+from events_ai import events_dataset
+from events_ai.event_dates import filter_window
 from events_ai.steps.pipeline_step import PipelineStep
 
 from ..agents.script_writer_agent import ScriptResult, ScriptWriterAgent
 
 
 class WriteScriptStep(PipelineStep):
-    def __init__(self, script_path: Path, events_path: Path):
+    def __init__(
+        self,
+        script_path: Path,
+        events_path: Path,
+        window_days: int = 7,
+    ):
         self.script_path = script_path
         self.events_path = events_path
+        self.window_days = window_days
 
     @property
     def done(self) -> bool:
@@ -29,8 +37,18 @@ class WriteScriptStep(PipelineStep):
             if (script_path := dir / "script.json").exists()
         ]
 
-        df = pd.read_csv(self.events_path, index_col="id")
+        featured_links = [
+            story.link
+            for script in recent_scripts
+            for story in script.stories
+            if story.link
+        ]
+        df = self.load_events(today, featured_links)
+
         logger.info(f"Loaded {len(df)} events to write script.")
+
+        df = filter_window(df, today, self.window_days)
+        logger.info(f"Kept {len(df)} events within {self.window_days} days or undated.")
         script_writer = ScriptWriterAgent(df, today, num_events, recent_scripts)
         script = script_writer.run(llm)
 
@@ -38,3 +56,15 @@ class WriteScriptStep(PipelineStep):
             script_file.write(script.model_dump_json(indent=4))
 
         logger.info(f"Script written to {self.script_path}")
+
+    def load_events(self, today: date, exclude_links: list[str]) -> pd.DataFrame:
+        """Researched events near the window, less those featured recently."""
+        df = events_dataset.flatten(
+            events_dataset.read_events(
+                self.events_path,
+                columns=events_dataset.EXPORT_COLUMNS,
+                start=today,
+                days=self.window_days,
+            )
+        )
+        return df[~df["link"].isin(exclude_links)]
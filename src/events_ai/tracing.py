@@ -0,0 +1,96 @@
+import asyncio
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from loguru import logger
+
+from .usage_ledger import current_target
+
+
+class Tracer:
+    """Collects timed spans and writes them in the Chrome trace event format.
+
+    The output loads in chrome://tracing or https://ui.perfetto.dev. Spans on
+    a thread nest as complete ("X") events. Spans inside asyncio tasks overlap
+    on one thread, so they are written as async ("b"/"e") events instead.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.events: list[dict] = []
+        self.threads: dict[int, str] = {}
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def now(self) -> float:
+        return (time.perf_counter() - self.origin) * 1e6
+
+    @contextmanager
+    def span(self, name: str, category: str = "pipeline", **attrs):
+        thread = threading.current_thread()
+        args = {"target": current_target.get()} | attrs
+        start = self.now()
+
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+
+        try:
+            yield args
+        except BaseException as err:
+            args["error"] = repr(err)
+            raise
+        finally:
+            end = self.now()
+            base = {
+                "name": name,
+                "cat": category,
+                "pid": os.getpid(),
+                "tid": thread.ident,
+            }
+
+            if task is None:
+                events = [base | {"ph": "X", "ts": start, "dur": end - start}]
+            else:
+                span_id = next(self.ids)
+                events = [
+                    base | {"ph": "b", "ts": start, "id": span_id, "args": args},
+                    base | {"ph": "e", "ts": end, "id": span_id},
+                ]
+
+            events[0]["args"] = args
+
+            with self.lock:
+                self.threads[thread.ident] = thread.name
+                self.events += events
+
+    def save(self, path: Path):
+        with self.lock:
+            names = [
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": os.getpid(),
+                    "tid": tid,
+                    "args": {"name": name},
+                }
+                for tid, name in self.threads.items()
+            ]
+            trace = {"traceEvents": names + self.events, "displayTimeUnit": "ms"}
+
+        Path(path).write_text(json.dumps(trace))
+        logger.info(f"Wrote {len(self.events)} trace events to {path}")
+
+
+tracer = Tracer()
+
+
+def span(name: str, category: str = "pipeline", **attrs):
+    """Time the enclosed block as a span. Yields the attributes dict to extend."""
+    return tracer.span(name, category, **attrs)
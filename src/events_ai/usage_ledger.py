@@ -0,0 +1,168 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+from loguru import logger
+
+# USD per million prompt and candidate tokens
+GEMINI_PRICES = {
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-flash-lite": (0.10, 0.40),
+    "gemini-2.5-flash-image": (0.30, 30.00),
+    "gemini-2.5-flash-preview-tts": (0.50, 10.00),
+}
+
+# USD per minute of rendered HeyGen video
+HEYGEN_PRICE_PER_MINUTE = 1.00
+
+COLUMNS = [
+    "run",
+    "service",
+    "model",
+    "step",
+    "target",
+    "prompt_tokens",
+    "candidate_tokens",
+    "total_tokens",
+    "cached",
+    "latency",
+    "retries",
+    "cost",
+]
+
+current_step: ContextVar[str] = ContextVar("usage_step", default="-")
+current_target: ContextVar[str] = ContextVar("usage_target", default="-")
+
+
+class UsageLedger:
+    """Every paid API call made during a run, with tokens, latency and cost."""
+
+    def __init__(self):
+        self.run = datetime.now().isoformat(timespec="seconds")
+        self.records: list[dict] = []
+        self.lock = threading.Lock()
+
+    def record(
+        self,
+        service: str,
+        model: str,
+        latency: float,
+        retries: int = 0,
+        prompt_tokens: int = 0,
+        candidate_tokens: int = 0,
+        total_tokens: int = 0,
+        cached: bool = False,
+        cost: float | None = None,
+    ):
+        record = {
+            "run": self.run,
+            "service": service,
+            "model": model,
+            "step": current_step.get(),
+            "target": current_target.get(),
+            "prompt_tokens": prompt_tokens,
+            "candidate_tokens": candidate_tokens,
+            "total_tokens": total_tokens,
+            "cached": cached,
+            "latency": round(latency, 3),
+            "retries": retries,
+            "cost": cost,
+        }
+
+        with self.lock:
+            self.records.append(record)
+
+    def record_gemini(
+        self,
+        model: str,
+        usage,
+        latency: float,
+        retries: int = 0,
+        cached: bool = False,
+    ):
+        prompt = 0 if usage is None else usage.prompt_token_count or 0
+        candidates = 0 if usage is None else usage.candidates_token_count or 0
+        total = 0 if usage is None else usage.total_token_count or 0
+
+        self.record(
+            "gemini",
+            model,
+            latency,
+            retries,
+            prompt,
+            candidates,
+            total,
+            cached,
+            0.0 if cached else gemini_cost(model, prompt, candidates),
+        )
+
+    def to_df(self) -> pd.DataFrame:
+        with self.lock:
+            return pd.DataFrame(self.records, columns=COLUMNS)
+
+    def save(self, path: Path):
+        """Append this run's calls, so partial reruns of a day add up."""
+        df = self.to_df()
+        if len(df) == 0:
+            return
+
+        df.to_csv(path, mode="a", header=not Path(path).exists(), index=False)
+
+    def summary(self) -> str:
+        df = self.to_df()
+        if len(df) == 0:
+            return "No paid API calls."
+
+        by_step = df.groupby(["step", "service"], sort=False).agg(
+            calls=("model", "size"),
+            cached=("cached", "sum"),
+            retries=("retries", "sum"),
+            tokens=("total_tokens", "sum"),
+            seconds=("latency", "sum"),
+            cost=("cost", "sum"),
+        )
+        by_step["seconds"] = by_step["seconds"].round(1)
+        by_step["cost"] = by_step["cost"].round(4)
+
+        total_cost = df["cost"].sum()
+        return f"{by_step.to_string()}\n\nEstimated cost: ${total_cost:.2f}"
+
+
+def gemini_cost(model: str, prompt_tokens: int, candidate_tokens: int) -> float | None:
+    if model not in GEMINI_PRICES:
+        return None
+
+    prompt_price, candidate_price = GEMINI_PRICES[model]
+    return (prompt_tokens * prompt_price + candidate_tokens * candidate_price) / 1e6
+
+
+@contextmanager
+def step(name: str):
+    token = current_step.set(name)
+    try:
+        yield
+    finally:
+        current_step.reset(token)
+
+
+@contextmanager
+def target(name: str):
+    token = current_target.set(name)
+    try:
+        yield
+    finally:
+        current_target.reset(token)
+
+
+ledger = UsageLedger()
+
+
+def save_and_log(working_dir: Path):
+    ledger.save(working_dir / "usage.csv")
+
+    summary = ledger.summary()
+    (working_dir / "usage_summary.txt").write_text(summary + "\n")
+    logger.info(f"API usage this run:\n{summary}")
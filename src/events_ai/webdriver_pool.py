@@ -0,0 +1,110 @@
+import threading
+from contextlib import contextmanager
+from typing import Generator
+
+from loguru import logger
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.webdriver import WebDriver
+
+
+class WebDriverPool:
+    """A bounded set of headless Chrome drivers that are reused between fetches.
+
+    Drivers are started lazily, health-checked when borrowed, replaced when they
+    crash, and recycled after `max_uses` pages to keep Chrome's memory in check.
+    """
+
+    def __init__(self, size: int = 2, max_uses: int = 50, page_load_timeout=60.0):
+        self.size = size
+        self.max_uses = max_uses
+        self.page_load_timeout = page_load_timeout
+        self.slots = threading.BoundedSemaphore(size)
+        self.lock = threading.Lock()
+        self.idle: list[WebDriver] = []
+        self.uses: dict[int, int] = {}
+
+    @contextmanager
+    def borrow(self) -> Generator[WebDriver, None, None]:
+        with self.slots:
+            driver = self.take_idle() or self.start_driver()
+
+            try:
+                yield driver
+            except BaseException as err:
+                # The driver's state is unknown after any failure, e.g. a lost
+                # connection to chromedriver, so never put it back
+                logger.warning(f"WebDriver use failed, discarding it: {err!r}")
+                self.discard(driver)
+                raise
+            else:
+                self.give_back(driver)
+
+    def take_idle(self) -> WebDriver | None:
+        while True:
+            with self.lock:
+                if not self.idle:
+                    return None
+                driver = self.idle.pop()
+
+            if is_alive(driver):
+                return driver
+
+            logger.warning("Idle WebDriver is no longer responding, replacing it")
+            self.discard(driver)
+
+    def start_driver(self) -> WebDriver:
+        options = webdriver.ChromeOptions()
+        options.add_argument("--headless=new")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-gpu")
+
+        driver = webdriver.Chrome(options=options)
+        driver.set_page_load_timeout(self.page_load_timeout)
+
+        with self.lock:
+            self.uses[id(driver)] = 0
+
+        logger.info("Started headless WebDriver")
+        return driver
+
+    def give_back(self, driver: WebDriver):
+        with self.lock:
+            self.uses[id(driver)] = self.uses.get(id(driver), 0) + 1
+            recycle = self.uses[id(driver)] >= self.max_uses
+
+            if not recycle:
+                self.idle.append(driver)
+
+        if recycle:
+            logger.info("Recycling WebDriver after reaching its use limit")
+            self.discard(driver)
+
+    def discard(self, driver: WebDriver):
+        with self.lock:
+            self.uses.pop(id(driver), None)
+
+        try:
+            driver.quit()
+        except Exception as err:
+            logger.warning(f"Error quitting WebDriver: {err}")
+
+    def shutdown(self):
+        with self.lock:
+            drivers = self.idle
+            self.idle = []
+
+        for driver in drivers:
+            self.discard(driver)
+
+        if drivers:
+            logger.info(f"Shut down {len(drivers)} WebDrivers")
+
+
+def is_alive(driver: WebDriver) -> bool:
+    try:
+        driver.execute_script("return 1")
+        return True
+    except WebDriverException:
+        return False
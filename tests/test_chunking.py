@@ -0,0 +1,59 @@
+from events_ai.agents.chunking import estimate_tokens, split_markdown
+from events_ai.agents.gemini_event_research_agent import Event, dedupe_events
+
+
+def make_page(sections: int) -> str:
+    return "\n\n".join(
+        f"## Event {i}\n\nJoin us for event {i}.\n\n* 2026-10-{i + 1:02}\n* Library"
+        for i in range(sections)
+    )
+
+
+def test_split_markdown_small_page_is_one_chunk():
+    page = make_page(2)
+    assert split_markdown(page, 1000) == [page]
+
+
+def test_split_markdown_respects_budget_and_headings():
+    page = make_page(40)
+    chunks = split_markdown(page, 100)
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 100 for chunk in chunks)
+    assert all(chunk.startswith("## Event") for chunk in chunks)
+    assert sum(chunk.count("## Event") for chunk in chunks) == 40
+
+
+def test_split_markdown_setext_headings():
+    page = "\n\n".join(f"Event {i}\n-------\n\n{'words ' * 30}" for i in range(6))
+    chunks = split_markdown(page, 60)
+
+    assert all(chunk.startswith("Event") for chunk in chunks)
+
+
+def test_split_markdown_cuts_unbroken_text():
+    chunks = split_markdown("x" * 1000, 50)
+    assert all(estimate_tokens(chunk) <= 50 for chunk in chunks)
+    assert "".join(chunks) == "x" * 1000
+
+
+def test_dedupe_events():
+    def event(title: str, when: str) -> Event:
+        return Event(
+            organization="Library",
+            title=title,
+            link=None,
+            description="",
+            when=when,
+            location="",
+            price=None,
+            target_age=[],
+        )
+
+    events = [
+        event("Story Time", "2026-10-20"),
+        event("Story time!", "2026-10-20"),
+        event("Story Time", "2026-10-27"),
+    ]
+
+    assert dedupe_events(events) == [events[0], events[2]]
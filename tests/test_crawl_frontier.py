@@ -0,0 +1,66 @@
+from events_ai.agents.crawl_frontier import (
+    CrawlFrontier,
+    canonicalize_url,
+    pagination_links,
+)
+
+
+def test_canonicalize_url():
+    assert canonicalize_url(
+        "HTTPS://Example.com/events/?page=2&utm_source=x&a=1#top"
+    ) == ("https://example.com/events?a=1&page=2")
+
+
+def test_pagination_links():
+    page = "\n".join(
+        [
+            "[Story time](/events/story-time)",
+            "[Next »](/events?page=2)",
+            "[2](https://example.com/events?page=2)",
+            "[3](/events?page=3)",
+            "[Next](https://other.com/events?page=2)",
+        ]
+    )
+
+    assert pagination_links(page, "https://example.com/events") == [
+        "https://example.com/events?page=2",
+        "https://example.com/events?page=3",
+    ]
+
+
+def test_pagination_links_ignores_numbers_that_are_not_pages():
+    page = "\n".join(
+        [
+            "[20](/events/2026/10/20)",
+            "[12](/events?category=12)",
+            "[2](/events?page=2)",
+            "[3](/events/page/3/)",
+            "[1](/events?page=1)",
+        ]
+    )
+
+    assert pagination_links(page, "https://example.com/events?page=1") == [
+        "https://example.com/events?page=2",
+        "https://example.com/events/page/3/",
+    ]
+
+
+def test_frontier_limits_depth_and_pages():
+    frontier = CrawlFrontier("https://example.com/events", max_depth=2, max_pages=3)
+    levels = []
+
+    for depth, level in frontier.levels():
+        levels.append(level)
+        for url in level:
+            page = int(url.rsplit("=", 1)[-1]) if "=" in url else 1
+            frontier.add(f"https://example.com/events?page={page + 1}")
+            frontier.add(f"https://example.com/events/?page={page + 1}")
+
+    assert levels == [
+        ["https://example.com/events"],
+        ["https://example.com/events?page=2"],
+        ["https://example.com/events?page=3"],
+    ]
+
+    frontier = CrawlFrontier("https://example.com/events")
+    assert list(frontier.levels()) == [(0, ["https://example.com/events"])]
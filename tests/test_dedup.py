@@ -0,0 +1,85 @@
+from datetime import date
+
+import pandas as pd
+
+from events_ai.dedup import dedupe_events, find_duplicates, normalize_link
+
+
+def make_df(rows: list[tuple[str, str | None, str, str]]) -> pd.DataFrame:
+    return pd.DataFrame(
+        [
+            {
+                "event": title,
+                "link": link,
+                "description": "",
+                "when": when,
+                "location": "Library",
+                "price": None,
+                "target_age": "",
+                "organization": organization,
+            }
+            for title, link, when, organization in rows
+        ]
+    )
+
+
+def test_normalize_link():
+    assert normalize_link("https://www.Lib.org/events/1/#top") == "//lib.org/events/1"
+    assert normalize_link("http://lib.org/events/1") == "//lib.org/events/1"
+    assert normalize_link(None) is None
+    assert normalize_link(float("nan")) is None
+
+
+def test_find_duplicates_by_title_and_link():
+    df = make_df(
+        [
+            ("Teen Gaming Night", "https://lib.org/e/1", "2026-10-20T18:00", "Library"),
+            ("Teen Gaming Night!", None, "2026-10-20", "Village"),
+            ("Teen Gaming Night", "https://lib.org/e/1", "2026-10-27", "Library"),
+            ("Knitting Circle", "https://lib.org/e/2", "2026-10-20", "Library"),
+            ("Fall Festival", "https://www.lib.org/e/2/", "2026-10-20", "Village"),
+        ]
+    )
+
+    assert sorted(find_duplicates(df)) == [[0, 1]]
+
+
+def test_find_duplicates_keeps_distinct_events_sharing_a_page_link():
+    df = make_df(
+        [
+            ("Watercolor Class", "https://guild.org/events", "2026-10-20", "Guild"),
+            ("Jazz Night", "https://guild.org/events", "2026-10-20", "Guild"),
+            ("Jazz Night!", "https://guild.org/events/", "2026-10-20", "Village"),
+        ]
+    )
+
+    assert find_duplicates(df) == [[1, 2]]
+    assert list(dedupe_events(df).event) == ["Watercolor Class", "Jazz Night"]
+
+
+def test_dedupe_events_keeps_provenance():
+    df = make_df(
+        [
+            ("Teen Gaming Night", "https://lib.org/e/1", "2026-10-20", "Library"),
+            ("Teen Gaming Night", "https://vom.gov/e/9", "2026-10-20", "Village"),
+            ("Knitting Circle", "https://lib.org/e/2", "2026-10-21", "Library"),
+        ]
+    )
+
+    deduped = dedupe_events(df)
+
+    assert list(deduped.event) == ["Teen Gaming Night", "Knitting Circle"]
+    assert deduped.organization[0] == "Library; Village"
+    assert deduped.sources[0] == "https://lib.org/e/1; https://vom.gov/e/9"
+
+
+def test_find_duplicates_across_date_formats():
+    df = make_df(
+        [
+            ("Halloween Parade", None, "October 31, 2026", "Village"),
+            ("Halloween Parade", None, "Oct 31, 2026 2pm", "Library"),
+            ("Halloween Parade", None, "Nov 1, 2026", "Library"),
+        ]
+    )
+
+    assert find_duplicates(df, date(2026, 10, 17)) == [[0, 1]]
@@ -0,0 +1,67 @@
+from datetime import date
+
+import pandas as pd
+
+from events_ai.event_dates import filter_window, parse_when
+
+TODAY = date(2026, 10, 17)
+
+
+def test_parse_when_formats():
+    parsed = parse_when(
+        pd.Series(
+            [
+                "2026-10-20T18:30:00",
+                "Opening 2026-10-01 through 2026-11-15",
+                "October 22nd, 2026 at 7pm",
+                "Sat, Oct 24",
+                "10/25/26",
+                "Jan 5",
+                "Every Tuesday",
+                None,
+            ]
+        ),
+        TODAY,
+    )
+
+    assert list(parsed["start"]) == [
+        pd.Timestamp("2026-10-20 18:30"),
+        pd.Timestamp("2026-10-01"),
+        pd.Timestamp("2026-10-22"),
+        pd.Timestamp("2026-10-24"),
+        pd.Timestamp("2026-10-25"),
+        pd.Timestamp("2027-01-05"),
+        pd.NaT,
+        pd.NaT,
+    ]
+    assert parsed["end"][1] == pd.Timestamp("2026-11-15")
+    assert parsed["end"].isna().sum() == 7
+    assert list(parsed["date_confidence"]) == [
+        "high",
+        "high",
+        "low",
+        "low",
+        "low",
+        "low",
+        "none",
+        "none",
+    ]
+
+
+def test_filter_window_keeps_overlapping_and_undated():
+    df = pd.DataFrame(
+        {
+            "event": ["past", "soon", "ongoing", "last day", "later", "weekly"],
+            "when": [
+                "2026-10-10",
+                "2026-10-18T10:00",
+                "2026-10-01 to 2026-10-30",
+                "2026-10-24T20:00",
+                "2026-10-25",
+                "Every Tuesday",
+            ],
+        }
+    )
+
+    kept = filter_window(df, TODAY, 7)
+    assert list(kept.event) == ["soon", "ongoing", "last day", "weekly"]
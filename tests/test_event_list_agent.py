@@ -0,0 +1,157 @@
+import re
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from events_ai import simplify_url
+from events_ai.agents import gemini_client
+from events_ai.agents.chunking import estimate_tokens
+from events_ai.agents.event_detail_store import EventDetailStore
+from events_ai.agents.event_list_agent import EventListAgent
+from events_ai.agents.gemini_event_research_agent import Event
+from events_ai.research_journal import ResearchJournal
+
+
+def make_event(title: str, when: str = "2026-10-20") -> Event:
+    return Event(
+        organization="Library",
+        title=title,
+        link=f"https://lib.org/events/{title}",
+        description="",
+        when=when,
+        location="",
+        price=None,
+        target_age=[],
+    )
+
+
+class StubAgent(EventListAgent):
+    """Answers update prompts by filling in the events found in the prompt."""
+
+    def __init__(self, **kwargs):
+        super().__init__(
+            None, date(2026, 10, 17), date(2026, 11, 17), "https://lib.org", **kwargs
+        )
+        self.requests = []
+
+    def ask_gemini(self, model, prompt, response_schema, retries=5):
+        titles = re.findall(r'"title":"([^"]*)"', prompt)
+        self.requests.append(titles)
+        events = [
+            make_event(title).model_copy(update={"description": f"About {title}"})
+            for title in titles
+        ]
+        parsed = events[0] if response_schema is Event else events
+        return SimpleNamespace(parsed=parsed)
+
+    async def ask_gemini_async(self, model, prompt, response_schema, retries=5):
+        return self.ask_gemini(model, prompt, response_schema, retries)
+
+
+@pytest.fixture(autouse=True)
+def pages(monkeypatch):
+    monkeypatch.setattr(
+        simplify_url, "get", lambda url, use_selenium=False: f"Details of {url}"
+    )
+
+
+def test_detail_reuse_depends_on_listed_event(tmp_path):
+    store = EventDetailStore(tmp_path)
+
+    agent = StubAgent(detail_store=store, batch_tokens=10_000)
+    agent.update_in_batches([make_event("a"), make_event("b")])
+    assert agent.requests == [["a", "b"]]
+
+    agent = StubAgent(detail_store=store, batch_tokens=10_000)
+    updated = agent.update_in_batches([make_event("a"), make_event("b", "2026-10-27")])
+    assert agent.details_reused == 1
+    assert agent.requests == [["b"]]
+    assert updated[0].description == "About a"
+
+
+class FailingBatchAgent(StubAgent):
+    def __init__(self, failure: str, **kwargs):
+        super().__init__(**kwargs)
+        self.failure = failure
+
+    def ask_gemini(self, model, prompt, response_schema, retries=5):
+        response = super().ask_gemini(model, prompt, response_schema, retries)
+
+        if response_schema is not Event:
+            if self.failure == "error":
+                raise RuntimeError("bad response")
+            response.parsed = response.parsed[:-1]
+
+        return response
+
+
+def batch_budget(events: list[Event], per_batch: int) -> int:
+    event = events[0]
+    page = simplify_url.get(event.link)
+    return per_batch * (
+        estimate_tokens(page) + estimate_tokens(event.model_dump_json())
+    )
+
+
+def test_update_in_batches_packs_events_under_budget():
+    events = [make_event(title) for title in "abcde"]
+    agent = StubAgent(batch_tokens=batch_budget(events, 2))
+
+    updated = agent.update_in_batches(events)
+
+    assert sorted(agent.requests) == [["a", "b"], ["c", "d"], ["e"]]
+    assert [event.description for event in updated] == [
+        f"About {title}" for title in "abcde"
+    ]
+
+
+@pytest.mark.parametrize("failure", ["error", "short"])
+def test_update_batch_falls_back_to_single_updates(failure):
+    events = [make_event(title) for title in "abc"]
+    agent = FailingBatchAgent(failure, batch_tokens=10_000)
+
+    updated = agent.update_in_batches(events)
+
+    assert agent.requests == [["a", "b", "c"], ["a"], ["b"], ["c"]]
+    assert [event.title for event in updated] == ["a", "b", "c"]
+
+
+def test_update_in_batches_journals_each_index(tmp_path):
+    journal = ResearchJournal(tmp_path / "journal.jsonl")
+    target = journal.start("library", "Library", fresh=False)
+    events = [make_event("a"), make_event("b").model_copy(update={"link": None})]
+    events.append(make_event("c"))
+    target.save_detail(0, make_event("a").model_copy(update={"description": "Done"}))
+
+    agent = StubAgent(batch_tokens=10_000, journal=target)
+    updated = agent.update_in_batches(events)
+
+    assert agent.requests == [["c"]]
+    assert [target.detail(i).description for i in range(3)] == [
+        "Done",
+        "",
+        "About c",
+    ]
+    assert updated == [target.detail(i) for i in range(3)]
+
+
+def test_failed_detail_fetch_keeps_listed_event(monkeypatch):
+    def get(url, use_selenium=False):
+        if url.endswith("/b"):
+            raise requests.exceptions.ReadTimeout("too slow")
+        return f"Details of {url}"
+
+    async def get_async(url, use_selenium=False):
+        return get(url, use_selenium)
+
+    monkeypatch.setattr(simplify_url, "get", get)
+    monkeypatch.setattr(simplify_url, "get_async", get_async)
+    events = [make_event("a"), make_event("b")]
+
+    updated = gemini_client.run(StubAgent().update_all_async(events))
+    assert [event.description for event in updated] == ["About a", ""]
+
+    updated = StubAgent(batch_tokens=10_000).update_in_batches(events)
+    assert [event.description for event in updated] == ["About a", ""]
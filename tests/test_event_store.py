@@ -0,0 +1,67 @@
+from datetime import date
+
+import pandas as pd
+
+from events_ai.event_store import EventStore
+
+
+def make_df(rows: list[tuple[str, str | None, str]]) -> pd.DataFrame:
+    return pd.DataFrame(
+        [
+            {
+                "event": title,
+                "link": link,
+                "description": f"About {title}",
+                "when": when,
+                "location": "Library",
+                "price": None,
+                "target_age": "kids",
+                "organization": "Library",
+            }
+            for title, link, when in rows
+        ]
+    )
+
+
+def test_event_store_upsert_and_seen_on(tmp_path):
+    store = EventStore(tmp_path / "events.sqlite")
+    df = make_df([("Story Time", "https://lib.org/1", "2026-10-20T10:00:00")])
+
+    store.upsert("library", df, date(2026, 10, 17))
+    store.upsert("library", df, date(2026, 10, 18))
+
+    assert len(store.seen_on(date(2026, 10, 17))) == 0
+    seen = store.seen_on(date(2026, 10, 18))
+    assert list(seen.event) == ["Story Time"]
+    assert list(seen.columns) == [
+        "event",
+        "link",
+        "description",
+        "when",
+        "location",
+        "price",
+        "target_age",
+        "organization",
+    ]
+
+
+def test_event_store_upcoming(tmp_path):
+    store = EventStore(tmp_path / "events.sqlite")
+    store.upsert(
+        "library",
+        make_df(
+            [
+                ("Old", "https://lib.org/old", "2026-10-01"),
+                ("Ongoing", "https://lib.org/show", "2026-10-01 to 2026-10-30"),
+                ("Soon", "https://lib.org/soon", "2026-10-20"),
+                ("Featured", "https://lib.org/featured", "2026-10-21"),
+                ("Later", "https://lib.org/later", "2026-11-15"),
+                ("Unknown", None, "Every Tuesday"),
+            ]
+        ),
+        date(2026, 10, 17),
+    )
+
+    upcoming = store.upcoming(date(2026, 10, 17), 7, ["https://lib.org/featured"])
+    assert list(upcoming.event) == ["Ongoing", "Soon", "Unknown"]
+
@@ -0,0 +1,68 @@
+from datetime import date
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from events_ai import events_dataset
+
+TODAY = date(2026, 10, 17)
+
+
+def sample_events() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "event": ["Story Time", "Gala", "Open Mic", "Exhibit"],
+            "link": ["https://a/1", None, "https://a/3", "https://a/4"],
+            "description": ["Songs", "Dinner", "Music", "Paintings"],
+            "when": [
+                "2026-10-20 10:30",
+                "2026-12-01",
+                "Every Tuesday",
+                "Opening 2026-10-01 through 2026-10-25",
+            ],
+            "location": ["Library"] * 4,
+            "price": [None, "$50", None, None],
+            "target_age": ["kids, adults", "adults", "", None],
+            "organization": ["Library"] * 4,
+        }
+    )
+
+
+def test_write_events_types_columns(tmp_path):
+    path = tmp_path / "events.parquet"
+    events_dataset.write_events(sample_events(), path, TODAY)
+
+    schema = pq.read_schema(path)
+    assert schema.names == events_dataset.SCHEMA.names
+    assert pa.types.is_timestamp(schema.field("when_start").type)
+    assert pa.types.is_list(schema.field("target_age").type)
+
+    df = events_dataset.read_events(path)
+    assert list(df["event"]) == ["Exhibit", "Story Time", "Gala", "Open Mic"]
+    assert df.loc[1, "when_start"] == pd.Timestamp("2026-10-20 10:30")
+    assert list(df.loc[1, "target_age"]) == ["kids", "adults"]
+    assert list(df.loc[3, "target_age"]) == []
+
+
+def test_read_events_projection_and_window(tmp_path):
+    path = tmp_path / "events.parquet"
+    events_dataset.write_events(sample_events(), path, TODAY)
+
+    df = events_dataset.read_events(
+        path, columns=["event", "when"], start=date(2026, 10, 18), days=7
+    )
+
+    assert list(df.columns) == ["event", "when"]
+    assert set(df["event"]) == {"Story Time", "Open Mic", "Exhibit"}
+
+
+def test_export_csv(tmp_path):
+    path = tmp_path / "events.parquet"
+    csv_path = tmp_path / "events.csv"
+    events_dataset.write_events(sample_events(), path, TODAY)
+    events_dataset.export_csv(path, csv_path)
+
+    df = pd.read_csv(csv_path, index_col="id", keep_default_na=False)
+    assert list(df.columns) == events_dataset.EXPORT_COLUMNS
+    assert df.loc[1, "target_age"] == "kids, adults"
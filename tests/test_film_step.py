@@ -0,0 +1,38 @@
+import json
+
+from events_ai.agents.heygen_client import HeyGenClient, VideoStatusResponse
+from events_ai.steps import film_step
+from events_ai.usage_ledger import ledger
+
+
+class CompletedClient(HeyGenClient):
+    def get_video_status(self, video_id: str) -> VideoStatusResponse:
+        return VideoStatusResponse(
+            code=100,
+            data={
+                "status": "completed",
+                "video_url": "https://x/v.mp4",
+                "duration": 60,
+            },
+        )
+
+
+def test_render_is_billed_once_when_download_is_retried(tmp_path, monkeypatch):
+    monkeypatch.setenv("HEYGEN_API_KEY", "test")
+    monkeypatch.setattr(film_step, "HeyGenClient", CompletedClient)
+    monkeypatch.setattr(film_step, "download_file", lambda url, filename: None)
+
+    step = film_step.FilmStep(tmp_path / "clip.mp4", tmp_path / "storyboard.json", None)
+    job = {"clip": 1, "video_id": "v1", "done": False, "url": ""}
+    json.dump(job, open(step.clip_job_path_for(1), "w"))
+
+    def renders() -> int:
+        df = ledger.to_df()
+        return 0 if len(df) == 0 else int((df["model"] == "video_render").sum())
+
+    before = renders()
+    step.wait_and_download_clip_jobs()
+    step.wait_and_download_clip_jobs()
+
+    assert renders() == before + 1
+    assert json.load(open(step.clip_job_path_for(1)))["done"]
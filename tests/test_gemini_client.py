@@ -0,0 +1,131 @@
+import asyncio
+import threading
+import time
+from unittest import mock
+
+import pytest
+from google.genai import types
+from google.genai.errors import ClientError, ServerError
+
+from events_ai.agents import gemini_client
+from events_ai.agents.gemini_client import ConcurrencyLimiter, TokenBucket, retry_after
+
+
+def test_limiter_caps_threads():
+    limiter = ConcurrencyLimiter(2)
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def work():
+        nonlocal running, peak
+        with limiter.slot():
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak == 2
+    assert limiter.in_flight == 0
+
+
+def test_limiter_shared_between_threads_and_tasks():
+    limiter = ConcurrencyLimiter(1)
+    order = []
+
+    async def task(name: str):
+        async with limiter.slot_async():
+            order.append(name)
+
+    limiter.acquire()
+    thread = threading.Thread(target=asyncio.run, args=(task("async"),))
+    thread.start()
+    time.sleep(0.05)
+
+    assert order == []
+    limiter.release()
+    thread.join()
+
+    assert order == ["async"]
+    assert limiter.in_flight == 0
+
+
+def test_run_returns_result_and_raises():
+    async def double(value: int) -> int:
+        await asyncio.sleep(0)
+        return value * 2
+
+    async def fail():
+        raise ValueError("boom")
+
+    assert gemini_client.run(double(21)) == 42
+
+    try:
+        gemini_client.run(fail())
+    except ValueError as err:
+        assert str(err) == "boom"
+    else:
+        raise AssertionError("expected ValueError")
+
+
+class FakeModels:
+    def __init__(self, errors: list[Exception]):
+        self.errors = errors
+        self.calls = 0
+
+    def generate_content(self, model, contents, config):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return types.GenerateContentResponse()
+
+
+class FakeLLM:
+    def __init__(self, errors: list[Exception]):
+        self.models = FakeModels(errors)
+
+
+def test_token_bucket_waits_out_debt():
+    bucket = TokenBucket(60)
+
+    assert bucket.reserve(60) == 0
+    assert bucket.reserve(30) == pytest.approx(30, abs=0.1)
+
+
+def test_retry_after_header_and_retry_info():
+    response = mock.Mock(headers={"Retry-After": "7"})
+    assert retry_after(ClientError(429, {}, response)) == 7
+
+    details = {"error": {"details": [{"retryDelay": "13s"}]}}
+    assert retry_after(ClientError(429, details)) == 13
+    assert retry_after(ServerError(503, {})) is None
+
+
+def test_generate_content_retries_then_raises(monkeypatch):
+    monkeypatch.setattr(gemini_client.time, "sleep", lambda seconds: None)
+    gemini_client.configure(4, requests_per_minute=600)
+
+    llm = FakeLLM([ServerError(503, {}), ClientError(429, {})])
+    response = gemini_client.generate_content(llm, "model", "prompt", None)
+    assert isinstance(response, types.GenerateContentResponse)
+    assert llm.models.calls == 3
+    assert gemini_client.rate_limiter.requests.per_minute < 600
+
+    llm = FakeLLM([ServerError(503, {})] * 2)
+    with pytest.raises(ServerError):
+        gemini_client.generate_content(llm, "model", "prompt", None, retries=2)
+
+    llm = FakeLLM([ClientError(400, {})])
+    with pytest.raises(ClientError):
+        gemini_client.generate_content(llm, "model", "prompt", None)
+    assert llm.models.calls == 1
+
+    gemini_client.configure()
@@ -0,0 +1,63 @@
+import threading
+import time
+
+from events_ai.host_scheduler import HostScheduler
+
+
+def fetch_all(scheduler: HostScheduler, urls: list[str]) -> dict[str, list[float]]:
+    starts: dict[str, list[float]] = {}
+    lock = threading.Lock()
+
+    def fetch(url: str):
+        with scheduler.slot(url):
+            with lock:
+                starts.setdefault(url, []).append(time.monotonic())
+            time.sleep(0.02)
+
+    threads = [threading.Thread(target=fetch, args=(url,)) for url in urls]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return starts
+
+
+def test_same_host_is_spaced_other_hosts_are_not():
+    scheduler = HostScheduler(concurrency=4, min_delay=0.05)
+    begin = time.monotonic()
+    starts = fetch_all(scheduler, ["https://a.org/1"] * 3 + ["https://b.org/1"])
+
+    a_starts = sorted(starts["https://a.org/1"])
+    gaps = [later - earlier for earlier, later in zip(a_starts, a_starts[1:])]
+    assert all(gap >= 0.045 for gap in gaps)
+    assert starts["https://b.org/1"][0] - begin < 0.04
+
+    lane = scheduler.lanes["a.org"]
+    assert lane.requests == 3
+    assert lane.max_wait >= 0.09
+
+
+def test_concurrency_cap_per_host():
+    scheduler = HostScheduler(concurrency=1, min_delay=0.0)
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fetch():
+        nonlocal running, peak
+        with scheduler.slot("https://a.org/page"):
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+
+    threads = [threading.Thread(target=fetch) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak == 1
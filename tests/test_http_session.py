@@ -0,0 +1,103 @@
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from events_ai.http_session import ConditionalGetStore, SessionPool
+
+
+class EtagHandler(BaseHTTPRequestHandler):
+    requests_seen: list[str | None] = []
+
+    def do_GET(self):
+        etag = self.headers.get("If-None-Match")
+        EtagHandler.requests_seen.append(etag)
+
+        if etag == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = b"<html><body>Hello</body></html>"
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_session_pool_conditional_get(tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EtagHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/calendar"
+
+    try:
+        pool = SessionPool(store=ConditionalGetStore(tmp_path))
+        first = pool.get(url)
+        second = pool.get(url)
+        pool.close()
+    finally:
+        server.shutdown()
+
+    assert first == second == "<html><body>Hello</body></html>"
+    assert EtagHandler.requests_seen == [None, '"v1"']
+
+
+def test_session_pool_reuses_session_per_host():
+    pool = SessionPool()
+    a = pool.session_for("https://example.com/a")
+    b = pool.session_for("https://example.com/b?page=2")
+    c = pool.session_for("https://example.org/a")
+
+    assert a is b
+    assert a is not c
+
+
+class UnavailableHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b"Down for maintenance"
+        self.send_response(503)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_session_pool_returns_body_after_retries_run_out():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), UnavailableHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/calendar"
+
+    try:
+        pool = SessionPool()
+        body = pool.get(url)
+        pool.close()
+    finally:
+        server.shutdown()
+
+    assert body == "Down for maintenance"
+
+
+def test_conditional_get_store_is_bounded(tmp_path):
+    response = requests.Response()
+    response.headers["ETag"] = '"v1"'
+    response._content = b"x" * 3_000
+    response.encoding = "utf-8"
+
+    store = ConditionalGetStore(tmp_path, max_bytes=10_000)
+    for i in range(5):
+        store.save(f"https://example.com/{i}", response)
+
+    assert sum(p.stat().st_size for p in tmp_path.glob("*.json")) <= 10_000
+    assert store.load("https://example.com/4")["etag"] == '"v1"'
+
+    stale = ConditionalGetStore(tmp_path, max_age=timedelta(0))
+    assert stale.load("https://example.com/4") is None
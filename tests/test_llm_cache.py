@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from google import genai
+from google.genai import types
+
+from events_ai.agents.gemini_event_research_agent import Event, EventsResult
+from events_ai.agents.llm_cache import LLMCache
+
+
+def make_config(schema) -> types.GenerateContentConfig:
+    return types.GenerateContentConfig(
+        thinking_config=genai.types.ThinkingConfig(thinking_budget=0),
+        response_mime_type="application/json",
+        response_schema=schema,
+    )
+
+
+def make_response(text: str) -> types.GenerateContentResponse:
+    return types.GenerateContentResponse(
+        candidates=[
+            types.Candidate(
+                content=types.Content(role="model", parts=[types.Part(text=text)])
+            )
+        ],
+        usage_metadata=types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=100, candidates_token_count=5, total_token_count=105
+        ),
+    )
+
+
+def test_llm_cache_round_trip(tmp_path):
+    cache = LLMCache(tmp_path)
+    key = cache.key("gemini", "prompt", EventsResult, make_config(EventsResult))
+
+    assert cache.get(key, EventsResult) is None
+
+    cache.put(key, make_response('{"events": []}'))
+    cached = cache.get(key, EventsResult)
+
+    assert cached is not None
+    assert cached.parsed == EventsResult(events=[])
+    assert cached.usage_metadata.total_token_count == 105
+
+
+def test_llm_cache_key_depends_on_inputs(tmp_path):
+    cache = LLMCache(tmp_path)
+    key = cache.key("gemini", "prompt", EventsResult, make_config(EventsResult))
+
+    assert key == cache.key("gemini", "prompt", EventsResult, make_config(EventsResult))
+    assert key != cache.key(
+        "gemini-pro", "prompt", EventsResult, make_config(EventsResult)
+    )
+    assert key != cache.key(
+        "gemini", "prompt 2", EventsResult, make_config(EventsResult)
+    )
+    assert key != cache.key("gemini", "prompt", Event, make_config(Event))
+
+
+def test_llm_cache_expires(tmp_path):
+    cache = LLMCache(tmp_path, ttl=timedelta(seconds=-1))
+    key = cache.key("gemini", "prompt", EventsResult, make_config(EventsResult))
+    cache.put(key, make_response('{"events": []}'))
+
+    assert cache.get(key, EventsResult) is None
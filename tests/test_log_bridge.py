@@ -0,0 +1,42 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import structlog
+from loguru import logger
+
+from events_ai import log_bridge
+
+
+@pytest.fixture
+def messages():
+    messages = []
+    sink = logger.add(
+        lambda message: messages.append(message.record),
+        format="{message}",
+        level="DEBUG",
+    )
+    log_bridge.route_structlog_to_loguru()
+    yield messages
+    structlog.reset_defaults()
+    logger.remove(sink)
+
+
+def test_structlog_messages_reach_loguru_with_target(messages):
+    agent_logger = structlog.get_logger()
+
+    def research():
+        agent_logger.warn("Page failed", status=404)
+
+    with logger.contextualize(target="library"):
+        context = contextvars.copy_context()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(context.run, research).result()
+
+    record = messages[-1]
+    assert record["message"] == "Page failed status=404"
+    assert record["level"].name == "WARNING"
+    assert record["extra"]["target"] == "library"
+    assert record["function"] == "research"
+    assert record["name"] == __name__
@@ -0,0 +1,63 @@
+import os
+import time
+from datetime import timedelta
+
+from events_ai.page_cache import PageCache
+
+
+def test_page_cache_hit_and_miss(tmp_path):
+    cache = PageCache(tmp_path)
+    assert cache.get("https://example.com", "requests") is None
+
+    cache.put("https://example.com", "requests", "<p>Hi</p>", "Hi")
+    page = cache.get("https://example.com", "requests")
+
+    assert page is not None
+    assert page.html == "<p>Hi</p>"
+    assert page.simplified == "Hi"
+    assert cache.get("https://example.com", "selenium") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_page_cache_expires(tmp_path):
+    cache = PageCache(tmp_path, ttl=timedelta(seconds=0))
+    cache.put("https://example.com", "requests", "<p>Hi</p>", "Hi")
+    assert cache.get("https://example.com", "requests") is None
+
+
+def test_page_cache_evicts_least_recently_used(tmp_path):
+    cache = PageCache(tmp_path, max_bytes=10_000)
+    body = "x" * 3_000
+
+    for i in range(3):
+        cache.put(f"https://example.com/{i}", "requests", body, "")
+        past = time.time() - 100 + i
+        os.utime(cache.entry_path(f"https://example.com/{i}", "requests"), (past, past))
+
+    assert cache.get("https://example.com/0", "requests") is not None
+    cache.put("https://example.com/3", "requests", body, "")
+
+    assert cache.get("https://example.com/0", "requests") is not None
+    assert cache.get("https://example.com/1", "requests") is None
+    assert cache.get("https://example.com/3", "requests") is not None
+
+
+def test_page_cache_only_scans_when_over_budget(tmp_path, monkeypatch):
+    cache = PageCache(tmp_path, max_bytes=10_000)
+    cache.put("https://example.com/0", "requests", "x" * 3_000, "")
+
+    scans = []
+    entries = cache.files.entries
+    monkeypatch.setattr(cache.files, "entries", lambda: scans.append(1) or entries())
+
+    cache.put("https://example.com/1", "requests", "x" * 3_000, "")
+    cache.put("https://example.com/1", "requests", "x" * 3_000, "")
+    assert scans == []
+
+    cache.put("https://example.com/2", "requests", "x" * 3_000, "")
+    cache.put("https://example.com/3", "requests", "x" * 3_000, "")
+    assert scans == [1]
+    assert cache.files.total_bytes <= 10_000
+    assert cache.files.total_bytes == sum(
+        p.stat().st_size for p in tmp_path.glob("*.json")
+    )
@@ -0,0 +1,74 @@
+from datetime import date
+
+from events_ai.agents.chunking import split_blocks
+from events_ai.agents.event_detail_store import fingerprint
+from events_ai.agents.gemini_event_research_agent import Event
+from events_ai.agents.page_snapshot_store import (
+    PageSnapshot,
+    PageSnapshotStore,
+    attribute,
+    plan_update,
+)
+
+URL = "https://example.com/events"
+PAGE = "# Events\n\n### Jazz\n\n2026-10-20\n\n### Fair\n\n2026-10-25"
+
+
+def make_event(title: str, when: str) -> Event:
+    return Event(
+        organization="Org",
+        title=title,
+        link=None,
+        description="",
+        when=when,
+        location="",
+        price=None,
+        target_age=[],
+    )
+
+
+def snapshot_of(page: str) -> PageSnapshot:
+    blocks = split_blocks(page)
+    events = [make_event("Jazz", "2026-10-20"), make_event("Fair", "2026-10-25")]
+    return PageSnapshot(
+        URL,
+        date(2026, 10, 17),
+        [fingerprint(block) for block in blocks],
+        attribute(events, blocks, list(range(len(blocks)))),
+    )
+
+
+def test_attribute_spans_up_to_next_title():
+    jazz, fair = snapshot_of(PAGE).events
+
+    assert jazz.blocks == [fingerprint("### Jazz"), fingerprint("2026-10-20")]
+    assert fair.blocks == [fingerprint("### Fair"), fingerprint("2026-10-25")]
+
+
+def test_plan_update_unchanged():
+    update = plan_update(snapshot_of(PAGE), split_blocks(PAGE))
+
+    assert [sourced.event.title for sourced in update.carried] == ["Jazz", "Fair"]
+    assert update.runs == []
+
+
+def test_plan_update_added_and_changed():
+    page = PAGE.replace("### Fair", "### Poetry\n\n2026-10-23\n\n### Fair")
+    page = page.replace("2026-10-25", "2026-10-26")
+    update = plan_update(snapshot_of(PAGE), split_blocks(page))
+
+    assert [sourced.event.title for sourced in update.carried] == ["Jazz"]
+    # Each run is led by the block before it, and Fair's title block is stale
+    assert update.runs == [[2, 3, 4, 5, 6]]
+
+
+def test_store_round_trip_and_refresh(tmp_path):
+    store = PageSnapshotStore(tmp_path, refresh_days=7)
+    store.save(snapshot_of(PAGE))
+
+    loaded = store.load(URL, date(2026, 10, 20))
+    assert loaded.events[1].event.title == "Fair"
+    assert loaded.blocks == snapshot_of(PAGE).blocks
+
+    assert store.load(URL, date(2026, 10, 24)) is None
+    assert store.load("https://example.com/other", date(2026, 10, 20)) is None
@@ -19,3 +19,11 @@ The mouse is conditionally included.
 2026-01-03, 1/3/2026, 2026"""
 
     assert result == expected
+
+
+def test_templates_are_compiled_once():
+    prompt.precompile()
+    template = prompt.get_template("test.txt.jinja2")
+
+    assert prompt.get_template("test.txt.jinja2") is template
+    assert "event_list_update.txt.jinja2" in prompt.templates
@@ -0,0 +1,171 @@
+import asyncio
+import json
+
+import pytest
+from google import genai
+from google.genai.types import GenerateContentResponse
+
+from events_ai.agents.gemini_event_research_agent import EventsResult
+from events_ai.replay import (
+    Fixtures,
+    MissingFixtureError,
+    RecordingClient,
+    ReplayClient,
+)
+
+CONFIG = genai.types.GenerateContentConfig(
+    response_mime_type="application/json", response_schema=EventsResult
+)
+
+
+def make_response(text: str) -> GenerateContentResponse:
+    return GenerateContentResponse.model_validate(
+        {
+            "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}],
+            "usage_metadata": {"prompt_token_count": 10, "total_token_count": 12},
+        }
+    )
+
+
+class FakeModels:
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, model, contents, config):
+        self.calls += 1
+        return make_response('{"events": []}')
+
+
+class FakeAsyncModels:
+    async def generate_content(self, model, contents, config):
+        return make_response('{"events": []}')
+
+
+class FakeClient:
+    def __init__(self):
+        self.models = FakeModels()
+        self.aio = type("Aio", (), {"models": FakeAsyncModels()})()
+
+
+def test_record_then_replay_gemini(tmp_path):
+    fixtures = Fixtures(tmp_path)
+    recording = RecordingClient(FakeClient(), fixtures)
+    recording.models.generate_content(
+        model="gemini-2.5-flash-lite", contents="prompt", config=CONFIG
+    )
+
+    replay = ReplayClient(Fixtures(tmp_path))
+    response = replay.models.generate_content(
+        model="gemini-2.5-flash-lite", contents="prompt", config=CONFIG
+    )
+    assert response.parsed == EventsResult(events=[])
+    assert response.usage_metadata.prompt_token_count == 10
+
+    response = asyncio.run(
+        replay.aio.models.generate_content(
+            model="gemini-2.5-flash-lite", contents="prompt", config=CONFIG
+        )
+    )
+    assert response.parsed == EventsResult(events=[])
+
+    with pytest.raises(MissingFixtureError):
+        replay.models.generate_content(
+            model="gemini-2.5-flash-lite", contents="other prompt", config=CONFIG
+        )
+
+
+def test_record_then_replay_page(tmp_path):
+    fixtures = Fixtures(tmp_path)
+    fixtures.save_page("https://example.com/events", "requests", "<p>Hi</p>", 0.2)
+
+    assert fixtures.load_page("https://example.com/events", "requests") == "<p>Hi</p>"
+
+    with pytest.raises(MissingFixtureError):
+        fixtures.load_page("https://example.com/events", "selenium")
+
+
+def test_record_then_replay_research_step(tmp_path, monkeypatch):
+    from datetime import date
+
+    from events_ai import replay, simplify_url
+    from events_ai.event_store import EventStore
+    from events_ai.research_journal import ResearchJournal
+    from events_ai.steps import research_step
+
+    events = {
+        "events": [
+            {
+                "organization": "Theater",
+                "title": "Jazz Night",
+                "link": None,
+                "description": "Trio",
+                "when": "2026-10-20 19:30",
+                "location": "Main Stage",
+                "price": None,
+                "target_age": [],
+            }
+        ]
+    }
+
+    class LiveModels(FakeModels):
+        def generate_content(self, model, contents, config):
+            self.calls += 1
+            response = make_response(json.dumps(events))
+            response.parsed = EventsResult.model_validate(events)
+            return response
+
+    class LiveClient:
+        def __init__(self, api_key):
+            self.models = LiveModels()
+            self.aio = type("Aio", (), {"models": FakeAsyncModels()})()
+
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    monkeypatch.setattr(research_step.genai, "Client", LiveClient)
+    monkeypatch.setattr(
+        simplify_url.session_pool,
+        "get",
+        lambda url: "<html><body><h3>Jazz Night</h3><p>Oct 20</p></body></html>",
+    )
+    simplify_url.configure(host_min_delay=0.0)
+
+    targets = {
+        "theater": {
+            "agent": "FlatEventPageAgent",
+            "url": "https://theater.example.com/events",
+            "organization": "Theater",
+        }
+    }
+
+    def run(**kwargs) -> tuple[str, str]:
+        replay.configure(tmp_path / "fixtures", **kwargs)
+        working_dir = tmp_path / "2026-10-17"
+        working_dir.mkdir(exist_ok=True)
+        step = research_step.ResearchStep(
+            working_dir / "events.parquet",
+            working_dir / "research_tokens.csv",
+            EventStore(working_dir / "events.sqlite"),
+            ResearchJournal(working_dir / "research_journal.jsonl"),
+        )
+        step.run(targets, date(2026, 10, 17))
+        step.journal.close()
+        return (
+            (working_dir / "events.csv").read_text(),
+            (working_dir / "research_tokens.csv").read_text(),
+        )
+
+    try:
+        recorded, _ = run()
+
+        # The replay is offline and runs in the same working dir
+        monkeypatch.delenv("GEMINI_API_KEY")
+        monkeypatch.setattr(simplify_url.session_pool, "get", None)
+        (tmp_path / "2026-10-17" / "events.csv").unlink()
+        replayed, tokens = run(replay=True)
+    finally:
+        replay.configure(None)
+        simplify_url.configure()
+
+    assert "Jazz Night" in recorded
+    assert replayed == recorded
+    # Researched again from the fixtures, not skipped as done in the journal
+    assert "theater" in tokens
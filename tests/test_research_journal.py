@@ -0,0 +1,74 @@
+from events_ai.agents.gemini_event_research_agent import Event
+from events_ai.research_journal import ResearchJournal
+
+
+def make_event(title: str) -> Event:
+    return Event(
+        organization="Library",
+        title=title,
+        link=f"https://example.com/{title}",
+        description="",
+        when="2025-10-20",
+        location="Library",
+        price=None,
+        target_age=["kids", "adults"],
+    )
+
+
+def test_resume_keeps_listing_and_details(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = ResearchJournal(path)
+    library = journal.start("library", "Library", fresh=False)
+    library.save_listing([make_event("a"), make_event("b")])
+    library.save_detail(0, make_event("a2"))
+    flat = journal.start("museum", "Museum", fresh=False)
+    flat.save_events([make_event("m")])
+    journal.finish("museum")
+    journal.close()
+
+    # Simulate a crash in the middle of writing a line
+    with open(path, "a") as file:
+        file.write('{"kind": "detail", "tar')
+
+    journal = ResearchJournal(path)
+    assert journal.is_done("museum")
+    assert not journal.is_done("library")
+
+    library = journal.start("library", "Library", fresh=False)
+    assert [event.title for event in library.listing()] == ["a", "b"]
+    assert library.detail(0).title == "a2"
+    assert library.detail(1) is None
+
+    df = journal.events_df()
+    assert list(df["event"]) == ["a2", "m"]
+    assert list(df["organization"]) == ["Library", "Museum"]
+    assert df["target_age"][0] == "kids, adults"
+
+
+def test_fresh_start_forgets_target(tmp_path):
+    journal = ResearchJournal(tmp_path / "journal.jsonl")
+    library = journal.start("library", "Library", fresh=False)
+    library.save_listing([make_event("a")])
+    library.save_detail(0, make_event("a"))
+    journal.finish("library")
+
+    library = journal.start("library", "Library", fresh=True)
+    assert library.listing() is None
+    assert not journal.is_done("library")
+    assert len(journal.events_df()) == 0
+
+
+def test_events_df_orders_targets_by_config_not_start(tmp_path):
+    journal = ResearchJournal(tmp_path / "journal.jsonl")
+    for target in ["museum", "zoo", "library", "garden"]:
+        journal.start(target, target.title(), fresh=False).save_events(
+            [make_event(target)]
+        )
+
+    assert list(journal.events_df()["event"]) == ["garden", "library", "museum", "zoo"]
+    assert list(journal.events_df(["zoo", "library"])["event"]) == [
+        "zoo",
+        "library",
+        "garden",
+        "museum",
+    ]
@@ -0,0 +1,122 @@
+import time
+from datetime import date
+
+import pandas as pd
+import pytest
+import structlog
+from loguru import logger
+
+from events_ai import log_bridge, replay
+from events_ai.agents.gemini_event_research_agent import (
+    Event,
+    EventsResult,
+    TokenCounts,
+)
+from events_ai.event_store import EventStore
+from events_ai.research_journal import ResearchJournal
+from events_ai.steps import research_step
+
+
+class SlowAgent:
+    """Finds one event after `delay` seconds, logging like the real agents."""
+
+    def __init__(self, journal, organization: str, title: str, delay: float):
+        self.journal = journal
+        self.organization = organization
+        self.title = title
+        self.delay = delay
+        self.tokens = TokenCounts(prompt=len(organization))
+
+    def run(self) -> EventsResult:
+        time.sleep(self.delay)
+        structlog.get_logger().info(f"Listing {self.organization}")
+        event = Event(
+            organization=self.organization,
+            title=self.title,
+            link=None,
+            description="",
+            when="2026-10-20",
+            location="",
+            price=None,
+            target_age=[],
+        )
+        self.journal.save_events([event])
+        return EventsResult(events=[event])
+
+
+@pytest.fixture
+def run_step(tmp_path, monkeypatch):
+    def build(llm, today, finish, detail_store, journal, snapshot_store, **config):
+        return SlowAgent(
+            journal, config["organization"], config["title"], config["delay"]
+        )
+
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    monkeypatch.setattr(research_step.genai, "Client", lambda api_key: None)
+    monkeypatch.setattr(research_step.ResearchAgentFactory, "build", build)
+    replay.configure(None)
+
+    def run(targets: dict) -> research_step.ResearchStep:
+        step = research_step.ResearchStep(
+            tmp_path / "events.parquet",
+            tmp_path / "research_tokens.csv",
+            EventStore(tmp_path / "events.sqlite"),
+            ResearchJournal(tmp_path / "research_journal.jsonl"),
+        )
+        step.run(targets, date(2026, 10, 17), workers=4)
+        return step
+
+    return run
+
+
+@pytest.fixture
+def records():
+    records = []
+    logger.configure(extra={"target": "-"})
+    sink = logger.add(lambda message: records.append(message.record), level="INFO")
+    log_bridge.route_structlog_to_loguru()
+    yield records
+    structlog.reset_defaults()
+    logger.remove(sink)
+
+
+def test_concurrent_research_keeps_target_order(tmp_path, run_step, records):
+    # Earlier targets take longer, so they finish in reverse order
+    names = ["zoo", "library", "museum", "garden"]
+    targets = {
+        name: {
+            "organization": name.title(),
+            "title": f"{name.title()} Open House",
+            "delay": 0.05 * (4 - i),
+        }
+        for i, name in enumerate(names)
+    }
+
+    run_step(targets)
+
+    tokens = pd.read_csv(tmp_path / "research_tokens.csv")
+    assert list(tokens["name"]) == names
+    events = pd.read_csv(tmp_path / "events.csv")
+    assert list(events["organization"]) == [name.title() for name in names]
+
+    agent_logs = [
+        record for record in records if record["message"].startswith("Listing ")
+    ]
+    assert len(agent_logs) == 4
+    for record in agent_logs:
+        target = record["message"].removeprefix("Listing ").lower()
+        assert record["extra"]["target"] == target
+
+
+def test_event_store_gets_deduplicated_events(tmp_path, run_step):
+    targets = {
+        name: {"organization": name.title(), "title": "Fall Festival", "delay": 0.0}
+        for name in ["library", "village"]
+    }
+
+    step = run_step(targets)
+
+    stored = step.event_store.seen_on(date(2026, 10, 17))
+    assert list(stored["event"]) == ["Fall Festival"]
+    assert list(stored["organization"]) == ["Library; Village"]
+    assert step.journal.file.closed
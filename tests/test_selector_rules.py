@@ -0,0 +1,51 @@
+import pytest
+
+from events_ai.agents.selector_rules import SelectorRules
+
+PAGE_URL = "https://theater.example.com/upcoming"
+
+PAGE = """<html><body><ul>
+<li class="show">
+  <h3><a href="/shows/jazz">Jazz   Night</a></h3>
+  <span class="date">2026-10-20 19:30</span>
+  <p class="blurb">Trio plays standards.</p>
+</li>
+<li class="show">
+  <h3><a href="/shows/comedy">Comedy</a></h3>
+  <span class="date">Oct 25</span>
+</li>
+</ul></body></html>"""
+
+SELECTORS = {
+    "event": "li.show",
+    "title": "h3",
+    "link": "h3 a",
+    "when": ".date",
+    "description": "./p[@class='blurb']/text()",
+}
+
+
+def test_records_css_and_xpath():
+    rules = SelectorRules(SELECTORS, defaults={"location": "Main Stage"})
+    jazz, comedy = rules.records(PAGE, PAGE_URL)
+
+    assert jazz.values == {
+        "location": "Main Stage",
+        "title": "Jazz Night",
+        "link": "https://theater.example.com/shows/jazz",
+        "when": "2026-10-20 19:30",
+        "description": "Trio plays standards.",
+    }
+    assert "description" not in comedy.values
+    assert "Comedy" in comedy.html()
+
+
+def test_invalid_rules():
+    with pytest.raises(ValueError):
+        SelectorRules({"title": "h3"})
+
+    with pytest.raises(ValueError):
+        SelectorRules({"event": "li.show", "venue": ".venue"})
+
+    with pytest.raises(ValueError):
+        SelectorRules({"event": "li[["})
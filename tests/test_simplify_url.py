@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+from events_ai import simplify_url
+from events_ai.agents.crawl_frontier import pagination_links
+from events_ai.simplify_url import simplify_html
+
+PAGE = """<html>
+<head><title>Calendar</title><script>var tracking = 1;</script></head>
+<body>
+<nav><a href="/">Home</a></nav>
+<style>.event { color: red; }</style>
+<h2><a href="/events/1">Story Time</a></h2>
+<p>Stories for <b>kids</b> &amp; parents.</p>
+<svg><text>icon</text></svg>
+<ul><li>2026-10-20</li><li>Library</li></ul>
+<iframe src="https://maps.example.com"></iframe>
+</body>
+</html>"""
+
+
+def test_simplify_html_lxml_strips_page_chrome():
+    simplified = simplify_html(PAGE, "lxml")
+
+    assert "[Story Time](/events/1)" in simplified
+    assert "Stories for **kids** & parents." in simplified
+    assert "* 2026-10-20\n* Library" in simplified
+    assert "tracking" not in simplified
+    assert "Home" not in simplified
+    assert "color" not in simplified
+    assert "icon" not in simplified
+
+
+def test_simplify_html_engines_agree_on_content():
+    legacy = simplify_html(PAGE, "html.parser")
+    lxml = simplify_html(PAGE, "lxml")
+
+    for line in lxml.split("\n"):
+        assert line.strip() in legacy
+
+
+def test_simplify_html_handles_empty_pages():
+    assert simplify_html("", "lxml") == ""
+    assert simplify_html("<html><head></head></html>", "lxml") == ""
+
+
+def test_simplify_html_lxml_keeps_pager_nav():
+    page = """<html><body>
+<nav class="menu"><a href="/about">About</a></nav>
+<h2>Story Time</h2>
+<nav class="pager"><a href="?page=1">Next ›</a></nav>
+</body></html>"""
+    url = "https://library.example.com/events/list"
+    simplified = simplify_html(page, "lxml")
+
+    assert "About" not in simplified
+    assert pagination_links(simplified, url) == [
+        "https://library.example.com/events/list?page=1"
+    ]
+
+
+def test_get_async_busy_host_does_not_delay_others(monkeypatch):
+    finished = {}
+    monkeypatch.setattr(simplify_url.session_pool, "get", lambda url: f"<p>{url}</p>")
+    simplify_url.configure(host_concurrency=2, host_min_delay=0.05)
+
+    async def fetch(url: str):
+        await simplify_url.get_async(url)
+        finished[url] = time.monotonic()
+
+    async def fetch_all():
+        urls = [f"https://a.org/{i}" for i in range(20)] + ["https://b.org/1"]
+        await asyncio.gather(*(fetch(url) for url in urls))
+
+    begin = time.monotonic()
+    asyncio.run(fetch_all())
+
+    assert finished["https://b.org/1"] - begin < 0.3
+    assert finished["https://a.org/19"] - begin > 0.9
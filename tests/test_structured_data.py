@@ -0,0 +1,95 @@
+from datetime import date, datetime
+
+from events_ai.agents.structured_data import html_events, ical_events, ical_links
+
+PAGE_URL = "https://library.example.com/events/list/"
+
+PAGE = """<html><head>
+<script type="application/ld+json">
+[
+  {
+    "@type": "Event",
+    "name": "Story &amp; Song",
+    "description": "&lt;p&gt;Songs for &lt;b&gt;toddlers&lt;/b&gt;&lt;/p&gt;",
+    "startDate": "2026-10-20T10:30:00-04:00",
+    "endDate": "2026-10-20T11:00:00-04:00",
+    "url": "/events/story-song/",
+    "location": {
+      "@type": "Place",
+      "name": "Children's Room",
+      "address": {"streetAddress": "121 Main St", "addressLocality": "Larchmont"}
+    },
+    "offers": {"price": "0", "priceCurrency": "USD"}
+  },
+  {"@type": "Organization", "name": "Library"}
+]
+</script>
+<script type="application/ld+json">{"@graph": [{"@type": "TheaterEvent", "name": "Play", "startDate": "2026-10-25"}]}</script>
+</head><body>
+<div itemscope itemtype="https://schema.org/MusicEvent">
+  <div itemprop="location" itemscope itemtype="https://schema.org/Place">
+    <span itemprop="name">Hall</span>
+  </div>
+  <a itemprop="url" href="/concert"><span itemprop="name">Concert</span></a>
+  <time itemprop="startDate" datetime="2026-10-22T19:00">Oct 22</time>
+</div>
+<a href="/events/?ical=1">Export Events</a>
+<a href="https://calendar.example.org/feed.ics">Other calendar</a>
+</body></html>"""
+
+FEED = b"""BEGIN:VCALENDAR
+VERSION:2.0
+BEGIN:VEVENT
+SUMMARY:Board Meeting
+DTSTART:20261021T190000
+DTEND:20261021T210000
+LOCATION:Town Hall
+URL:https://library.example.com/board
+END:VEVENT
+BEGIN:VEVENT
+SUMMARY:Fair
+DTSTART;VALUE=DATE:20261024
+DTEND;VALUE=DATE:20261026
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+def test_html_events_json_ld():
+    story, play, _ = html_events(PAGE, PAGE_URL)
+
+    assert story.title == "Story & Song"
+    assert story.when == "2026-10-20T10:30 to 2026-10-20T11:00"
+    assert story.link == "https://library.example.com/events/story-song/"
+    assert story.description == "Songs for toddlers"
+    assert story.location == "Children's Room, 121 Main St, Larchmont"
+    assert story.price == "Free"
+
+    assert play.title == "Play"
+    assert play.start == date(2026, 10, 25)
+    assert play.location is None
+
+
+def test_html_events_microdata():
+    concert = html_events(PAGE, PAGE_URL)[2]
+
+    assert concert.title == "Concert"
+    assert concert.start == datetime(2026, 10, 22, 19, 0)
+    assert concert.location == "Hall"
+    assert concert.link == "https://library.example.com/concert"
+
+
+def test_ical_links_same_host():
+    assert ical_links(PAGE, PAGE_URL) == ["https://library.example.com/events/?ical=1"]
+
+
+def test_ical_events():
+    meeting, fair = ical_events(FEED, PAGE_URL)
+
+    assert meeting.when == "2026-10-21T19:00 to 2026-10-21T21:00"
+    assert meeting.location == "Town Hall"
+
+    # All-day DTEND is exclusive
+    assert fair.when == "2026-10-24 to 2026-10-25"
+    assert fair.overlaps(date(2026, 10, 25), date(2026, 11, 25))
+    assert not fair.overlaps(date(2026, 10, 26), date(2026, 11, 25))
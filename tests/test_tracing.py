@@ -0,0 +1,61 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from events_ai import usage_ledger
+from events_ai.tracing import Tracer
+
+
+def test_spans_are_written_as_chrome_trace(tmp_path):
+    tracer = Tracer()
+
+    with usage_ledger.target("library"):
+        with tracer.span("research", "step"):
+            with tracer.span("fetch", "fetch", url="https://example.com") as span:
+                span["bytes"] = 10
+
+    with pytest.raises(ValueError):
+        with tracer.span("llm", "llm"):
+            raise ValueError("boom")
+
+    def frame():
+        with tracer.span("frame", "frame"):
+            pass
+
+    thread = threading.Thread(target=frame, name="frames")
+    thread.start()
+    thread.join()
+
+    tracer.save(tmp_path / "trace.json")
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    spans = {event["name"]: event for event in events if event["ph"] == "X"}
+
+    assert spans["fetch"]["args"] == {
+        "target": "library",
+        "url": "https://example.com",
+        "bytes": 10,
+    }
+    assert spans["research"]["dur"] >= spans["fetch"]["dur"]
+    assert "boom" in spans["llm"]["args"]["error"]
+    assert spans["frame"]["tid"] != spans["fetch"]["tid"]
+    assert {"name": "frames"} in [e["args"] for e in events if e["ph"] == "M"]
+
+
+def test_spans_in_tasks_are_async_events():
+    tracer = Tracer()
+
+    async def call(name: str):
+        with tracer.span(name, "llm"):
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(call("a"), call("b"))
+
+    asyncio.run(main())
+
+    phases = sorted(event["ph"] for event in tracer.events)
+    assert phases == ["b", "b", "e", "e"]
+    begins = [event for event in tracer.events if event["ph"] == "b"]
+    assert begins[0]["id"] != begins[1]["id"]
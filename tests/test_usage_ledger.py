@@ -0,0 +1,45 @@
+import pandas as pd
+from google.genai import types
+
+from events_ai import usage_ledger
+from events_ai.usage_ledger import UsageLedger
+
+
+def make_usage(
+    prompt: int, candidates: int
+) -> types.GenerateContentResponseUsageMetadata:
+    return types.GenerateContentResponseUsageMetadata(
+        prompt_token_count=prompt,
+        candidates_token_count=candidates,
+        total_token_count=prompt + candidates,
+    )
+
+
+def test_records_step_target_and_cost(tmp_path):
+    ledger = UsageLedger()
+
+    with usage_ledger.step("research"), usage_ledger.target("library"):
+        ledger.record_gemini("gemini-2.5-flash-lite", make_usage(1_000_000, 0), 2.0, 1)
+        ledger.record_gemini(
+            "gemini-2.5-flash-lite", make_usage(500, 10), 0.0, cached=True
+        )
+
+    with usage_ledger.step("film"):
+        ledger.record("heygen", "video_render", 0.0, cost=1.5)
+
+    df = ledger.to_df()
+    assert list(df["step"]) == ["research", "research", "film"]
+    assert list(df["target"]) == ["library", "library", "-"]
+    assert list(df["cost"]) == [0.10, 0.0, 1.5]
+    assert "Estimated cost: $1.60" in ledger.summary()
+
+    ledger.save(tmp_path / "usage.csv")
+    ledger.save(tmp_path / "usage.csv")
+    assert len(pd.read_csv(tmp_path / "usage.csv")) == 6
+
+
+def test_unknown_model_has_no_cost():
+    ledger = UsageLedger()
+    ledger.record_gemini("gemini-9", make_usage(10, 10), 0.1)
+
+    assert pd.isna(ledger.to_df()["cost"][0])
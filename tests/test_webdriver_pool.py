@@ -0,0 +1,82 @@
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from events_ai.webdriver_pool import WebDriverPool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.alive = True
+        self.quit_called = False
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise WebDriverException("crashed")
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = WebDriverPool(size=2, max_uses=3)
+    monkeypatch.setattr(pool, "start_driver", FakeDriver)
+    return pool
+
+
+def test_webdriver_pool_reuses_drivers(pool):
+    with pool.borrow() as first:
+        pass
+    with pool.borrow() as second:
+        pass
+
+    assert first is second
+
+
+def test_webdriver_pool_replaces_crashed_drivers(pool):
+    with pool.borrow() as first:
+        pass
+
+    first.alive = False
+
+    with pool.borrow() as second:
+        pass
+
+    assert second is not first
+    assert first.quit_called
+
+
+def test_webdriver_pool_discards_driver_failing_during_use(pool):
+    with pytest.raises(WebDriverException):
+        with pool.borrow() as driver:
+            raise WebDriverException("tab crashed")
+
+    assert driver.quit_called
+    assert pool.idle == []
+
+
+def test_webdriver_pool_discards_driver_on_other_errors(pool):
+    with pytest.raises(ConnectionError):
+        with pool.borrow() as driver:
+            raise ConnectionError("chromedriver went away")
+
+    assert driver.quit_called
+    assert pool.idle == []
+    assert pool.uses == {}
+
+
+def test_webdriver_pool_recycles_and_shuts_down(pool):
+    drivers = []
+    for _ in range(3):
+        with pool.borrow() as driver:
+            drivers.append(driver)
+
+    assert drivers[0].quit_called
+    assert pool.idle == []
+
+    with pool.borrow() as driver:
+        pass
+
+    pool.shutdown()
+    assert driver.quit_called
@@ -0,0 +1,31 @@
+from datetime import date
+
+import pandas as pd
+
+from events_ai import events_dataset
+from events_ai.steps.write_script_step import WriteScriptStep
+
+TODAY = date(2026, 10, 17)
+
+
+def test_write_script_step_loads_window_from_parquet(tmp_path):
+    events_path = tmp_path / "events.parquet"
+    df = pd.DataFrame(
+        {
+            "event": ["Story Time", "Gala", "Open Mic", "Concert"],
+            "link": ["https://a/1", "https://a/2", "https://a/3", "https://a/4"],
+            "description": ["Songs", "Dinner", "Music", "Jazz"],
+            "when": ["2026-10-20", "2026-12-01", "Every Tuesday", "2026-10-18"],
+            "location": ["Library"] * 4,
+            "price": [None] * 4,
+            "target_age": ["kids", "adults", "", None],
+            "organization": ["Library"] * 4,
+        }
+    )
+    events_dataset.write_events(df, events_path, TODAY)
+
+    step = WriteScriptStep(tmp_path / "script.json", events_path)
+    loaded = step.load_events(TODAY, ["https://a/4"])
+
+    assert sorted(loaded["event"]) == ["Open Mic", "Story Time"]
+    assert loaded.loc[loaded["event"] == "Story Time", "target_age"].item() == "kids"